@@ -0,0 +1,45 @@
+import shutil
+import tempfile
+import pytest
+from synthetic import make_pycache_tree
+from project_initializer.core import clean_project
+
+PACKAGES = [100, 1000, 5000]
+
+
+@pytest.fixture(scope='module')
+def pycache_trees(tmp_path_factory):
+    """Source trees with one __pycache__ per package, built once and copied for every round."""
+    trees = {}
+    for packages in PACKAGES:
+        root = tmp_path_factory.mktemp(f"tree{packages}")
+        make_pycache_tree(str(root), packages)
+        trees[packages] = str(root)
+    return trees
+
+
+@pytest.mark.parametrize('packages', PACKAGES)
+def test_clean_pycache(benchmark, pycache_trees, packages):
+    copies = []
+
+    def setup():
+        copy = tempfile.mkdtemp(prefix='bench-clean-')
+        shutil.rmtree(copy)
+        shutil.copytree(pycache_trees[packages], copy)
+        copies.append(copy)
+        return (copy,), {}
+
+    try:
+        success, actions = benchmark.pedantic(clean_project, setup=setup, rounds=3)
+    finally:
+        for copy in copies:
+            shutil.rmtree(copy, ignore_errors=True)
+    assert success
+    assert len(actions) == packages
+
+
+@pytest.mark.parametrize('packages', PACKAGES)
+def test_clean_dry_run(benchmark, pycache_trees, packages):
+    success, actions = benchmark(clean_project, pycache_trees[packages], dry_run=True)
+    assert success
+    assert len(actions) == packages + 1
@@ -0,0 +1,27 @@
+import pytest
+from conftest import SIZES
+from synthetic import BODIES
+from project_initializer.config_loader import ConfigLoader
+
+
+@pytest.mark.parametrize('body', BODIES)
+@pytest.mark.parametrize('files', SIZES)
+def test_load_config_parse(benchmark, config_factory, files, body):
+    config = config_factory(files, body=body)
+    data = benchmark(ConfigLoader.load_config, config, use_cache=False)
+    assert len(data['files']) == files
+
+
+@pytest.mark.parametrize('files', SIZES)
+def test_load_config_cached(benchmark, config_factory, files):
+    config = config_factory(files)
+    ConfigLoader.load_config(config)
+    data = benchmark(ConfigLoader.load_config, config)
+    assert len(data['files']) == files
+
+
+@pytest.mark.parametrize('files', SIZES)
+def test_iter_config(benchmark, config_factory, files):
+    config = config_factory(files)
+    count = benchmark(lambda: sum(1 for key, _ in ConfigLoader.iter_config(config) if key == 'files'))
+    assert count == files
@@ -0,0 +1,65 @@
+import os
+import shutil
+import tempfile
+import pytest
+from conftest import SIZES
+from synthetic import BODIES, SHAPES
+from project_initializer.core import init_project_structure
+from project_initializer.filesystem import MemoryFileSystem
+from project_initializer.template_registry import BUILTIN_DIR
+
+BUILTIN_TEMPLATES = sorted(os.path.splitext(name)[0] for name in os.listdir(BUILTIN_DIR))
+
+
+def run_in_fresh_directory(benchmark, config, template='default', rounds=3, **options):
+    """Benchmark init_project_structure into a new empty directory on every round."""
+    original_dir = os.getcwd()
+    directories = []
+
+    def setup():
+        directory = tempfile.mkdtemp(prefix='bench-init-')
+        directories.append(directory)
+        os.chdir(directory)
+
+    try:
+        return benchmark.pedantic(init_project_structure, args=(config, template), kwargs=options,
+                                  setup=setup, rounds=rounds)
+    finally:
+        os.chdir(original_dir)
+        for directory in directories:
+            shutil.rmtree(directory, ignore_errors=True)
+
+
+@pytest.mark.parametrize('template', BUILTIN_TEMPLATES)
+@pytest.mark.parametrize('files', SIZES)
+def test_init_template(benchmark, config_factory, files, template):
+    summary = run_in_fresh_directory(benchmark, config_factory(files), template)
+    assert summary['errors'] == 0
+
+
+@pytest.mark.parametrize('body', BODIES)
+@pytest.mark.parametrize('shape', SHAPES)
+@pytest.mark.parametrize('files', [1000, 10000])
+def test_init_shape(benchmark, config_factory, files, shape, body):
+    summary = run_in_fresh_directory(benchmark, config_factory(files, shape, body))
+    assert summary['errors'] == 0
+
+
+@pytest.mark.parametrize('files', SIZES)
+def test_init_threaded(benchmark, config_factory, files):
+    summary = run_in_fresh_directory(benchmark, config_factory(files), workers=8)
+    assert summary['errors'] == 0
+
+
+@pytest.mark.parametrize('dedup', [None, 'hard', 'reflink'])
+@pytest.mark.parametrize('files', [1000, 10000])
+def test_init_dedup(benchmark, config_factory, files, dedup):
+    summary = run_in_fresh_directory(benchmark, config_factory(files, 'wide', 'duplicate'), dedup=dedup)
+    assert summary['errors'] == 0
+
+
+@pytest.mark.parametrize('files', SIZES)
+def test_init_in_memory(benchmark, config_factory, files):
+    config = config_factory(files)
+    summary = benchmark(lambda: init_project_structure(config, 'default', backend=MemoryFileSystem()))
+    assert summary['errors'] == 0
@@ -0,0 +1,51 @@
+import os
+import time
+import importlib.util
+import pytest
+from synthetic import make_pycache_tree
+from project_initializer.tree import ListingCache, TreeWalker
+
+SCRIPT = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'scripts',
+                      'update_project_structure.py')
+
+
+@pytest.fixture(scope='module')
+def structure_script():
+    spec = importlib.util.spec_from_file_location('update_project_structure', SCRIPT)
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+@pytest.mark.parametrize('packages', [100, 1000, 5000])
+def test_get_structure(benchmark, structure_script, tmp_path, packages):
+    make_pycache_tree(str(tmp_path), packages)
+    structure = benchmark(structure_script.get_structure, str(tmp_path))
+    assert len(structure) > packages
+
+
+@pytest.mark.parametrize('jobs', [1, 8])
+@pytest.mark.parametrize('packages', [1000, 5000])
+def test_tree_walker(benchmark, tmp_path, packages, jobs):
+    make_pycache_tree(str(tmp_path), packages)
+    (tmp_path / '.gitignore').write_text('__pycache__/\n')
+    lines = benchmark(lambda: list(TreeWalker(str(tmp_path), jobs=jobs).lines()))
+    assert len(lines) > packages
+
+
+@pytest.mark.parametrize('packages', [1000, 5000])
+def test_tree_walker_incremental(benchmark, tmp_path, packages):
+    make_pycache_tree(str(tmp_path / 'tree'), packages)
+    # Listings of directories modified in the last seconds are not reused.
+    past = time.time() - 60
+    for dirpath, _, _ in os.walk(tmp_path / 'tree'):
+        os.utime(dirpath, (past, past))
+    cache_path = str(tmp_path / 'tree.json')
+    warm = ListingCache.load(cache_path)
+    list(TreeWalker(str(tmp_path / 'tree'), cache=warm).lines())
+    warm.save()
+
+    def walk():
+        return list(TreeWalker(str(tmp_path / 'tree'), cache=ListingCache.load(cache_path)).lines())
+
+    assert len(benchmark(walk)) > packages
@@ -0,0 +1,40 @@
+import pytest
+from synthetic import write_config
+from project_initializer.template_registry import TemplateRegistry
+
+# About the number of internal templates the registry was written for.
+TEMPLATE_COUNTS = [10, 80]
+
+
+@pytest.fixture(scope='module')
+def template_dirs(tmp_path_factory):
+    dirs = {}
+    for count in TEMPLATE_COUNTS:
+        directory = tmp_path_factory.mktemp(f'templates-{count}')
+        for index in range(count):
+            write_config(str(directory / f'template{index}.yaml'), 50)
+        dirs[count] = str(directory)
+    return dirs
+
+
+@pytest.mark.parametrize('count', TEMPLATE_COUNTS)
+def test_index_cold(benchmark, tmp_path, template_dirs, count):
+    paths = iter(range(1000000))
+
+    def index():
+        # A new index file every round, so every template is read and hashed.
+        return TemplateRegistry([template_dirs[count]], entry_points=False,
+                                index_path=str(tmp_path / f'index{next(paths)}.json')).names()
+
+    assert len(benchmark(index)) == count + 4
+
+
+@pytest.mark.parametrize('count', TEMPLATE_COUNTS)
+def test_index_warm_and_load_one(benchmark, tmp_path, template_dirs, count):
+    index_path = str(tmp_path / 'index.json')
+    TemplateRegistry([template_dirs[count]], entry_points=False, index_path=index_path).names()
+
+    def load():
+        return TemplateRegistry([template_dirs[count]], entry_points=False, index_path=index_path).load('template0')
+
+    assert len(benchmark(load)['files']) == 50
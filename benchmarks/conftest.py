@@ -0,0 +1,53 @@
+import os
+import pytest
+from synthetic import write_config
+
+# Number of files in each scenario. Sizes above --bench-max-files are skipped.
+SIZES = [100, 1000, 10000, 100000]
+# Large bodies make 100k file configurations over a gigabyte, so they stop here.
+MAX_LARGE_BODY_FILES = 10000
+
+
+def pytest_addoption(parser):
+    parser.addoption('--bench-max-files', type=int, default=10000,
+                     help='Largest synthetic project to benchmark (up to 100000).')
+
+
+def pytest_collection_modifyitems(config, items):
+    max_files = config.getoption('--bench-max-files')
+    for item in items:
+        params = getattr(item, 'callspec', None)
+        files = params.params.get('files') if params else None
+        if files is None:
+            continue
+        if files > max_files:
+            item.add_marker(pytest.mark.skip(reason=f"{files} files is above --bench-max-files={max_files}"))
+        elif params.params.get('body') == 'large' and files > MAX_LARGE_BODY_FILES:
+            item.add_marker(pytest.mark.skip(reason='large bodies are only generated up to 10000 files'))
+
+
+@pytest.fixture(autouse=True, scope='session')
+def isolated_cache_dir(tmp_path_factory):
+    """Keep the config and build caches of the benchmarks out of the user's cache directory."""
+    previous = os.environ.get('PROJECT_INITIALIZER_CACHE_DIR')
+    os.environ['PROJECT_INITIALIZER_CACHE_DIR'] = str(tmp_path_factory.mktemp('cache'))
+    yield
+    if previous is None:
+        del os.environ['PROJECT_INITIALIZER_CACHE_DIR']
+    else:
+        os.environ['PROJECT_INITIALIZER_CACHE_DIR'] = previous
+
+
+@pytest.fixture(scope='session')
+def config_factory(tmp_path_factory):
+    """Return a function writing a synthetic configuration once per (files, shape, body)."""
+    directory = tmp_path_factory.mktemp('configs')
+    written = {}
+
+    def factory(files, shape='wide', body='small'):
+        key = (files, shape, body)
+        if key not in written:
+            written[key] = write_config(str(directory / f"{files}-{shape}-{body}.yaml"), files, shape, body)
+        return written[key]
+
+    return factory
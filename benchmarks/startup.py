@@ -0,0 +1,130 @@
+# Directory: benchmarks/
+# File: startup.py
+
+"""
+Startup benchmark for the project-initializer CLI.
+
+Runs ``--help`` and ``init`` on a tiny configuration in fresh interpreters, records
+the wall time and the ``python -X importtime`` breakdown of each run, and compares
+them against ``startup_budget.json``. Exits with status 1 when a scenario goes over
+its budget or imports a module it should not load.
+
+Usage:
+    python benchmarks/startup.py [--runs 10] [--json results.json] [--budget path]
+"""
+
+import os
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+import tempfile
+import time
+from typing import Dict, List
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+DEFAULT_BUDGET = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'startup_budget.json')
+
+ENTRY_POINT = 'import sys; from project_initializer.cli import cli; sys.exit(cli())'
+
+TINY_CONFIG = """\
+directories:
+  - src
+files:
+  - path: src/__init__.py
+    content: ''
+"""
+
+
+def scenarios(workdir: str) -> Dict[str, List[str]]:
+    config = os.path.join(workdir, 'config.yaml')
+    with open(config, 'w', encoding='utf-8') as f:
+        f.write(TINY_CONFIG)
+    return {
+        'help': ['--help'],
+        'init': ['init', '--config', config, '--output', os.path.join(workdir, 'out'), '--no-config-cache'],
+    }
+
+
+def parse_importtime(stderr: str) -> Dict[str, int]:
+    """Return the self time, in microseconds, of every module listed in -X importtime output."""
+    modules = {}
+    for line in stderr.splitlines():
+        if not line.startswith('import time:') or 'cumulative' in line:
+            continue
+        self_us, _, name = line[len('import time:'):].split('|')
+        modules[name.strip()] = int(self_us)
+    return modules
+
+
+def run_once(args: List[str], cwd: str) -> Dict:
+    env = dict(os.environ, PYTHONPATH=os.pathsep.join(filter(None, [ROOT, os.environ.get('PYTHONPATH')])))
+    start = time.perf_counter()
+    process = subprocess.run([sys.executable, '-X', 'importtime', '-c', ENTRY_POINT] + args, cwd=cwd, env=env,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    wall = time.perf_counter() - start
+    if process.returncode != 0:
+        raise RuntimeError(f"{' '.join(args)} exited with {process.returncode}:\n{process.stderr}")
+    return {'wall_ms': wall * 1000, 'modules': parse_importtime(process.stderr)}
+
+
+def measure(args: List[str], cwd: str, runs: int) -> Dict:
+    samples = [run_once(args, cwd) for _ in range(runs)]
+    modules = samples[-1]['modules']
+    import_ms = [sum(sample['modules'].values()) / 1000 for sample in samples]
+    slowest = sorted(modules.items(), key=lambda item: item[1], reverse=True)[:10]
+    return {
+        'wall_ms': statistics.median(sample['wall_ms'] for sample in samples),
+        'import_ms': statistics.median(import_ms),
+        'modules': len(modules),
+        'slowest_imports': [{'module': name, 'self_ms': us / 1000} for name, us in slowest],
+        'loaded': sorted(modules),
+    }
+
+
+def check(name: str, result: Dict, budget: Dict) -> List[str]:
+    """Return a description of every way result goes over budget."""
+    failures = []
+    for key in ('wall_ms', 'import_ms'):
+        if key in budget and result[key] > budget[key]:
+            failures.append(f"{name}: {key} {result[key]:.1f} exceeds budget {budget[key]:.1f}")
+    for module in budget.get('forbidden_modules', []):
+        if module in result['loaded']:
+            failures.append(f"{name}: imports {module}")
+    return failures
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--runs', type=int, default=10, help='Interpreter launches per scenario.')
+    parser.add_argument('--budget', default=DEFAULT_BUDGET, help='JSON file with the budget of each scenario.')
+    parser.add_argument('--json', dest='json_path', help='Write the results to this JSON file.')
+    options = parser.parse_args(argv)
+
+    with open(options.budget, 'r', encoding='utf-8') as f:
+        budgets = json.load(f)
+
+    results, failures = {}, []
+    with tempfile.TemporaryDirectory() as workdir:
+        for name, args in scenarios(workdir).items():
+            run_once(args, workdir)  # warm the bytecode and OS caches
+            result = measure(args, workdir, options.runs)
+            results[name] = result
+            failures.extend(check(name, result, budgets.get(name, {})))
+            print(f"{name:6} wall {result['wall_ms']:7.1f} ms  imports {result['import_ms']:7.1f} ms  "
+                  f"({result['modules']} modules)")
+            for entry in result['slowest_imports'][:5]:
+                print(f"         {entry['self_ms']:7.2f} ms  {entry['module']}")
+
+    if options.json_path:
+        with open(options.json_path, 'w', encoding='utf-8') as f:
+            json.dump({'python': sys.version.split()[0], 'runs': options.runs, 'results': results}, f, indent=2)
+
+    for failure in failures:
+        print(f"REGRESSION {failure}", file=sys.stderr)
+    return 1 if failures else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
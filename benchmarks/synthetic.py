@@ -0,0 +1,97 @@
+# Directory: benchmarks/
+# File: synthetic.py
+
+"""
+Synthetic project configurations and trees for the benchmarks.
+
+Shapes:
+    wide: files spread over sqrt(n) packages of a two level tree.
+    deep: files spread along 16 levels of nested directories, two per level.
+
+Bodies:
+    small: a one line module of about 40 bytes.
+    large: a module of about 8 KiB.
+"""
+
+import os
+import json
+import math
+from typing import Dict, List
+
+SHAPES = ('wide', 'deep')
+BODIES = ('small', 'large', 'duplicate')
+DEEP_LEVELS = 16
+LARGE_BODY_BYTES = 8 * 1024
+
+
+def file_path(index: int, count: int, shape: str) -> str:
+    if shape == 'wide':
+        width = max(int(math.sqrt(count)), 1)
+        return f"pkg{index % width}/sub{index % 3}/module{index}.py"
+    if shape == 'deep':
+        depth = index % DEEP_LEVELS + 1
+        parts = [f"level{level}_{(index >> level) & 1}" for level in range(depth)]
+        return '/'.join(parts + [f"module{index}.py"])
+    raise ValueError(f"Unknown shape '{shape}', expected one of: {', '.join(SHAPES)}")
+
+
+def file_body(index: int, body: str) -> str:
+    line = f"value_{index} = {index}  # generated\n"
+    if body == 'small':
+        return line
+    if body == 'large':
+        return line * (LARGE_BODY_BYTES // len(line) + 1)
+    if body == 'duplicate':
+        # The same large body for every file, like license headers or package stubs.
+        line = "# generated\n"
+        return line * (LARGE_BODY_BYTES // len(line) + 1)
+    raise ValueError(f"Unknown body '{body}', expected one of: {', '.join(BODIES)}")
+
+
+def synthetic_config(files: int, shape: str = 'wide', body: str = 'small') -> Dict[str, List]:
+    """Return a configuration with the given number of files, shape and body size."""
+    paths = [file_path(index, files, shape) for index in range(files)]
+    directories = sorted({os.path.dirname(path) for path in paths})
+    return {
+        'directories': directories,
+        'files': [{'path': path, 'content': file_body(index, body)} for index, path in enumerate(paths)],
+    }
+
+
+def write_config(path: str, files: int, shape: str = 'wide', body: str = 'small') -> str:
+    """
+    Write a synthetic configuration as YAML and return its path.
+
+    Strings are emitted as JSON, which is valid double quoted YAML, because
+    ``yaml.dump`` takes longer than the benchmarks themselves at 100k files.
+    """
+    config = synthetic_config(files, shape, body)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('directories:\n')
+        for directory in config['directories']:
+            f.write(f"  - {json.dumps(directory)}\n")
+        f.write('files:\n')
+        for entry in config['files']:
+            f.write(f"  - path: {json.dumps(entry['path'])}\n    content: {json.dumps(entry['content'])}\n")
+    return path
+
+
+def make_pycache_tree(root: str, packages: int, modules: int = 5) -> int:
+    """
+    Create a source tree where every package has a ``__pycache__`` directory.
+
+    Returns:
+        int: The number of files created.
+    """
+    created = 0
+    for package in range(packages):
+        package_dir = os.path.join(root, f"pkg{package % 50}", f"sub{package}")
+        cache_dir = os.path.join(package_dir, '__pycache__')
+        os.makedirs(cache_dir, exist_ok=True)
+        for module in range(modules):
+            with open(os.path.join(package_dir, f"module{module}.py"), 'w') as f:
+                f.write('x = 1\n')
+            with open(os.path.join(cache_dir, f"module{module}.cpython-311.pyc"), 'wb') as f:
+                f.write(b'\0' * 256)
+            created += 2
+    return created
@@ -1,7 +1,47 @@
-from .file_manager import FileManager
-from .directory_manager import DirectoryManager
-from .config_loader import ConfigLoader
-from .cli import cli
-from .core import init_project_structure, build_project, clean_project
+import importlib
+import sys
+import types
 
-__all__ = ['cli', 'init_project_structure', 'build_project', 'clean_project']
+# Public attributes and the submodule defining them. Submodules are only imported
+# when one of their attributes is first accessed (PEP 562), so that importing the
+# package does not pull in click, yaml or the CLI stack.
+_LAZY_ATTRIBUTES = {
+    'FileManager': '.file_manager',
+    'DirectoryManager': '.directory_manager',
+    'ConfigLoader': '.config_loader',
+    'FileSystem': '.filesystem',
+    'OSFileSystem': '.filesystem',
+    'MemoryFileSystem': '.filesystem',
+    'cli': '.cli',
+    'init_project_structure': '.core',
+    'build_project': '.core',
+    'clean_project': '.core',
+    'generate_batch': '.batch',
+}
+
+__all__ = ['cli', 'init_project_structure', 'build_project', 'clean_project', 'generate_batch', 'MemoryFileSystem']
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
+
+class _Package(types.ModuleType):
+    def __setattr__(self, name, value):
+        # Importing the cli submodule binds it on the package under the same name
+        # as the click group exported from it; keep the group instead.
+        if name == 'cli' and isinstance(value, types.ModuleType):
+            value = value.cli
+        super().__setattr__(name, value)
+
+
+sys.modules[__name__].__class__ = _Package
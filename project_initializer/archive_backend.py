@@ -0,0 +1,225 @@
+# Directory: project_initializer/
+# File: archive_backend.py
+
+"""Module for writing generated projects straight into a tar or zip archive."""
+
+import io
+import os
+import sys
+import stat
+import time
+import shutil
+import logging
+import tarfile
+import zipfile
+import posixpath
+import threading
+from typing import BinaryIO, Optional
+from .filesystem import FileSystem
+
+# Archive formats and the tarfile stream mode used to write them.
+ARCHIVE_FORMATS = {
+    'tar': 'w|',
+    'tar.gz': 'w|gz',
+    'tar.bz2': 'w|bz2',
+    'tar.xz': 'w|xz',
+    'zip': None,
+}
+
+# File name suffixes recognized when no format is given, longest first.
+_SUFFIXES = [
+    ('.tar.gz', 'tar.gz'), ('.tgz', 'tar.gz'),
+    ('.tar.bz2', 'tar.bz2'), ('.tbz2', 'tar.bz2'),
+    ('.tar.xz', 'tar.xz'), ('.txz', 'tar.xz'),
+    ('.tar', 'tar'), ('.zip', 'zip'),
+]
+
+STDOUT = '-'
+DEFAULT_STDOUT_FORMAT = 'tar.gz'
+
+
+def archive_format_for(destination: str) -> str:
+    """
+    Return the archive format implied by a destination path.
+
+    Raises:
+        ValueError: If the file name does not end with a known archive suffix.
+    """
+    if destination == STDOUT:
+        return DEFAULT_STDOUT_FORMAT
+    name = destination.lower()
+    for suffix, archive_format in _SUFFIXES:
+        if name.endswith(suffix):
+            return archive_format
+    raise ValueError(f"Cannot tell the archive format of {destination}, "
+                     f"expected one of: {', '.join(suffix for suffix, _ in _SUFFIXES)}")
+
+
+def archive_name(path: str) -> str:
+    """
+    Normalize a generated path into an archive member name.
+
+    Raises:
+        ValueError: If the path is absolute or escapes the project root.
+    """
+    name = posixpath.normpath(path.replace(os.sep, '/'))
+    if posixpath.isabs(name) or name == '..' or name.startswith('../'):
+        raise ValueError(f"Path {path} is outside of the project and cannot be archived")
+    return '' if name == '.' else name
+
+
+class ArchiveBackend(FileSystem):
+    """
+    A write-only FileSystem that turns directories and files into the entries of a tar or zip archive.
+
+    Entries are appended to the archive stream as they are written, so nothing
+    reaches the filesystem and only the file being added is held in memory. The
+    parents of every entry are added first, once. Writing is serialized, since an
+    archive is a single stream.
+    """
+
+    concurrent = False
+
+    def __init__(self, fileobj: BinaryIO, archive_format: str = DEFAULT_STDOUT_FORMAT,
+                 logger: Optional[logging.Logger] = None):
+        if archive_format not in ARCHIVE_FORMATS:
+            raise ValueError(f"Unknown archive format '{archive_format}', "
+                             f"expected one of: {', '.join(ARCHIVE_FORMATS)}")
+        self.archive_format = archive_format
+        self.logger = logger or logging.getLogger(__name__)
+        self.mtime = time.time()
+        self.entries = 0
+        self._fileobj = fileobj
+        self._path: Optional[str] = None
+        self._directories = set()
+        self._files = set()
+        self._lock = threading.Lock()
+        if archive_format == 'zip':
+            self._zip = zipfile.ZipFile(fileobj, 'w', compression=zipfile.ZIP_DEFLATED)
+            self._tar = None
+        else:
+            self._tar = tarfile.open(fileobj=fileobj, mode=ARCHIVE_FORMATS[archive_format],
+                                     format=tarfile.PAX_FORMAT)
+            self._zip = None
+
+    @classmethod
+    def open(cls, destination: str, archive_format: Optional[str] = None,
+             logger: Optional[logging.Logger] = None) -> 'ArchiveBackend':
+        """Open an archive at destination, or on stdout when destination is '-'."""
+        archive_format = archive_format or archive_format_for(destination)
+        if destination == STDOUT:
+            return cls(sys.stdout.buffer, archive_format, logger)
+        fileobj = open(destination, 'wb')
+        try:
+            backend = cls(fileobj, archive_format, logger)
+        except Exception:
+            fileobj.close()
+            raise
+        backend._path = destination
+        return backend
+
+    def mkdir(self, path: str):
+        name = archive_name(path)
+        with self._lock:
+            if not name or name in self._directories or name in self._files:
+                raise FileExistsError(f"File exists: {name or path}")
+            self._add_directory(name)
+
+    def makedirs(self, path: str):
+        """Add a directory entry, and the entries of its missing parents."""
+        name = archive_name(path)
+        with self._lock:
+            self._add_directory(name)
+
+    def isdir(self, path: str) -> bool:
+        name = archive_name(path)
+        return not name or name in self._directories
+
+    def write_file(self, path: str, content: str):
+        """Add a file entry with the UTF-8 encoded content."""
+        data = content.encode('utf-8')
+        self._add_file(path, io.BytesIO(data), len(data), 0o644)
+
+    def copy_file(self, path: str, source: str, link: str = 'copy') -> Optional[str]:
+        """Add a file entry streamed from source, with its permission bits. Links do not apply to archives."""
+        with open(source, 'rb') as f:
+            st = os.fstat(f.fileno())
+            self._add_file(path, f, st.st_size, stat.S_IMODE(st.st_mode))
+        return None
+
+    def _add_file(self, path: str, fileobj: BinaryIO, size: int, mode: int):
+        name = archive_name(path)
+        if not name:
+            raise IsADirectoryError(f"Cannot write a file at the project root: {path}")
+        with self._lock:
+            self._add_directory(posixpath.dirname(name))
+            if name in self._files:
+                # Extraction keeps the last entry, like rewriting a file on disk.
+                self.logger.warning(f"{name} is written more than once, the archive keeps every copy")
+            self._files.add(name)
+            if self._zip is not None:
+                info = zipfile.ZipInfo(name, time.localtime(self.mtime)[:6])
+                info.compress_type = zipfile.ZIP_DEFLATED
+                info.external_attr = (stat.S_IFREG | mode) << 16
+                info.file_size = size
+                with self._zip.open(info, 'w') as entry:
+                    shutil.copyfileobj(fileobj, entry)
+            else:
+                info = tarfile.TarInfo(name)
+                info.size = size
+                info.mode = mode
+                info.mtime = self.mtime
+                self._tar.addfile(info, fileobj)
+            self.entries += 1
+
+    def _add_directory(self, name: str):
+        if not name or name in self._directories:
+            return
+        self._add_directory(posixpath.dirname(name))
+        self._directories.add(name)
+        if self._zip is not None:
+            info = zipfile.ZipInfo(name + '/', time.localtime(self.mtime)[:6])
+            info.external_attr = (0o40755 << 16) | 0x10
+            self._zip.writestr(info, b'')
+        else:
+            info = tarfile.TarInfo(name)
+            info.type = tarfile.DIRTYPE
+            info.mode = 0o755
+            info.mtime = self.mtime
+            self._tar.addfile(info)
+        self.entries += 1
+
+    def close(self):
+        """Finish the archive, closing its file unless it is stdout."""
+        try:
+            if self._zip is not None:
+                self._zip.close()
+            else:
+                self._tar.close()
+        finally:
+            if self._path is not None:
+                self._fileobj.close()
+            else:
+                self._fileobj.flush()
+
+    def discard(self):
+        """Close the archive and delete it, if it was written to a file."""
+        try:
+            self.close()
+        finally:
+            if self._path is not None:
+                try:
+                    os.remove(self._path)
+                except OSError:
+                    pass
+
+    def __enter__(self) -> 'ArchiveBackend':
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            self.close()
+            self.logger.info(f"Wrote {self.entries} entries to the {self.archive_format} archive")
+        else:
+            self.discard()
+        return False
@@ -0,0 +1,173 @@
+# Directory: project_initializer/
+# File: assets.py
+
+"""Module for copying asset files into generated projects without reading them into Python."""
+
+import os
+import stat
+import errno
+import logging
+import threading
+from typing import Dict, Optional
+from .filesystem import open_unshared
+
+logger = logging.getLogger(__name__)
+
+# How a ``source:`` file entry is materialized.
+LINK_MODES = ('copy', 'reflink', 'hard')
+DEFAULT_LINK_MODE = 'copy'
+
+# ioctl(FICLONE) shares the extents of a file on btrfs, XFS and other copy-on-write filesystems.
+_FICLONE = 0x40049409
+# Errors meaning a faster mechanism is unavailable here, rather than that the copy failed.
+_UNSUPPORTED = {errno.ENOSYS, errno.EXDEV, errno.EINVAL, errno.EOPNOTSUPP, errno.ENOTSUP, errno.ENOTTY,
+                errno.EBADF, errno.EPERM, errno.EMLINK}
+_READ_CHUNK_SIZE = 1024 * 1024
+
+
+def assets_dir_for(config_path: str, config_data: Optional[Dict] = None) -> str:
+    """Return the directory sources are relative to: the ``assets`` key, or the configuration's directory."""
+    base = os.path.dirname(os.path.abspath(config_path))
+    assets = (config_data or {}).get('assets')
+    return os.path.normpath(os.path.join(base, assets)) if assets else base
+
+
+def resolve_source(file: Dict, assets_dir: str) -> Dict:
+    """
+    Return a file entry whose source is an absolute path, or the entry itself if it has none.
+
+    Raises:
+        ValueError: If the entry has both content and a source, an unknown link mode,
+            or a source outside of the assets directory.
+    """
+    source = file.get('source')
+    if not source:
+        return file
+    if file.get('content'):
+        raise ValueError(f"File {file.get('path')} has both content and a source")
+    link = file.get('link') or DEFAULT_LINK_MODE
+    if link not in LINK_MODES:
+        raise ValueError(f"Unknown link mode '{link}' for {file.get('path')}, expected one of: {', '.join(LINK_MODES)}")
+    # Refuse absolute and escaping sources up front, and links leading out once the directory is known.
+    name = os.path.normpath(source)
+    path = os.path.join(assets_dir, source)
+    root = os.path.realpath(assets_dir)
+    if os.path.isabs(name) or name == os.pardir or name.startswith(os.pardir + os.sep) or \
+            (assets_dir and os.path.commonpath([root, os.path.realpath(path)]) != root):
+        raise ValueError(f"Source {source} of {file.get('path')} is outside of the assets directory")
+    resolved = dict(file)
+    resolved['source'] = path
+    resolved['link'] = link
+    return resolved
+
+
+def _clone(source_fd: int, target_fd: int) -> bool:
+    try:
+        import fcntl
+    except ImportError:
+        return False
+    try:
+        fcntl.ioctl(target_fd, _FICLONE, source_fd)
+        return True
+    except OSError as e:
+        if e.errno in _UNSUPPORTED:
+            return False
+        raise
+
+
+def _copy_file_range(source_fd: int, target_fd: int, size: int) -> bool:
+    copy_file_range = getattr(os, 'copy_file_range', None)
+    if copy_file_range is None:
+        return False
+    copied = 0
+    while copied < size:
+        try:
+            count = copy_file_range(source_fd, target_fd, size - copied)
+        except OSError as e:
+            # Older kernels refuse to copy across filesystems; only fall back before any byte moved.
+            if copied == 0 and e.errno in _UNSUPPORTED:
+                return False
+            raise
+        if count == 0:
+            break
+        copied += count
+    return True
+
+
+def _sendfile(source_fd: int, target_fd: int, size: int) -> bool:
+    sendfile = getattr(os, 'sendfile', None)
+    if sendfile is None:
+        return False
+    copied = 0
+    while copied < size:
+        try:
+            count = sendfile(target_fd, source_fd, copied, size - copied)
+        except OSError as e:
+            # Only Linux sends between regular files.
+            if copied == 0 and e.errno in _UNSUPPORTED:
+                return False
+            raise
+        if count == 0:
+            break
+        copied += count
+    return True
+
+
+def _read_write(source_fd: int, target_fd: int):
+    while True:
+        chunk = os.read(source_fd, _READ_CHUNK_SIZE)
+        if not chunk:
+            return
+        view = memoryview(chunk)
+        while view:
+            view = view[os.write(target_fd, view):]
+
+
+def _hard_link(source: str, target: str) -> bool:
+    # Linking next to the target and renaming replaces an existing file like a write does.
+    temporary = f"{target}.{os.getpid()}-{threading.get_ident()}.link"
+    try:
+        os.link(source, temporary)
+    except OSError as e:
+        if e.errno in _UNSUPPORTED:
+            return False
+        raise
+    try:
+        os.replace(temporary, target)
+    except OSError:
+        os.unlink(temporary)
+        raise
+    return True
+
+
+def copy_file(source: str, target: str, link: str = DEFAULT_LINK_MODE) -> str:
+    """
+    Copy source to target, letting the kernel move the bytes.
+
+    ``hard`` links target to source, so both share one inode, and copies when
+    they are on different filesystems. ``reflink`` clones source on copy-on-write
+    filesystems, so the data is only duplicated once either file is modified, and
+    copies elsewhere. ``copy`` uses ``copy_file_range``, then ``sendfile`` and,
+    where neither works, a read/write loop. Copies get the permission bits of source.
+
+    Returns:
+        str: The mechanism used: 'hard', 'reflink', 'copy_file_range', 'sendfile' or 'read'.
+    """
+    if link == 'hard':
+        if _hard_link(source, target):
+            return 'hard'
+        logger.debug("Cannot hard link %s, copying it", source)
+    with open(source, 'rb') as src, open_unshared(target, 'wb') as dst:
+        st = os.fstat(src.fileno())
+        if link != 'copy' and stat.S_ISREG(st.st_mode) and _clone(src.fileno(), dst.fileno()):
+            method = 'reflink'
+        elif _copy_file_range(src.fileno(), dst.fileno(), st.st_size):
+            method = 'copy_file_range'
+        elif _sendfile(src.fileno(), dst.fileno(), st.st_size):
+            method = 'sendfile'
+        else:
+            _read_write(src.fileno(), dst.fileno())
+            method = 'read'
+        if hasattr(os, 'fchmod'):
+            os.fchmod(dst.fileno(), stat.S_IMODE(st.st_mode))
+    return method
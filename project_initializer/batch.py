@@ -0,0 +1,160 @@
+# Directory: project_initializer/
+# File: batch.py
+
+"""Module for generating many projects from a single configuration in parallel."""
+
+import os
+import time
+import logging
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List, Optional
+from .assets import assets_dir_for
+from .config_loader import ConfigLoader
+from .content_store import ContentStore
+from .core import generate_project_structure
+from .staging import StagedOutput
+from .template_registry import load_template
+
+logger = logging.getLogger(__name__)
+
+# Configuration shared by every project generated in a worker process.
+_worker_state: Dict = {}
+
+
+class BatchResult:
+    """The outcome of generating one project of a batch."""
+
+    def __init__(self, output: str, summary: Optional[Dict[str, int]] = None, error: Optional[str] = None,
+                 elapsed: float = 0.0):
+        self.output = output
+        self.summary = summary or {}
+        self.error = error
+        self.elapsed = elapsed
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and not self.summary.get('errors')
+
+    def to_dict(self) -> Dict:
+        return {'output': self.output, 'summary': self.summary, 'error': self.error, 'elapsed': self.elapsed}
+
+
+def load_matrix(matrix_path: str) -> Dict:
+    """
+    Load a batch matrix file.
+
+    The matrix lists the projects to generate, each with an ``output`` directory
+    and optional ``variables``. It may also name the ``config`` and ``template``
+    to use and ``variables`` shared by every project::
+
+        config: config.yaml
+        template: web
+        variables: {org: acme}
+        projects:
+          - output: services/billing
+            variables: {service: billing}
+
+    Raises:
+        ValueError: If the matrix does not list any project or a project has no output.
+    """
+    matrix = ConfigLoader.load_config(matrix_path) or {}
+    projects = matrix.get('projects')
+    if not isinstance(projects, list) or not projects:
+        raise ValueError(f"Batch file {matrix_path} must contain a non-empty 'projects' list")
+    for index, project in enumerate(projects):
+        if not isinstance(project, dict) or not project.get('output'):
+            raise ValueError(f"Project #{index + 1} in {matrix_path} has no 'output' directory")
+    if matrix.get('config'):
+        matrix['config'] = os.path.join(os.path.dirname(os.path.abspath(matrix_path)), matrix['config'])
+    return matrix
+
+
+def _init_worker(config_data: Dict, template_config: Dict, options: Dict, staged: bool = False):
+    options = dict(options)
+    dedup = options.pop('dedup', None)
+    dedup_exclude = options.pop('dedup_exclude', ())
+    if dedup:
+        # One store per worker, so identical files are also linked across the projects it generates.
+        options['content_store'] = ContentStore(dedup, dedup_exclude)
+    _worker_state['config_data'] = config_data
+    _worker_state['template_config'] = template_config
+    _worker_state['options'] = options
+    _worker_state['staged'] = staged
+
+
+def _generate_in(directory: str, variables: Dict[str, str]) -> Dict[str, int]:
+    original_dir = os.getcwd()
+    os.chdir(directory)
+    try:
+        return generate_project_structure(_worker_state['config_data'], _worker_state['template_config'],
+                                          variables=variables, **_worker_state['options'])
+    finally:
+        os.chdir(original_dir)
+
+
+def _generate_one(output: str, variables: Dict[str, str]) -> BatchResult:
+    start = time.perf_counter()
+    try:
+        if _worker_state.get('staged'):
+            with StagedOutput(output) as staging_dir:
+                summary = _generate_in(staging_dir, variables)
+                if summary['errors']:
+                    raise RuntimeError(f"{summary['errors']} files could not be written, {output} was not changed")
+        else:
+            os.makedirs(output, exist_ok=True)
+            summary = _generate_in(output, variables)
+        return BatchResult(output, summary, elapsed=time.perf_counter() - start)
+    except Exception as e:
+        logger.error(f"Error generating project in {output}: {str(e)}")
+        return BatchResult(output, error=f"{type(e).__name__}: {str(e)}", elapsed=time.perf_counter() - start)
+
+
+def generate_batch(config_path: str, projects: List[Dict], template: str = 'default', jobs: Optional[int] = None,
+                   base_dir: str = '.', variables: Optional[Dict[str, str]] = None, use_config_cache: bool = True,
+                   staged: bool = False, **options) -> List[BatchResult]:
+    """
+    Generate one project per entry of projects, parsing the configuration only once.
+
+    The configuration is parsed and merged with its template in the calling
+    process, then handed to each worker process once when the pool starts.
+
+    Args:
+        config_path (str): Path to the configuration file shared by every project.
+        projects (List[Dict]): Entries with an ``output`` directory and optional ``variables``.
+        template (str): Template to use for every project.
+        jobs (Optional[int]): Number of worker processes. Defaults to the CPU count;
+            1 generates every project in the calling process.
+        base_dir (str): Directory relative outputs are resolved against.
+        variables (Optional[Dict[str, str]]): Variables shared by every project. Per-project
+            variables take precedence over them.
+        use_config_cache (bool): Reuse the parsed configuration from the on-disk cache.
+        staged (bool): Generate each project in a staging directory and publish it with one
+            atomic rename, replacing any previous tree. Failed projects leave their output untouched.
+        **options: Passed on to generate_project_structure (workers, max_open_files, incremental,
+            precedence, assets_dir), and ``dedup``/``dedup_exclude`` as for init_project_structure.
+
+    Returns:
+        List[BatchResult]: One result per project, in the order of projects.
+    """
+    if not os.path.exists(config_path):
+        raise FileNotFoundError(f"Configuration file not found: {config_path}")
+    if staged and options.get('incremental'):
+        raise ValueError("Staged generation replaces each output and cannot be combined with incremental runs")
+    config_data = ConfigLoader.load_config(config_path, use_cache=use_config_cache)
+    template_config = load_template(template)
+    options['assets_dir'] = options.get('assets_dir') or assets_dir_for(config_path, config_data)
+
+    tasks = []
+    for project in projects:
+        project_variables = dict(variables or {})
+        project_variables.update(project.get('variables') or {})
+        tasks.append((os.path.abspath(os.path.join(base_dir, project['output'])), project_variables))
+
+    logger.info(f"Generating {len(tasks)} projects with {jobs or os.cpu_count()} processes")
+    if jobs == 1:
+        _init_worker(config_data, template_config, options, staged)
+        return [_generate_one(output, project_variables) for output, project_variables in tasks]
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(config_data, template_config, options, staged)) as executor:
+        return list(executor.map(_generate_one, *zip(*tasks)))
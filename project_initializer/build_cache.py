@@ -0,0 +1,208 @@
+# Directory: project_initializer/
+# File: build_cache.py
+
+"""Module for caching the outputs of build steps by a fingerprint of their inputs."""
+
+import os
+import json
+import time
+import shutil
+import fnmatch
+import hashlib
+import logging
+import threading
+from typing import Iterator, List, Optional, Sequence, Set
+from .config_loader import cache_root
+from .manifest import hash_file
+
+logger = logging.getLogger(__name__)
+
+# Directories never treated as build inputs, wherever they appear.
+EXCLUDED_INPUT_DIRS = {'.git', '__pycache__', 'node_modules', 'build', 'dist', '.tox', '.venv', 'venv',
+                       '.pytest_cache', '.mypy_cache'}
+
+
+def _has_glob(pattern: str) -> bool:
+    return any(char in pattern for char in '*?[')
+
+
+def _match_name(pattern: str, name: str) -> bool:
+    # As with glob, wildcards do not match a leading dot.
+    if name.startswith('.') and not pattern.startswith('.'):
+        return False
+    return fnmatch.fnmatchcase(name, pattern)
+
+
+def _match_parts(pattern: Sequence[str], parts: Sequence[str]) -> bool:
+    if not pattern:
+        return not parts
+    if pattern[0] == '**':
+        for index in range(len(parts) + 1):
+            if _match_parts(pattern[1:], parts[index:]):
+                return True
+            if index < len(parts) and parts[index].startswith('.'):
+                return False
+        return False
+    return bool(parts) and _match_name(pattern[0], parts[0]) and _match_parts(pattern[1:], parts[1:])
+
+
+def glob_inputs(pattern: str, excluded: Set[str]) -> List[str]:
+    """
+    Return the paths matching pattern, like ``glob.glob(pattern, recursive=True)``.
+
+    Directories named in excluded are never entered, so a ``**`` pattern does
+    not cost a walk of ``node_modules`` or ``.git``, and the walk stops at the
+    depth of the pattern when it has no ``**``.
+    """
+    parts = pattern.replace(os.sep, '/').split('/')
+    fixed = 0
+    while fixed < len(parts) - 1 and not _has_glob(parts[fixed]):
+        fixed += 1
+    base = '/'.join(parts[:fixed]) or ('/' if pattern.startswith(('/', os.sep)) else '.')
+    rest = parts[fixed:]
+    matches = []
+    for dirpath, dirnames, filenames in os.walk(base):
+        dirnames[:] = [name for name in dirnames if name not in excluded]
+        relative = os.path.relpath(dirpath, base)
+        prefix = [] if relative == '.' else relative.split(os.sep)
+        # Relative patterns give relative paths, without a leading './'.
+        location = dirpath if base != '.' else os.path.join('', *prefix)
+        matches.extend(os.path.join(location, name) for name in dirnames + filenames
+                       if _match_parts(rest, prefix + [name]))
+        if '**' not in rest and len(prefix) + 1 >= len(rest):
+            dirnames[:] = []
+    return sorted(matches)
+
+
+class BuildCache:
+    """
+    A local, content-addressed store of successful build step outputs.
+
+    A step's fingerprint covers its name, its command and the relative path and
+    content hash of every declared input. After a successful run its declared
+    outputs are copied to ``<cache_dir>/<fingerprint>``. A later run with the same
+    fingerprint is skipped when the workspace still holds the outputs of that
+    fingerprint, or restored from the cache otherwise.
+    """
+
+    def __init__(self, cache_dir: Optional[str] = None):
+        self.cache_dir = cache_dir or os.path.join(cache_root(), 'builds')
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+    def _iter_inputs(self, step) -> Iterator[str]:
+        excluded = EXCLUDED_INPUT_DIRS.union(os.path.normpath(output) for output in step.outputs)
+        for pattern in step.inputs:
+            full_pattern = os.path.join(step.cwd, pattern)
+            if _has_glob(pattern):
+                matches = glob_inputs(full_pattern, excluded)
+            elif os.path.isdir(full_pattern):
+                matches = []
+                for root, dirs, files in os.walk(full_pattern):
+                    dirs[:] = sorted(d for d in dirs if d not in excluded)
+                    matches.extend(os.path.join(root, name) for name in sorted(files))
+            else:
+                matches = [full_pattern]
+            for path in matches:
+                relative = os.path.relpath(path, step.cwd)
+                if excluded.intersection(relative.split(os.sep)[:-1]):
+                    continue
+                yield relative
+
+    def fingerprint(self, step) -> Optional[str]:
+        """Return the fingerprint of a step's inputs, or None if the step declares none."""
+        if not step.inputs:
+            return None
+        digest = hashlib.sha256(json.dumps([step.name, step.command]).encode('utf-8'))
+        for relative in sorted(set(self._iter_inputs(step))):
+            path = os.path.join(step.cwd, relative)
+            content = hash_file(path) if os.path.isfile(path) else 'missing'
+            digest.update(f"{relative.replace(os.sep, '/')}\0{content}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+    def _entry_dir(self, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, fingerprint[:2], fingerprint)
+
+    def _stamp_path(self, step) -> str:
+        key = hashlib.sha256(f"{os.path.abspath(step.cwd)}\0{step.name}".encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, 'workspaces', key)
+
+    def _read_stamp(self, step) -> Optional[str]:
+        try:
+            with open(self._stamp_path(step), 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _write_stamp(self, step, fingerprint: str):
+        path = self._stamp_path(step)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write(fingerprint)
+
+    def lookup(self, step, fingerprint: str) -> Optional[str]:
+        """
+        Reuse a previous success of a step.
+
+        Returns:
+            Optional[str]: ``'skipped'`` when the workspace already holds the outputs,
+            ``'restored'`` when they were copied back from the cache, or None on a miss.
+        """
+        entry = self._entry_dir(fingerprint)
+        hit = os.path.exists(os.path.join(entry, 'meta.json'))
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+        if not hit:
+            return None
+        outputs_present = all(os.path.lexists(os.path.join(step.cwd, output)) for output in step.outputs)
+        if outputs_present and self._read_stamp(step) == fingerprint:
+            return 'skipped'
+        for output in step.outputs:
+            target = os.path.join(step.cwd, output)
+            source = os.path.join(entry, 'outputs', output)
+            if os.path.isdir(target) and not os.path.islink(target):
+                shutil.rmtree(target)
+            elif os.path.lexists(target):
+                os.remove(target)
+            if os.path.isdir(source):
+                shutil.copytree(source, target, symlinks=True)
+            elif os.path.lexists(source):
+                os.makedirs(os.path.dirname(target) or '.', exist_ok=True)
+                shutil.copy2(source, target, follow_symlinks=False)
+        self._write_stamp(step, fingerprint)
+        return 'restored'
+
+    def store(self, step, fingerprint: str, elapsed: float):
+        """Copy the outputs of a successful step into the cache."""
+        entry = self._entry_dir(fingerprint)
+        staging = f"{entry}.{os.getpid()}.tmp"
+        try:
+            shutil.rmtree(staging, ignore_errors=True)
+            os.makedirs(os.path.join(staging, 'outputs'))
+            for output in step.outputs:
+                source = os.path.join(step.cwd, output)
+                target = os.path.join(staging, 'outputs', output)
+                if os.path.isdir(source):
+                    shutil.copytree(source, target, symlinks=True)
+                elif os.path.lexists(source):
+                    os.makedirs(os.path.dirname(target), exist_ok=True)
+                    shutil.copy2(source, target, follow_symlinks=False)
+            with open(os.path.join(staging, 'meta.json'), 'w', encoding='utf-8') as f:
+                json.dump({'step': step.name, 'command': step.command, 'outputs': step.outputs,
+                           'elapsed': elapsed, 'created': time.time()}, f)
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # Another build stored the same fingerprint first.
+                shutil.rmtree(staging, ignore_errors=True)
+            self._write_stamp(step, fingerprint)
+        except OSError as e:
+            shutil.rmtree(staging, ignore_errors=True)
+            logger.warning(f"Could not store build step {step.name} in the cache: {str(e)}")
+
+    def describe(self) -> str:
+        return f"Build cache: {self.hits} hits, {self.misses} misses"
@@ -0,0 +1,219 @@
+# Directory: project_initializer/
+# File: build_pipeline.py
+
+"""Module for running build steps concurrently while respecting their dependencies."""
+
+import os
+import sys
+import time
+import shutil
+import asyncio
+import logging
+from typing import Callable, Dict, Iterable, List, Optional, Sequence
+
+logger = logging.getLogger(__name__)
+
+OutputCallback = Callable[[str, str], None]
+
+# Bytes of step output read at a time.
+_READ_SIZE = 64 * 1024
+
+
+class BuildStep:
+    """
+    A command to run as part of a build.
+
+    Args:
+        name (str): Unique name of the step, used to declare dependencies and prefix output.
+        command (Sequence[str]): Program and arguments, run without a shell.
+        cwd (str): Directory the command runs in.
+        depends_on (Iterable[str]): Names of the steps that must succeed first.
+        description (str): Human readable summary used in the build actions.
+        inputs (Iterable[str]): Files, directories or glob patterns, relative to cwd, that
+            determine the result of the step. Steps without inputs are never cached.
+        outputs (Iterable[str]): Files or directories, relative to cwd, produced by the step.
+    """
+
+    def __init__(self, name: str, command: Sequence[str], cwd: str = '.', depends_on: Iterable[str] = (),
+                 description: Optional[str] = None, inputs: Iterable[str] = (), outputs: Iterable[str] = ()):
+        self.name = name
+        self.command = list(command)
+        self.cwd = cwd
+        self.depends_on = list(depends_on)
+        self.description = description or ' '.join(self.command)
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+
+
+class StepResult:
+    """The outcome of a build step: its exit code, wall time and captured output lines."""
+
+    def __init__(self, step: BuildStep, returncode: Optional[int] = None, elapsed: float = 0.0,
+                 output: Optional[List[str]] = None, error: Optional[str] = None, skipped: bool = False,
+                 cached: Optional[str] = None):
+        self.step = step
+        self.returncode = returncode
+        self.elapsed = elapsed
+        self.output = output or []
+        self.error = error
+        self.skipped = skipped
+        # 'skipped' or 'restored' when a cached success was reused
+        self.cached = cached
+
+    @property
+    def ok(self) -> bool:
+        return not self.skipped and self.error is None and self.returncode == 0
+
+    def describe(self) -> str:
+        if self.skipped:
+            return f"Skipped '{self.step.description}': {self.error}"
+        if self.error is not None:
+            return f"Failed '{self.step.description}' after {self.elapsed:.2f}s: {self.error}"
+        if self.returncode != 0:
+            return f"Failed '{self.step.description}' with exit code {self.returncode} after {self.elapsed:.2f}s"
+        if self.cached == 'skipped':
+            return f"Skipped '{self.step.description}': inputs unchanged (cache hit)"
+        if self.cached == 'restored':
+            return f"Restored '{self.step.description}' outputs from cache in {self.elapsed:.2f}s"
+        return f"Ran '{self.step.description}' in {self.elapsed:.2f}s"
+
+
+class BuildPipeline:
+    """
+    Runs a set of build steps, starting each one as soon as its dependencies succeeded.
+
+    Independent steps run concurrently, at most ``jobs`` at a time. The output of
+    every step is read line by line as it is produced, handed to ``on_output``
+    and kept on the step's result. A step whose dependency failed is skipped.
+    With a ``cache``, steps whose inputs match a previous success are not run.
+    """
+
+    def __init__(self, steps: List[BuildStep], jobs: Optional[int] = None,
+                 on_output: Optional[OutputCallback] = None, cache=None):
+        self.steps = steps
+        self.jobs = jobs or os.cpu_count() or 1
+        self.on_output = on_output
+        self.cache = cache
+        self._validate()
+
+    def _validate(self):
+        names = {step.name for step in self.steps}
+        if len(names) != len(self.steps):
+            raise ValueError("Build step names must be unique")
+        for step in self.steps:
+            missing = [name for name in step.depends_on if name not in names]
+            if missing:
+                raise ValueError(f"Build step '{step.name}' depends on unknown steps: {', '.join(missing)}")
+        self.order()
+
+    def order(self) -> List[BuildStep]:
+        """Return the steps in a dependency respecting order, raising ValueError on cycles."""
+        by_name = {step.name: step for step in self.steps}
+        ordered, state = [], {}
+
+        def visit(step, chain):
+            if state.get(step.name) == 'done':
+                return
+            if state.get(step.name) == 'visiting':
+                raise ValueError(f"Build steps have a dependency cycle: {' -> '.join(chain + [step.name])}")
+            state[step.name] = 'visiting'
+            for name in step.depends_on:
+                visit(by_name[name], chain + [step.name])
+            state[step.name] = 'done'
+            ordered.append(step)
+
+        for step in self.steps:
+            visit(step, [])
+        return ordered
+
+    def run(self) -> List[StepResult]:
+        """Run every step and return their results in declaration order."""
+        loop = asyncio.new_event_loop()
+        try:
+            return loop.run_until_complete(self._run_all())
+        finally:
+            loop.close()
+
+    async def _run_all(self) -> List[StepResult]:
+        semaphore = asyncio.Semaphore(self.jobs)
+        tasks: Dict[str, asyncio.Future] = {}
+        for step in self.order():
+            tasks[step.name] = asyncio.ensure_future(self._run_after_dependencies(step, tasks, semaphore))
+        results = await asyncio.gather(*tasks.values())
+        by_name = {result.step.name: result for result in results}
+        return [by_name[step.name] for step in self.steps]
+
+    async def _run_after_dependencies(self, step: BuildStep, tasks: Dict[str, asyncio.Future],
+                                      semaphore: asyncio.Semaphore) -> StepResult:
+        for name in step.depends_on:
+            dependency = await tasks[name]
+            if not dependency.ok:
+                return StepResult(step, skipped=True, error=f"dependency '{name}' did not succeed")
+        async with semaphore:
+            if self.cache is None:
+                return await self._run_step(step)
+            return await self._run_cached_step(step)
+
+    async def _run_cached_step(self, step: BuildStep) -> StepResult:
+        # Hashing inputs and copying outputs are blocking, keep them off the event loop.
+        loop = asyncio.get_running_loop()
+        start = time.perf_counter()
+        fingerprint = await loop.run_in_executor(None, self.cache.fingerprint, step)
+        if fingerprint is not None:
+            cached = await loop.run_in_executor(None, self.cache.lookup, step, fingerprint)
+            if cached is not None:
+                logger.debug(f"Build step {step.name} {cached} from cache ({fingerprint[:12]})")
+                return StepResult(step, returncode=0, elapsed=time.perf_counter() - start, cached=cached)
+        result = await self._run_step(step)
+        if fingerprint is not None and result.ok:
+            await loop.run_in_executor(None, self.cache.store, step, fingerprint, result.elapsed)
+        return result
+
+    async def _run_step(self, step: BuildStep) -> StepResult:
+        logger.debug(f"Running build step {step.name}: {step.description}")
+        start = time.perf_counter()
+        output: List[str] = []
+        program = shutil.which(step.command[0]) or step.command[0]
+        try:
+            process = await asyncio.create_subprocess_exec(
+                program, *step.command[1:], cwd=step.cwd,
+                stdout=asyncio.subprocess.PIPE, stderr=asyncio.subprocess.STDOUT)
+        except OSError as e:
+            return StepResult(step, elapsed=time.perf_counter() - start, error=str(e))
+
+        # Read in chunks rather than with readline, whose buffer limit a long line would overrun.
+        pending = b''
+        while True:
+            chunk = await process.stdout.read(_READ_SIZE)
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                self._emit(step, output, line)
+        if pending:
+            self._emit(step, output, pending)
+        returncode = await process.wait()
+        elapsed = time.perf_counter() - start
+        logger.debug(f"Build step {step.name} exited with {returncode} after {elapsed:.2f}s")
+        return StepResult(step, returncode=returncode, elapsed=elapsed, output=output)
+
+    def _emit(self, step: BuildStep, output: List[str], line: bytes):
+        text = line.decode('utf-8', errors='replace').rstrip('\r')
+        output.append(text)
+        if self.on_output is not None:
+            self.on_output(step.name, text)
+
+
+def default_build_steps(directory: str) -> List[BuildStep]:
+    """Detect the build steps of a project: a Python build for setup.py and npm install for package.json."""
+    steps = []
+    if os.path.exists(os.path.join(directory, 'setup.py')):
+        steps.append(BuildStep('python-build', [sys.executable, 'setup.py', 'build'], cwd=directory,
+                               description='python setup.py build',
+                               inputs=['setup.py', 'setup.cfg', 'pyproject.toml', 'MANIFEST.in', '**/*.py'],
+                               outputs=['build']))
+    if os.path.exists(os.path.join(directory, 'package.json')):
+        steps.append(BuildStep('npm-install', ['npm', 'install'], cwd=directory, description='npm install',
+                               inputs=['package.json', 'package-lock.json'], outputs=['node_modules']))
+    return steps
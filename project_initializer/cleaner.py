@@ -0,0 +1,149 @@
+# Directory: project_initializer/
+# File: cleaner.py
+
+"""Module for finding and removing generated files in a single pass over a project tree."""
+
+import os
+import re
+import shutil
+import fnmatch
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Iterable, List, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DIRECTORIES = ['build', 'dist', '__pycache__']
+DEFAULT_FILE_PATTERNS = ['*.pyc', '*.pyo', '*.pyd', '*.so']
+CACHE_DIRECTORIES = ['.pytest_cache', '.mypy_cache', '.tox']
+CACHE_FILE_PATTERNS = ['.coverage']
+
+
+def compile_patterns(patterns: Iterable[str]) -> Optional['re.Pattern']:
+    """Combine glob patterns into a single regular expression, or None if there are none."""
+    patterns = list(patterns)
+    if not patterns:
+        return None
+    return re.compile('|'.join(f"(?:{fnmatch.translate(pattern)})" for pattern in patterns))
+
+
+class CleanTarget:
+    """A file or directory selected for removal, with the number of files and bytes it holds."""
+
+    def __init__(self, path: str, is_dir: bool, files: int = 0, size: int = 0):
+        self.path = path
+        self.is_dir = is_dir
+        self.files = files
+        self.size = size
+
+    @property
+    def kind(self) -> str:
+        return 'directory' if self.is_dir else 'file'
+
+
+class Cleaner:
+    """
+    Removes generated directories and files from a project tree.
+
+    The tree is walked once with ``os.scandir``. Directory names are looked up
+    in a set and file names go through one compiled matcher built from every
+    pattern. A matched directory is never descended into. Removals are then
+    spread over a thread pool, with large directories split by their children.
+    """
+
+    def __init__(self, directories: Iterable[str] = DEFAULT_DIRECTORIES,
+                 file_patterns: Iterable[str] = DEFAULT_FILE_PATTERNS, workers: Optional[int] = None):
+        self.directories = set(directories)
+        self.file_matcher = compile_patterns(file_patterns)
+        self.workers = workers
+
+    @classmethod
+    def for_project(cls, all_files: bool = False, workers: Optional[int] = None) -> 'Cleaner':
+        directories = list(DEFAULT_DIRECTORIES)
+        file_patterns = list(DEFAULT_FILE_PATTERNS)
+        if all_files:
+            directories.extend(CACHE_DIRECTORIES)
+            file_patterns.extend(CACHE_FILE_PATTERNS)
+        return cls(directories, file_patterns, workers)
+
+    def scan(self, directory: str, measure: bool = False) -> List[CleanTarget]:
+        """
+        Return every target under directory in depth-first order.
+
+        Args:
+            directory (str): Root of the project tree.
+            measure (bool): Count the files and bytes held by every target, which
+                requires walking the content of matched directories.
+        """
+        targets = []
+        stack = [directory]
+        while stack:
+            current = stack.pop()
+            subdirectories = []
+            try:
+                with os.scandir(current) as entries:
+                    for entry in entries:
+                        if entry.is_dir(follow_symlinks=False):
+                            if entry.name in self.directories:
+                                target = CleanTarget(entry.path, True)
+                                if measure:
+                                    target.files, target.size = _measure(entry.path)
+                                targets.append(target)
+                            else:
+                                subdirectories.append(entry.path)
+                        elif self.file_matcher is not None and self.file_matcher.match(entry.name):
+                            size = entry.stat(follow_symlinks=False).st_size if measure else 0
+                            targets.append(CleanTarget(entry.path, False, 1, size))
+            except OSError as e:
+                logger.warning(f"Cannot read directory {current}: {str(e)}")
+            stack.extend(reversed(sorted(subdirectories)))
+        return targets
+
+    def remove(self, targets: List[CleanTarget]) -> List[Tuple[str, Exception]]:
+        """Remove the given targets concurrently and return the (path, error) pairs that failed."""
+        errors = []
+        emptied_directories = []
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            futures = []
+            for target in targets:
+                if not target.is_dir:
+                    futures.append((target.path, executor.submit(os.remove, target.path)))
+                    continue
+                # Split each directory by its children so one huge tree uses every worker.
+                try:
+                    with os.scandir(target.path) as entries:
+                        for entry in entries:
+                            if entry.is_dir(follow_symlinks=False):
+                                futures.append((entry.path, executor.submit(shutil.rmtree, entry.path)))
+                            else:
+                                futures.append((entry.path, executor.submit(os.remove, entry.path)))
+                except OSError as e:
+                    errors.append((target.path, e))
+                    continue
+                emptied_directories.append(target.path)
+            for path, future in futures:
+                try:
+                    future.result()
+                except OSError as e:
+                    errors.append((path, e))
+        for path in emptied_directories:
+            try:
+                os.rmdir(path)
+            except OSError as e:
+                errors.append((path, e))
+        return errors
+
+
+def _measure(directory: str) -> Tuple[int, int]:
+    """Return the number of files and bytes held by a directory tree."""
+    files = size = 0
+    stack = [directory]
+    while stack:
+        with os.scandir(stack.pop()) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    stack.append(entry.path)
+                else:
+                    files += 1
+                    size += entry.stat(follow_symlinks=False).st_size
+    return files, size
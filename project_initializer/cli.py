@@ -1,49 +1,144 @@
 import click
 import logging
 import os
-from .core import init_project_structure, build_project, clean_project
-from .config_loader import ConfigLoader
-from .directory_manager import DirectoryManager
-from .file_manager import FileManager
+import time
+from .logging_setup import LOG_FORMATS, configure_logging, stop_logging
+
+# Commands import the modules they need when they run, so that `--help` and
+# argument errors don't pay for yaml and the generation engine.
 
 logger = logging.getLogger(__name__)
 
-def setup_logging(verbose, log_file):
-    log_level = logging.DEBUG if verbose else logging.INFO
-    logging.basicConfig(level=log_level, format='%(asctime)s - %(name)s - %(levelname)s - %(message)s')
-    
-    if log_file:
-        file_handler = logging.FileHandler(log_file)
-        file_handler.setLevel(log_level)
-        file_handler.setFormatter(logging.Formatter('%(asctime)s - %(name)s - %(levelname)s - %(message)s'))
-        logging.getLogger().addHandler(file_handler)
-    
-    # Ensure all loggers are set to the correct level
-    for name in logging.root.manager.loggerDict:
-        logging.getLogger(name).setLevel(log_level)
-    
+def parse_variables(ctx, param, values):
+    """Turn repeated --var key=value options into a dictionary."""
+    variables = {}
+    for value in values:
+        name, sep, content = value.partition('=')
+        if not sep or not name:
+            raise click.BadParameter(f"Expected key=value, got '{value}'")
+        variables[name.strip()] = content
+    return variables
+
+class TemplateChoice(click.Choice):
+    """A choice of the registered templates, indexed only when the option is parsed or shown."""
+
+    def __init__(self):
+        super().__init__([])
+
+    @property
+    def choices(self):
+        from .template_registry import default_registry
+        return default_registry().names()
+
+    @choices.setter
+    def choices(self, value):
+        pass
+
+def setup_logging(verbose, log_file, log_format='text', log_queue=False):
+    configure_logging(verbose, log_file, log_format=log_format, use_queue=log_queue)
     return logger
 
+def start_metrics(ctx, metrics_file, profile):
+    """Collect phase metrics and, with a profile path, a cProfile of the command until it returns."""
+    from . import metrics
+
+    metrics.start(ctx.invoked_subcommand)
+    metrics.time_logging()
+    profiler = None
+    if profile:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+
+    def finish():
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile)
+            logger.info(f"Wrote profile to {profile}")
+        collector = metrics.stop()
+        if metrics_file:
+            collector.write(metrics_file)
+            logger.info(f"Wrote metrics to {metrics_file}")
+
+    # Registered after stop_logging, so it runs first and the queue is still flushed last.
+    ctx.call_on_close(finish)
+
 @click.group()
 @click.option('--verbose', '-v', is_flag=True, help='Enables verbose mode.')
 @click.option('--log-file', type=click.Path(), help='Path to the log file.')
+@click.option('--log-format', type=click.Choice(LOG_FORMATS), default='text', show_default=True,
+              help='Format of log records; json writes one JSON object per line.')
+@click.option('--log-queue', is_flag=True,
+              help='Write log records from a background thread instead of the threads that log them.')
+@click.option('--metrics-file', type=click.Path(dir_okay=False), default=None,
+              help='Write the wall and CPU time of each phase and the command counters to this JSON file.')
+@click.option('--profile', type=click.Path(dir_okay=False), default=None,
+              help='Profile the whole command with cProfile and dump the stats to this .pstats file.')
 @click.pass_context
-def cli(ctx, verbose, log_file):
+def cli(ctx, verbose, log_file, log_format, log_queue, metrics_file, profile):
     """Project Initializer CLI"""
     ctx.ensure_object(dict)
     ctx.obj['VERBOSE'] = verbose
-    ctx.obj['LOGGER'] = setup_logging(verbose, log_file)
+    ctx.obj['LOGGER'] = setup_logging(verbose, log_file, log_format, log_queue)
+    # Flushes the queue listener, if any, once the command returns.
+    ctx.call_on_close(stop_logging)
+    if metrics_file or profile:
+        start_metrics(ctx, metrics_file, profile)
 
 @cli.command()
 @click.option('--config', '-c', type=click.Path(exists=True), default='config.yaml', help='Path to the configuration file.')
 @click.option('--output', '-o', type=click.Path(), default='.', help='Output directory for the project structure.')
-@click.option('--template', '-t', type=click.Choice(['default', 'web', 'data-science', 'cli']), default='default', help='Project template to use.')
+@click.option('--template', '-t', type=TemplateChoice(), default='default', help='Project template to use, see the templates command.')
+@click.option('--workers', type=click.IntRange(min=1), default=None, help='Number of threads used to write files (serial by default).')
+@click.option('--max-open-files', type=click.IntRange(min=1), default=None, help='Maximum number of files written at the same time.')
+@click.option('--incremental', is_flag=True, help='Only write files that are new or changed since the last run.')
+@click.option('--no-config-cache', is_flag=True, help='Always re-parse the configuration file instead of using the cache.')
+@click.option('--stream', is_flag=True, help='Create entries while the configuration is parsed to keep memory bounded.')
+@click.option('--var', 'variables', multiple=True, callback=parse_variables, metavar='KEY=VALUE', help='Set a template variable. Can be repeated.')
+@click.option('--batch', type=click.Path(exists=True), default=None, help='Generate every project listed in a batch matrix file.')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None, help='Number of processes used by --batch (CPU count by default).')
+@click.option('--staged', is_flag=True, help='Generate into a temporary sibling directory and replace the output directory with it in one atomic rename.')
+@click.option('--output-archive', type=click.Path(dir_okay=False, allow_dash=True), default=None, help="Write the project into a .tar[.gz|.bz2|.xz] or .zip archive instead of the output directory; '-' writes to stdout.")
+@click.option('--archive-format', type=click.Choice(['tar', 'tar.gz', 'tar.bz2', 'tar.xz', 'zip']), default=None, help='Archive format, inferred from the --output-archive file name by default (tar.gz for stdout).')
+@click.option('--dry-run', is_flag=True, help='Build the project in memory and list what would be created, without writing anything.')
+@click.option('--precedence', type=click.Choice(['config', 'template']), default='config', show_default=True, help='Which of the configuration and the template keeps a file that both list.')
+@click.option('--assets', 'assets_dir', type=click.Path(exists=True, file_okay=False), default=None, help="Directory the 'source' of file entries is relative to (the configuration's 'assets' key or directory by default).")
+@click.option('--dedup', type=click.Choice(['hard', 'reflink']), default=None, help='Write each distinct file body once and hard link or reflink identical files to it.')
+@click.option('--dedup-exclude', multiple=True, metavar='PATTERN', help='Glob of paths written as independent files with --dedup. Can be repeated.')
+@click.option('--server', 'server', default=None, metavar='ADDRESS', help='Send the request to a generator started with serve (Unix socket path or http://host:port), generating in this process if it is unavailable.')
 @click.pass_context
-def init(ctx, config, output, template):
+def init(ctx, config, output, template, workers, max_open_files, incremental, no_config_cache, stream, variables,
+         batch, jobs, staged, output_archive, archive_format, dry_run, precedence, assets_dir, dedup, dedup_exclude,
+         server):
     """Initialize project structure based on the configuration file and template."""
     logger = ctx.obj['LOGGER']
-    
+
+    if staged and incremental:
+        raise click.UsageError("--staged replaces the output directory and cannot be combined with --incremental.")
+    if output_archive and (staged or incremental or batch):
+        raise click.UsageError("--output-archive cannot be combined with --staged, --incremental or --batch.")
+    if dry_run and (staged or incremental or batch or output_archive):
+        raise click.UsageError("--dry-run cannot be combined with --staged, --incremental, --batch or --output-archive.")
+    if server and (incremental or stream or batch or output_archive or dry_run or assets_dir or dedup):
+        raise click.UsageError("--server cannot be combined with --incremental, --stream, --batch, --output-archive, --dry-run, --assets or --dedup.")
+    # Keep stdout clean when the archive itself is written there.
+    to_stderr = output_archive == '-'
+
+    if batch:
+        run_batch(ctx, batch, config, output, template, jobs, variables, workers=workers,
+                  max_open_files=max_open_files, incremental=incremental, use_config_cache=not no_config_cache,
+                  staged=staged, precedence=precedence, assets_dir=assets_dir and os.path.abspath(assets_dir),
+                  dedup=dedup, dedup_exclude=dedup_exclude)
+        return
+
+    if server:
+        request_from_server(ctx, server, config, output, template, variables, precedence, staged)
+        return
+
+    original_dir = os.getcwd()
     try:
+        from .core import init_project_structure
+
         logger.info(f"Initializing project structure using {template} template...")
         logger.debug(f"Using configuration file: {config}")
         logger.debug(f"Output directory: {output}")
@@ -51,17 +146,68 @@ def init(ctx, config, output, template):
         # Get absolute paths
         config_abs_path = os.path.abspath(config)
         output_abs_path = os.path.abspath(output)
+        assets_abs_path = os.path.abspath(assets_dir) if assets_dir else None
 
-        # Create the output directory if it doesn't exist
-        os.makedirs(output_abs_path, exist_ok=True)
-        
-        # Change to the output directory
-        original_dir = os.getcwd()
-        os.chdir(output_abs_path)
+        def generate(backend=None):
+            return init_project_structure(config_abs_path, template, workers=workers, max_open_files=max_open_files,
+                                          incremental=incremental, use_config_cache=not no_config_cache,
+                                          streaming=stream, variables=variables, backend=backend,
+                                          precedence=precedence, assets_dir=assets_abs_path, dedup=dedup,
+                                          dedup_exclude=dedup_exclude)
+
+        if dry_run:
+            from .filesystem import MemoryFileSystem
+
+            preview = MemoryFileSystem()
+            summary = generate(preview)
+            for path, content in preview.tree().items():
+                if content is None:
+                    click.echo(f"{path}/")
+                else:
+                    size = len(content) if isinstance(content, bytes) else len(content.encode('utf-8'))
+                    click.echo(f"{path} ({size} bytes)")
+            click.echo(f"Would create {len(preview.directories)} directories and {len(preview.files)} files "
+                       f"in {output_abs_path}.")
+            if summary['errors']:
+                click.echo(f"{summary['errors']} files could not be created, see the log for details.", err=True)
+            return
 
-        init_project_structure(config_abs_path, template)
+        if output_archive:
+            from .archive_backend import ArchiveBackend
+
+            # Entries go straight into the archive, nothing is written to the output directory.
+            with ArchiveBackend.open(output_archive, archive_format, logger) as backend:
+                summary = generate(backend)
+                if summary['errors']:
+                    raise RuntimeError(f"{summary['errors']} files could not be written, the archive was discarded")
+        elif staged:
+            from .staging import StagedOutput
+
+            # Nothing appears in the output directory unless every file was written.
+            with StagedOutput(output_abs_path, logger) as staging_dir:
+                os.chdir(staging_dir)
+                try:
+                    summary = generate()
+                finally:
+                    os.chdir(original_dir)
+                if summary['errors']:
+                    raise RuntimeError(f"{summary['errors']} files could not be written, the output directory was not changed")
+        else:
+            # Create the output directory if it doesn't exist
+            os.makedirs(output_abs_path, exist_ok=True)
+
+            # Change to the output directory
+            os.chdir(output_abs_path)
+            summary = generate()
+
+        if incremental:
+            click.echo(f"Files: {summary['created']} created, {summary['updated']} updated, "
+                       f"{summary['unchanged']} unchanged, {summary['orphaned']} orphaned.")
+        if dedup:
+            click.echo(f"Deduplicated: {summary['linked']} files linked, {summary['bytes_saved']} bytes not written.",
+                       err=to_stderr)
         logger.info(f"Project structure initialized successfully using {template} template.")
-        click.echo(f"Project structure initialized successfully using {template} template.")
+        click.echo(f"Project structure initialized successfully using {template} template.", err=to_stderr)
     except FileNotFoundError:
         logger.error(f"Configuration file not found: {config}", exc_info=True)
         click.echo(f"Error: Configuration file '{config}' not found. Please make sure the file exists and the path is correct.", err=True)
@@ -75,11 +221,68 @@ def init(ctx, config, output, template):
         # Change back to the original directory
         os.chdir(original_dir)
 
+def request_from_server(ctx, server, config, output, template, variables, precedence, staged):
+    """Generate through a running generator server, without loading the generation engine here."""
+    logger = ctx.obj['LOGGER']
+    from .client import generate
+
+    result = generate({
+        'config': os.path.abspath(config),
+        'output': os.path.abspath(output),
+        'template': template,
+        'variables': variables,
+        'precedence': precedence,
+        'staged': staged,
+    }, address=server)
+    if not result['ok']:
+        error = result.get('error') or f"{result['summary']['errors']} files could not be written"
+        logger.error(f"Error initializing project structure: {error}")
+        click.echo(f"Error initializing project structure: {error}", err=True)
+        return
+    summary = result['summary']
+    where = 'by the server' if result['served'] else 'in this process'
+    click.echo(f"Created {summary['directories']} directories and {summary['files']} files {where} "
+               f"in {result['metrics']['wall'] * 1000:.0f} ms.")
+    click.echo(f"Project structure initialized successfully using {template} template.")
+
+def run_batch(ctx, matrix_path, config, output, template, jobs, variables, **options):
+    """Generate every project of a batch matrix and report per-project timings."""
+    logger = ctx.obj['LOGGER']
+    try:
+        from .batch import generate_batch, load_matrix
+
+        matrix = load_matrix(matrix_path)
+        config_path = matrix.get('config') or os.path.abspath(config)
+        template = matrix.get('template') or template
+        shared_variables = dict(matrix.get('variables') or {})
+        shared_variables.update(variables)
+
+        start = time.perf_counter()
+        results = generate_batch(config_path, matrix['projects'], template=template, jobs=jobs,
+                                 base_dir=output, variables=shared_variables, **options)
+        elapsed = time.perf_counter() - start
+    except Exception as e:
+        logger.error(f"Error running batch {matrix_path}: {str(e)}", exc_info=True)
+        raise click.ClickException(str(e))
+
+    failures = [result for result in results if not result.ok]
+    for result in results:
+        if result.ok:
+            linked = f", {result.summary['linked']} linked" if 'linked' in result.summary else ''
+            click.echo(f"{result.output}: {result.summary.get('files', 0)} files{linked} in {result.elapsed:.3f}s")
+        else:
+            reason = result.error or f"{result.summary.get('errors')} files failed"
+            click.echo(f"{result.output}: FAILED after {result.elapsed:.3f}s - {reason}", err=True)
+    click.echo(f"Generated {len(results) - len(failures)}/{len(results)} projects in {elapsed:.3f}s.")
+    if failures:
+        ctx.exit(1)
+
 @cli.command()
 @click.option('--config', default='config.yaml', help='Path to the configuration file')
 @click.option('--output', default='.', help='Output directory for the project')
 @click.option('--verbose', is_flag=True, help='Enable verbose output')
-def init_project(config, output, verbose):
+@click.option('--no-config-cache', is_flag=True, help='Always re-parse the configuration file instead of using the cache.')
+def init_project(config, output, verbose, no_config_cache):
     """Initialize project structure based on configuration."""
     if verbose:
         logger.setLevel(logging.DEBUG)
@@ -87,6 +290,10 @@ def init_project(config, output, verbose):
     logger.info(f"Initializing project structure using configuration from {config}")
     
     try:
+        from .config_loader import ConfigLoader
+        from .directory_manager import DirectoryManager
+        from .file_manager import FileManager
+
         # Create the output directory if it doesn't exist
         os.makedirs(output, exist_ok=True)
         
@@ -94,7 +301,7 @@ def init_project(config, output, verbose):
         os.chdir(output)
         
         # Load configuration
-        config_data = ConfigLoader.load_config(config)
+        config_data = ConfigLoader.load_config(config, use_cache=not no_config_cache)
         
         # Initialize managers
         dir_manager = DirectoryManager(config_data.get('directories', []))
@@ -109,11 +316,23 @@ def init_project(config, output, verbose):
         logger.error(f"An error occurred: {str(e)}")
         raise click.ClickException(str(e))
 
+@cli.command()
+def templates():
+    """List the available templates."""
+    from .template_registry import default_registry
+
+    index = default_registry().index()
+    for name in sorted(index):
+        info = index[name]
+        click.echo(f"{name}\t{info.version}\t{info.source}\t{info.location}")
+
 @cli.command()
 @click.option('--directory', '-d', type=click.Path(exists=True), default='.', help='Directory of the project to build.')
 @click.option('--dry-run', is_flag=True, help='Show what would be done without making actual changes.')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None, help='Maximum number of build steps run concurrently.')
+@click.option('--no-cache', is_flag=True, help='Run every build step even if its inputs did not change.')
 @click.pass_context
-def build(ctx, directory, dry_run):
+def build(ctx, directory, dry_run, jobs, no_cache):
     """Build the project."""
     logger = ctx.obj['LOGGER']
     logger.info(f"Building project in {directory}")
@@ -121,7 +340,10 @@ def build(ctx, directory, dry_run):
     if dry_run:
         click.echo("Dry run: showing what would be done without making changes.")
     
-    success, actions = build_project(directory)
+    from .core import build_project
+
+    success, actions = build_project(directory, jobs=jobs, use_cache=not no_cache,
+                                     on_output=lambda step, line: click.echo(f"[{step}] {line}"))
     
     for action in actions:
         click.echo(action)
@@ -137,9 +359,10 @@ def build(ctx, directory, dry_run):
 @click.option('--directory', '-d', type=click.Path(exists=True), default='.', help='Directory of the project to clean.')
 @click.option('--all', 'all_files', is_flag=True, help='Remove all generated files, including caches.')
 @click.option('--dry-run', is_flag=True, help='Show what would be done without making actual changes.')
+@click.option('--workers', type=click.IntRange(min=1), default=None, help='Number of threads removing files.')
 @click.confirmation_option(prompt='Are you sure you want to clean the project?')
 @click.pass_context
-def clean(ctx, directory, all_files, dry_run):
+def clean(ctx, directory, all_files, dry_run, workers):
     """Clean the project."""
     logger = ctx.obj['LOGGER']
     logger.info(f"Cleaning project in {directory}")
@@ -147,7 +370,9 @@ def clean(ctx, directory, all_files, dry_run):
     if dry_run:
         click.echo("Dry run: showing what would be done without making changes.")
     
-    success, actions = clean_project(directory, all_files)
+    from .core import clean_project
+
+    success, actions = clean_project(directory, all_files, dry_run=dry_run, workers=workers)
     
     for action in actions:
         click.echo(action)
@@ -159,5 +384,157 @@ def clean(ctx, directory, all_files, dry_run):
         logger.error("Error cleaning project. See above for details.")
         click.echo("Error cleaning project. See above for details.", err=True)
 
+@cli.command()
+@click.argument('directory', type=click.Path(exists=True, file_okay=False), default='.')
+@click.option('--output', '-o', type=click.Path(dir_okay=False, allow_dash=True), default='-', help="File to write the tree to, as a Markdown document for .md files; '-' writes to stdout.")
+@click.option('--exclude', 'excludes', multiple=True, metavar='PATTERN', help='.gitignore-style pattern of paths to leave out. Can be repeated.')
+@click.option('--no-ignore', is_flag=True, help='List everything, without the .gitignore files and the default excludes (.git, node_modules).')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=1, show_default=True, help='Threads walking the top-level directories.')
+@click.option('--incremental', is_flag=True, help='Reuse the cached listing of every directory whose mtime did not change.')
+@click.pass_context
+def tree(ctx, directory, output, excludes, no_ignore, jobs, incremental):
+    """List the project tree, e.g. to update docs/PROJECT_STRUCTURE.md."""
+    logger = ctx.obj['LOGGER']
+    from .ignore import DEFAULT_EXCLUDES
+    from .tree import dump_tree, ListingCache, TreeWalker, default_cache_path, write_tree
+
+    excludes = list(excludes) if no_ignore else list(DEFAULT_EXCLUDES) + list(excludes)
+    try:
+        if output != '-':
+            count, stats = dump_tree(directory, output, excludes, gitignore=not no_ignore, jobs=jobs,
+                                     incremental=incremental)
+            click.echo(f"Wrote {count} entries to {output} ({stats['scanned']} directories read, "
+                       f"{stats['reused']} reused, {stats['ignored']} entries ignored).", err=True)
+            return
+        cache = ListingCache.load(default_cache_path(directory)) if incremental else None
+        walker = TreeWalker(directory, excludes, gitignore=not no_ignore, jobs=jobs, cache=cache)
+        with click.open_file('-', 'w') as stdout:
+            write_tree(walker, stdout)
+        if cache is not None:
+            cache.save()
+    except OSError as e:
+        logger.error(f"Error listing {directory}: {str(e)}", exc_info=True)
+        raise click.ClickException(str(e))
+
+@cli.command()
+@click.argument('directory', type=click.Path(exists=True, file_okay=False))
+@click.option('--output', '-o', type=click.Path(dir_okay=False, allow_dash=True), default='config.yaml', show_default=True, help="Configuration file to write; '-' writes to stdout.")
+@click.option('--exclude', 'excludes', multiple=True, metavar='PATTERN', help='.gitignore-style pattern of paths to leave out. Can be repeated.')
+@click.option('--no-ignore', is_flag=True, help='Capture everything, without the .gitignore files and the default excludes (.git, node_modules).')
+@click.option('--jobs', '-j', type=click.IntRange(min=1), default=None, help='Threads listing directories and reading files.')
+@click.option('--max-inline-size', type=click.IntRange(min=0), default=64 * 1024, show_default=True, help='Largest text file inlined as content, in bytes; larger ones become source references.')
+@click.option('--max-file-size', type=click.IntRange(min=0), default=None, help='Leave out files larger than this many bytes.')
+@click.option('--no-sources', is_flag=True, help='Leave out binary and large files instead of referencing them with source.')
+@click.pass_context
+def snapshot(ctx, directory, output, excludes, no_ignore, jobs, max_inline_size, max_file_size, no_sources):
+    """Capture an existing directory tree into a configuration file."""
+    logger = ctx.obj['LOGGER']
+    from .ignore import DEFAULT_EXCLUDES
+    from .snapshot import Snapshot, snapshot_tree
+
+    options = {
+        'excludes': list(excludes) if no_ignore else list(DEFAULT_EXCLUDES) + list(excludes),
+        'gitignore': not no_ignore,
+        'jobs': jobs,
+        'max_inline_size': max_inline_size,
+        'max_file_size': max_file_size,
+        'sources': not no_sources,
+    }
+    try:
+        if output == '-':
+            with click.open_file('-', 'w') as stdout:
+                stats = Snapshot(directory, **options).write(stdout)
+        else:
+            stats = snapshot_tree(directory, output, **options)
+    except OSError as e:
+        logger.error(f"Error capturing {directory}: {str(e)}", exc_info=True)
+        raise click.ClickException(str(e))
+    click.echo(f"Captured {stats['directories']} directories, {stats['inline']} inline files and "
+               f"{stats['sources']} source files; {stats['skipped']} files skipped, "
+               f"{stats['ignored']} entries ignored.", err=True)
+
+def parse_timeouts(ctx, param, values):
+    """Turn repeated --timeout [NAME=]SECONDS options into seconds per check name, '' being the default."""
+    timeouts = {}
+    for value in values:
+        name, sep, seconds = value.rpartition('=')
+        try:
+            timeouts[name.strip()] = float(seconds)
+        except ValueError:
+            raise click.BadParameter(f"Expected [NAME=]SECONDS, got '{value}'")
+        if timeouts[name.strip()] <= 0:
+            raise click.BadParameter(f"Timeouts must be positive, got '{value}'")
+    return timeouts
+
+@cli.command()
+@click.argument('directory', type=click.Path(exists=True, file_okay=False), default='.')
+@click.option('--check', 'checks', multiple=True, type=click.Choice(['bandit', 'safety', 'pip-audit']), help='Run only this check. Can be repeated.')
+@click.option('--source', 'sources', multiple=True, metavar='PATH', help='Path scanned by Bandit, relative to DIRECTORY (its top-level packages by default). Can be repeated.')
+@click.option('--timeout', 'timeouts', multiple=True, callback=parse_timeouts, metavar='[NAME=]SECONDS', help='Kill a check running longer than this, 300 seconds by default. Can be repeated.')
+@click.option('--safety-db', type=click.Path(exists=True), default=None, help='Local Safety advisory database to use instead of downloading one.')
+@click.option('--offline', is_flag=True, help='Skip the checks that need the network (pip-audit, and Safety without --safety-db).')
+@click.option('--no-cache', is_flag=True, help='Run every check, even when its inputs did not change.')
+@click.option('--cache-ttl', type=click.FloatRange(min=0), default=24 * 60 * 60, show_default=True, help='Seconds a result computed from an online advisory database is reused.')
+@click.pass_context
+def security(ctx, directory, checks, sources, timeouts, safety_db, offline, no_cache, cache_ttl):
+    """Run Bandit, Safety and pip-audit concurrently, reusing results for unchanged inputs."""
+    logger = ctx.obj['LOGGER']
+    from .security import CHECK_NAMES, run_security_checks
+
+    with click.open_file('-', 'w') as stdout:
+        results = run_security_checks(directory, stdout, use_cache=not no_cache, sources=sources,
+                                      checks=checks or CHECK_NAMES, timeouts=timeouts,
+                                      safety_db=safety_db and os.path.abspath(safety_db), offline=offline,
+                                      cache_ttl=cache_ttl)
+    for result in results:
+        detail = f" ({result.reason})" if result.reason else ''
+        cached = ', cached' if result.cached else ''
+        click.echo(f"{result.name}: {result.status} in {result.elapsed:.1f}s{cached}{detail}", err=True)
+    if not all(result.ok for result in results):
+        logger.error("Some security checks failed. Please review the output above.")
+        ctx.exit(1)
+    click.echo("All security checks passed!", err=True)
+
+def exit_on_sigterm(signum, frame):
+    raise SystemExit(0)
+
+@cli.command()
+@click.option('--socket', 'socket_path', type=click.Path(dir_okay=False), default=None, help='Unix socket to listen on.')
+@click.option('--port', type=click.IntRange(min=0, max=65535), default=None, help='Serve HTTP on this TCP port instead of a Unix socket.')
+@click.option('--host', default='127.0.0.1', show_default=True, help='Interface to listen on with --port.')
+@click.option('--workers', type=click.IntRange(min=1), default=None, help='Number of requests handled at the same time (CPU count by default).')
+@click.option('--max-pending', type=click.IntRange(min=0), default=64, show_default=True, help='Requests waiting for a worker before new ones are turned away.')
+@click.option('--preload', 'preload_configs', multiple=True, type=click.Path(exists=True, dir_okay=False), help='Parse this configuration at startup. Can be repeated.')
+@click.pass_context
+def serve(ctx, socket_path, port, host, workers, max_pending, preload_configs):
+    """Serve generation requests, keeping configurations and templates in memory."""
+    logger = ctx.obj['LOGGER']
+    if (socket_path is None) == (port is None):
+        raise click.UsageError("Pass exactly one of --socket and --port.")
+
+    import signal
+    from .client import TOKEN_ENV
+    from .server import make_server, server_address
+
+    try:
+        server = make_server(socket_path, host, port, workers=workers, max_pending=max_pending,
+                             token=os.environ.get(TOKEN_ENV))
+    except OSError as e:
+        raise click.ClickException(f"Cannot listen: {str(e)}")
+    if port is not None and host not in ('127.0.0.1', '::1', 'localhost'):
+        logger.warning(f"Requests and their token are sent unencrypted and {host} may be reachable from other machines")
+    try:
+        server.service.preload(preload_configs)
+        signal.signal(signal.SIGTERM, exit_on_sigterm)
+        click.echo(f"Serving on {server_address(server)} with {server.workers} workers.", err=True)
+        if port is not None and not os.environ.get(TOKEN_ENV):
+            click.echo(f"Token: {server.token} (set {TOKEN_ENV} to it for init --server)", err=True)
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        logger.info(f"Served {server.service.requests} requests")
+
 if __name__ == '__main__':
     cli()
@@ -0,0 +1,139 @@
+# Directory: project_initializer/
+# File: client.py
+
+"""Module for sending generation requests to a running generator server."""
+
+import os
+import json
+import socket
+import logging
+import http.client
+from typing import Dict, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Token sent with generation requests, read from the file next to a Unix socket when unset.
+TOKEN_ENV = 'PROJECT_INITIALIZER_SERVER_TOKEN'
+DEFAULT_TIMEOUT = 60.0
+
+
+class ServerUnavailable(Exception):
+    """The server could not be reached, or was too busy to take the request."""
+
+
+class _UnixHTTPConnection(http.client.HTTPConnection):
+    def __init__(self, socket_path: str, timeout: float):
+        super().__init__('localhost', timeout=timeout)
+        self.socket_path = socket_path
+
+    def connect(self):
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(self.timeout)
+        self.sock.connect(self.socket_path)
+
+
+class GeneratorClient:
+    """
+    A client of the server started by ``project-initializer serve``.
+
+    The address is either the path of a Unix socket or an ``http://host:port`` URL.
+    The token is taken from ``$PROJECT_INITIALIZER_SERVER_TOKEN`` or, for a Unix
+    socket, from the ``.token`` file the server writes next to it.
+    """
+
+    def __init__(self, address: str, timeout: float = DEFAULT_TIMEOUT, token: Optional[str] = None):
+        self.address = address
+        self.timeout = timeout
+        self.token = token or os.environ.get(TOKEN_ENV) or self._read_token()
+
+    def _read_token(self) -> Optional[str]:
+        if self.address.startswith('http://'):
+            return None
+        try:
+            with open(self.address + '.token', 'r', encoding='utf-8') as f:
+                return f.read().strip()
+        except OSError:
+            return None
+
+    def _connection(self) -> http.client.HTTPConnection:
+        if self.address.startswith('http://'):
+            url = urlsplit(self.address)
+            return http.client.HTTPConnection(url.hostname, url.port or 80, timeout=self.timeout)
+        return _UnixHTTPConnection(self.address, self.timeout)
+
+    def request(self, method: str, path: str, body: Optional[Dict] = None) -> Dict:
+        """
+        Send a request and return the decoded JSON answer, which has an ``ok`` flag.
+
+        Raises:
+            ServerUnavailable: If the server cannot be reached or answers that it is busy.
+        """
+        connection = self._connection()
+        try:
+            data = json.dumps(body).encode('utf-8') if body is not None else None
+            headers = {'Content-Type': 'application/json'} if data is not None else {}
+            if self.token:
+                headers['Authorization'] = f"Bearer {self.token}"
+            connection.request(method, path, body=data, headers=headers)
+            response = connection.getresponse()
+            payload = response.read()
+        except (OSError, http.client.HTTPException) as e:
+            raise ServerUnavailable(f"Cannot reach the generator server at {self.address}: {str(e)}") from e
+        finally:
+            connection.close()
+        if response.status == 503:
+            raise ServerUnavailable(f"The generator server at {self.address} is busy")
+        if response.status == 401:
+            raise ServerUnavailable(f"The generator server at {self.address} rejected the token "
+                                    f"(set ${TOKEN_ENV})")
+        try:
+            return json.loads(payload)
+        except ValueError as e:
+            raise ServerUnavailable(f"Invalid answer from the generator server at {self.address}") from e
+
+    def health(self) -> Dict:
+        return self.request('GET', '/health')
+
+    def generate(self, request: Dict) -> Dict:
+        return self.request('POST', '/generate', request)
+
+
+def generate(request: Dict, address: Optional[str] = None, timeout: float = DEFAULT_TIMEOUT,
+             token: Optional[str] = None) -> Dict:
+    """
+    Generate a project through the server at address, or in this process when it is unavailable.
+
+    Args:
+        request (Dict): The generation request: absolute ``config`` and ``output`` paths, and
+            optional ``template``, ``variables``, ``precedence`` and ``staged``.
+        address (Optional[str]): Unix socket path or ``http://host:port`` of the server.
+        timeout (float): Seconds to wait for the server.
+        token (Optional[str]): Token of the server, found as described in GeneratorClient by default.
+
+    Returns:
+        Dict: The result, with ``served`` telling whether the server generated the project.
+            Malformed requests and failed generations are returned with ``ok`` false.
+    """
+    if address:
+        try:
+            result = GeneratorClient(address, timeout, token).generate(request)
+            result['served'] = True
+            return result
+        except ServerUnavailable as e:
+            logger.warning(f"{str(e)}, generating in this process")
+
+    # Only the fallback pays for the generation engine.
+    from .server import GeneratorService, RequestError
+
+    try:
+        # The caller owns this process, so a staged output may replace any directory, as with init --staged.
+        result = GeneratorService(replace_existing=True).generate(request)
+    except RequestError as e:
+        result = {'ok': False, 'error': str(e)}
+    except Exception as e:
+        # Reported like the server reports a failed generation, rather than raised to the caller.
+        logger.debug(f"Generation failed: {str(e)}", exc_info=True)
+        result = {'ok': False, 'error': f"{type(e).__name__}: {str(e)}"}
+    result['served'] = False
+    return result
@@ -3,18 +3,144 @@
 
 """Module for loading configuration files for the project initializer."""
 
-import yaml
+import os
+import hashlib
+import logging
+import marshal
+import functools
+from . import metrics
+
+logger = logging.getLogger(__name__)
+
+# Top-level keys whose sequences are streamed entry by entry.
+STREAMED_KEYS = ('directories', 'files')
+
+
+# PyYAML is only imported on the first parse, so that commands and cache hits
+# which never parse YAML don't pay for it at startup.
+@functools.lru_cache(maxsize=None)
+def safe_loader():
+    """Return the safe loader class, using the libyaml bindings when PyYAML was built with them."""
+    import yaml
+    return getattr(yaml, 'CSafeLoader', yaml.SafeLoader)
+
+
+@functools.lru_cache(maxsize=None)
+def streaming_loader():
+    """Return a safe loader class that composes one node at a time on top of the libyaml parser."""
+    import yaml
+    if not hasattr(yaml, 'CParser'):
+        return yaml.SafeLoader
+    from yaml.composer import Composer
+    from yaml.constructor import SafeConstructor
+    from yaml.resolver import Resolver
+
+    class StreamingLoader(yaml.CParser, Composer, SafeConstructor, Resolver):
+        def __init__(self, stream):
+            yaml.CParser.__init__(self, stream)
+            Composer.__init__(self)
+            SafeConstructor.__init__(self)
+            Resolver.__init__(self)
+
+    return StreamingLoader
+
+CACHE_DIR_ENV = 'PROJECT_INITIALIZER_CACHE_DIR'
+# Bumped whenever the layout of cache entries changes.
+_CACHE_FORMAT = 1
+
+
+def cache_root():
+    """Return the root directory of every on-disk cache of the project initializer."""
+    if os.environ.get(CACHE_DIR_ENV):
+        return os.environ[CACHE_DIR_ENV]
+    base = os.environ.get('XDG_CACHE_HOME') or os.path.join(os.path.expanduser('~'), '.cache')
+    return os.path.join(base, 'project-initializer')
+
+
+def default_cache_dir():
+    """Return the directory holding parsed configuration files."""
+    return os.path.join(cache_root(), 'configs')
+
+
+class ConfigCache:
+    """
+    An on-disk cache of parsed configuration files.
+
+    Entries are stored per absolute config path in marshal format, together
+    with the size, mtime and SHA-256 of the YAML source they were parsed from.
+    A matching size and mtime is trusted as is; otherwise the source is hashed
+    and the entry is still reused when the content did not change.
+    """
+
+    def __init__(self, cache_dir=None):
+        self.cache_dir = cache_dir or default_cache_dir()
+
+    def entry_path(self, config_path):
+        key = hashlib.sha256(os.path.abspath(config_path).encode('utf-8')).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.marshal")
+
+    def get(self, config_path, st, read_source):
+        """
+        Return the cached configuration for config_path, or None on a miss.
+
+        Args:
+            config_path (str): The path to the YAML configuration file.
+            st (os.stat_result): The current stat of the configuration file.
+            read_source (callable): Returns the raw bytes of the configuration file.
+        """
+        try:
+            with open(self.entry_path(config_path), 'rb') as f:
+                entry = marshal.load(f)
+        except (OSError, EOFError, ValueError, TypeError):
+            return None
+        if not isinstance(entry, dict) or entry.get('format') != _CACHE_FORMAT or entry.get('size') != st.st_size:
+            return None
+        if entry.get('mtime_ns') == st.st_mtime_ns:
+            return entry['data']
+        if entry.get('sha256') == hashlib.sha256(read_source()).hexdigest():
+            return entry['data']
+        return None
+
+    def put(self, config_path, st, source, data):
+        """Store a parsed configuration. Failures only disable caching for this file."""
+        entry = {
+            'format': _CACHE_FORMAT,
+            'path': os.path.abspath(config_path),
+            'size': st.st_size,
+            'mtime_ns': st.st_mtime_ns,
+            'sha256': hashlib.sha256(source).hexdigest(),
+            'data': data,
+        }
+        try:
+            payload = marshal.dumps(entry)
+        except ValueError:
+            # YAML types such as timestamps have no marshal representation.
+            logger.debug(f"Configuration {config_path} cannot be cached")
+            return
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            path = self.entry_path(config_path)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(payload)
+            os.replace(tmp_path, path)
+        except OSError as e:
+            logger.debug(f"Could not write config cache entry for {config_path}: {str(e)}")
+
 
 class ConfigLoader:
     """A class for loading and parsing configuration files."""
 
     @staticmethod
-    def load_config(config_path):
+    def load_config(config_path, use_cache=True, cache_dir=None):
         """
         Load and parse a YAML configuration file.
 
         Args:
             config_path (str): The path to the YAML configuration file.
+            use_cache (bool): Reuse the parsed configuration from the on-disk cache
+                when the file did not change since it was last parsed.
+            cache_dir (str): Directory of the cache. Defaults to the user cache directory.
 
         Returns:
             dict: A dictionary containing the parsed configuration.
@@ -23,5 +149,84 @@ class ConfigLoader:
             FileNotFoundError: If the specified configuration file does not exist.
             yaml.YAMLError: If the configuration file is not valid YAML.
         """
-        with open(config_path, 'r') as file:
-            return yaml.safe_load(file)
+        import yaml
+
+        if not use_cache:
+            with open(config_path, 'rb') as file, metrics.phase('parse_yaml'):
+                return yaml.load(file, Loader=safe_loader())
+
+        cache = ConfigCache(cache_dir)
+        with open(config_path, 'rb') as file:
+            st = os.fstat(file.fileno())
+            source = []
+
+            def read_source():
+                if not source:
+                    source.append(file.read())
+                return source[0]
+
+            data = cache.get(config_path, st, read_source)
+            if data is not None:
+                logger.debug(f"Config cache hit: {config_path}")
+                metrics.count('config_cache_hits')
+                return data
+
+            logger.debug(f"Config cache miss: {config_path}")
+            metrics.count('config_cache_misses')
+            with metrics.phase('parse_yaml'):
+                data = yaml.load(read_source(), Loader=safe_loader())
+            cache.put(config_path, st, read_source(), data)
+            return data
+
+    @staticmethod
+    def iter_config(config_path):
+        """
+        Stream a YAML configuration file without loading it as a whole.
+
+        Each entry of the ``directories`` and ``files`` sequences is parsed and
+        yielded on its own, so only one entry is held in memory at a time. Any
+        other top-level key is yielded once with its fully parsed value.
+
+        Args:
+            config_path (str): The path to the YAML configuration file.
+
+        Yields:
+            tuple: ``(key, value)`` pairs in document order, e.g. ``('files', {'path': ...})``.
+
+        Raises:
+            FileNotFoundError: If the specified configuration file does not exist.
+            yaml.YAMLError: If the configuration file is not valid YAML.
+            ValueError: If the top level of the document is not a mapping.
+        """
+        import yaml
+
+        with open(config_path, 'rb') as file:
+            loader = streaming_loader()(file)
+            try:
+                loader.get_event()  # StreamStartEvent
+                if loader.check_event(yaml.StreamEndEvent):
+                    return
+                loader.get_event()  # DocumentStartEvent
+                if not loader.check_event(yaml.MappingStartEvent):
+                    raise ValueError(f"Configuration file {config_path} must contain a mapping")
+                loader.get_event()
+
+                while not loader.check_event(yaml.MappingEndEvent):
+                    key = ConfigLoader._construct_next(loader)
+                    if key in STREAMED_KEYS and loader.check_event(yaml.SequenceStartEvent):
+                        loader.get_event()
+                        while not loader.check_event(yaml.SequenceEndEvent):
+                            yield key, ConfigLoader._construct_next(loader)
+                        loader.get_event()
+                    else:
+                        yield key, ConfigLoader._construct_next(loader)
+            finally:
+                loader.dispose()
+
+    @staticmethod
+    def _construct_next(loader):
+        value = loader.construct_object(loader.compose_node(None, None), deep=True)
+        # Drop the node cache so memory stays bounded by a single entry.
+        loader.constructed_objects.clear()
+        loader.recursive_objects.clear()
+        return value
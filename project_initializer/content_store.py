@@ -0,0 +1,111 @@
+# Directory: project_initializer/
+# File: content_store.py
+
+"""Module for writing each distinct file body once and linking identical files to it."""
+
+import fnmatch
+import hashlib
+import threading
+from typing import Dict, Sequence, Tuple
+
+# How the duplicates of a body are created from its first copy.
+DEDUP_LINK_MODES = ('hard', 'reflink')
+DEFAULT_DEDUP_LINK_MODE = 'hard'
+
+
+class _Body:
+    """The first copy of a body, which other threads wait for before linking to it."""
+
+    __slots__ = ('path', 'written', 'ok')
+
+    def __init__(self, path: str):
+        self.path = path
+        self.written = threading.Event()
+        self.ok = False
+
+
+class ContentStore:
+    """
+    Remembers where each distinct file body was first written.
+
+    FileManager hashes every body and writes it normally the first time it is
+    seen. Every later file with the same body is a hard link to that first copy,
+    or a reflink clone of it, so the body is written once per store. Sharing a
+    store between runs, as batch workers do, links identical files across projects.
+
+    Hard links share one inode: editing one of the files edits all of them. The
+    generator itself unlinks a file before writing it again, but other tools may
+    not, so paths matching an ``exclude`` pattern, and entries with ``dedup: false``,
+    are always written as independent files. Empty bodies are never linked.
+    """
+
+    def __init__(self, link: str = DEFAULT_DEDUP_LINK_MODE, exclude: Sequence[str] = ()):
+        if link not in DEDUP_LINK_MODES:
+            raise ValueError(f"Unknown dedup link mode '{link}', expected one of: {', '.join(DEDUP_LINK_MODES)}")
+        self.link = link
+        self.exclude = tuple(exclude)
+        self.stats = {'unique_files': 0, 'linked_files': 0, 'bytes_saved': 0}
+        self._bodies: Dict[str, _Body] = {}
+        # Digest of the body each first copy holds, to forget it when that path is written again.
+        self._owners: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def excluded(self, file: Dict) -> bool:
+        """Tell whether a file entry must be written as an independent file."""
+        if file.get('dedup') is False:
+            return True
+        path = file.get('path') or ''
+        return any(fnmatch.fnmatchcase(path, pattern) for pattern in self.exclude)
+
+    @staticmethod
+    def digest(data: bytes) -> str:
+        return hashlib.sha256(data).hexdigest()
+
+    def claim(self, digest: str, local_path: str) -> Tuple[_Body, bool]:
+        """
+        Return the first copy of a body, and whether local_path is about to become it.
+
+        The caller owning the body must call ``written`` once it is on disk, the
+        other callers wait for that before linking to it.
+        """
+        with self._lock:
+            previous = self._owners.pop(local_path, None)
+            if previous is not None and previous != digest:
+                # The first copy of another body is being replaced.
+                del self._bodies[previous]
+            body = self._bodies.get(digest)
+            if body is not None and body.path != local_path:
+                return body, False
+            body = _Body(local_path)
+            self._bodies[digest] = body
+            self._owners[local_path] = digest
+            return body, True
+
+    def written(self, body: _Body, ok: bool):
+        body.ok = ok
+        with self._lock:
+            if ok:
+                self.stats['unique_files'] += 1
+            elif self._bodies.get(self._owners.get(body.path)) is body:
+                # Let the next file with this body write it instead.
+                del self._bodies[self._owners.pop(body.path)]
+        body.written.set()
+
+    def linked(self, size: int):
+        with self._lock:
+            self.stats['linked_files'] += 1
+            self.stats['bytes_saved'] += size
+
+    def forget(self, body: _Body):
+        """Drop a first copy that can no longer be linked to, e.g. because it was removed."""
+        with self._lock:
+            digest = self._owners.get(body.path)
+            if digest is not None and self._bodies.get(digest) is body:
+                del self._bodies[digest]
+                del self._owners[body.path]
+
+    @staticmethod
+    def wait(body: _Body) -> bool:
+        """Wait for a first copy and tell whether it was written."""
+        body.written.wait()
+        return body.ok
@@ -1,66 +1,69 @@
 import os
-import shutil
 import logging
-from typing import List, Tuple, Dict
+from typing import Callable, List, Tuple, Dict, Optional, Sequence
+from .assets import assets_dir_for, resolve_source
 from .config_loader import ConfigLoader
+from .content_store import ContentStore
 from .directory_manager import DirectoryManager
+from .directory_plan import DirectoryPlan
 from .file_manager import FileManager
+from .filesystem import FileSystem, OSFileSystem
+from .manifest import IncrementalPlan, Manifest
+from .merge import DEFAULT_PRECEDENCE, merge_files, merge_template_config, normalize_path, report_overridden
+from . import metrics
+from .template_engine import TemplateEngine
+from .template_registry import default_registry, load_template
 
 logger = logging.getLogger(__name__)
 
-# Define template configurations
-TEMPLATES: Dict[str, Dict] = {
-    'default': {
-        'directories': ['src', 'tests', 'docs'],
-        'files': [
-            {'path': 'src/__init__.py', 'content': '# Default template\n'},
-            {'path': 'tests/__init__.py', 'content': '# Test directory\n'},
-            {'path': 'docs/README.md', 'content': '# Project Documentation\n'},
-            {'path': 'README.md', 'content': '# Default Project\n\nThis is a default project template.\n'},
-        ]
-    },
-    'web': {
-        'directories': ['src', 'tests', 'docs', 'static', 'templates'],
-        'files': [
-            {'path': 'src/__init__.py', 'content': '# Web project\n'},
-            {'path': 'src/app.py', 'content': 'from flask import Flask\n\napp = Flask(__name__)\n\n@app.route("/")\ndef hello():\n    return "Hello, World!"\n'},
-            {'path': 'tests/__init__.py', 'content': '# Test directory\n'},
-            {'path': 'docs/README.md', 'content': '# Web Project Documentation\n'},
-            {'path': 'README.md', 'content': '# Web Project\n\nThis is a web project template using Flask.\n'},
-            {'path': 'requirements.txt', 'content': 'Flask==2.0.1\n'},
-        ]
-    },
-    'data-science': {
-        'directories': ['data', 'notebooks', 'src', 'tests', 'docs'],
-        'files': [
-            {'path': 'src/__init__.py', 'content': '# Data science project\n'},
-            {'path': 'notebooks/example.ipynb', 'content': '{"cells": [], "metadata": {}, "nbformat": 4, "nbformat_minor": 4}'},
-            {'path': 'tests/__init__.py', 'content': '# Test directory\n'},
-            {'path': 'docs/README.md', 'content': '# Data Science Project Documentation\n'},
-            {'path': 'README.md', 'content': '# Data Science Project\n\nThis is a data science project template.\n'},
-            {'path': 'requirements.txt', 'content': 'numpy==1.21.0\npandas==1.3.0\nmatplotlib==3.4.2\nscikit-learn==0.24.2\n'},
-        ]
-    },
-    'cli': {
-        'directories': ['src', 'tests', 'docs'],
-        'files': [
-            {'path': 'src/__init__.py', 'content': '# CLI project\n'},
-            {'path': 'src/cli.py', 'content': 'import click\n\n@click.command()\ndef hello():\n    click.echo("Hello, World!")\n\nif __name__ == "__main__":\n    hello()\n'},
-            {'path': 'tests/__init__.py', 'content': '# Test directory\n'},
-            {'path': 'docs/README.md', 'content': '# CLI Project Documentation\n'},
-            {'path': 'README.md', 'content': '# CLI Project\n\nThis is a CLI project template using Click.\n'},
-            {'path': 'requirements.txt', 'content': 'click==8.0.1\n'},
-        ]
-    }
-}
+def __getattr__(name):
+    # TEMPLATES used to be a dict built at import time; it now loads every registered template on access.
+    if name == 'TEMPLATES':
+        registry = default_registry()
+        return {template: registry.load(template) for template in registry.names()}
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
-def init_project_structure(config_path: str, template: str = 'default'):
+def init_project_structure(config_path: str, template: str = 'default', workers: Optional[int] = None,
+                           max_open_files: Optional[int] = None, incremental: bool = False,
+                           use_config_cache: bool = True, streaming: bool = False,
+                           variables: Optional[Dict[str, str]] = None,
+                           backend: Optional[FileSystem] = None,
+                           precedence: str = DEFAULT_PRECEDENCE,
+                           assets_dir: Optional[str] = None, dedup: Optional[str] = None,
+                           dedup_exclude: Sequence[str] = ()) -> Dict[str, int]:
     """
     Initialize project structure based on the provided configuration file and template.
 
     Args:
         config_path (str): Path to the configuration file.
         template (str): Template to use for project initialization.
+        workers (Optional[int]): Number of threads used to write files. Files are
+            written serially when this is None or 1.
+        max_open_files (Optional[int]): Maximum number of files the writers keep open at once.
+        incremental (bool): Only write files that are new or changed since the previous run,
+            as recorded by the manifest kept in the output directory.
+        use_config_cache (bool): Reuse the parsed configuration from the on-disk cache.
+        streaming (bool): Create directories and files while the configuration file is
+            parsed, keeping only one entry in memory at a time.
+        variables (Optional[Dict[str, str]]): Template variables overriding the ones defined
+            by the configuration. ${name} placeholders in paths and contents are substituted
+            whenever any variable is defined.
+        backend (Optional[FileSystem]): Where directories and files are written, e.g. a
+            MemoryFileSystem or an ArchiveBackend. Defaults to the current directory on disk.
+            Incremental runs only support the OS filesystem in the current directory.
+        precedence (str): Whether the configuration ('config') or the template ('template')
+            keeps a file both of them list.
+        assets_dir (Optional[str]): Directory the ``source`` of file entries is relative to.
+            Defaults to the ``assets`` key of the configuration, relative to the configuration
+            file, or to the directory of the configuration file.
+        dedup (Optional[str]): Write each distinct file body once and create the files
+            sharing it as 'hard' links or 'reflink' clones of that first copy.
+        dedup_exclude (Sequence[str]): Glob patterns of paths always written as independent files.
+
+    Returns:
+        Dict[str, int]: Counts of the directories and files handled by the run. Incremental
+            runs also report created, updated, unchanged and orphaned files, and deduplicating
+            runs the linked files and the bytes they saved.
     """
     try:
         logger.info(f"Initializing project structure with template: {template}")
@@ -69,29 +72,32 @@ def init_project_structure(config_path: str, template: str = 'default'):
         # Load configuration
         if not os.path.exists(config_path):
             raise FileNotFoundError(f"Configuration file not found: {config_path}")
-        
-        config_data = ConfigLoader.load_config(config_path)
-        logger.debug(f"Configuration loaded successfully")
 
-        # Merge template configuration with user configuration
-        template_config = TEMPLATES.get(template, TEMPLATES['default'])
-        merged_config = {
-            'directories': list(set(config_data.get('directories', []) + template_config['directories'])),
-            'files': config_data.get('files', []) + template_config['files']
-        }
-        logger.debug(f"Merged configuration: {merged_config}")
+        with metrics.phase('load_template'):
+            template_config = load_template(template)
+        content_store = ContentStore(dedup, dedup_exclude) if dedup else None
+        writes_to_cwd = backend is None or (isinstance(backend, OSFileSystem) and backend.root is None)
+        if incremental and not writes_to_cwd:
+            raise ValueError("Incremental runs need the output directory and cannot write to a backend")
+        if streaming:
+            if incremental:
+                raise ValueError("Incremental runs are not supported in streaming mode")
+            summary = _stream_project_structure(config_path, template_config, workers, max_open_files, variables,
+                                                backend, precedence, assets_dir, content_store)
+            logger.info(f"Project structure initialized successfully using {template} template and configuration from {config_path}")
+            return summary
 
-        # Initialize managers
-        dir_manager = DirectoryManager(merged_config['directories'], logger)
-        file_manager = FileManager(merged_config['files'], logger)
-
-        # Create project structure
-        dir_manager.create_directories()
-        file_manager.create_files()
+        with metrics.phase('load_config'):
+            config_data = ConfigLoader.load_config(config_path, use_cache=use_config_cache)
+        logger.debug(f"Configuration loaded successfully")
 
-        # Log summary
-        logger.info(f"Created {len(merged_config['directories'])} directories and {len(merged_config['files'])} files")
+        summary = generate_project_structure(config_data, template_config, workers=workers,
+                                             max_open_files=max_open_files, incremental=incremental,
+                                             variables=variables, backend=backend, precedence=precedence,
+                                             assets_dir=assets_dir or assets_dir_for(config_path, config_data),
+                                             content_store=content_store)
         logger.info(f"Project structure initialized successfully using {template} template and configuration from {config_path}")
+        return summary
     except FileNotFoundError as e:
         logger.error(str(e))
         raise
@@ -105,40 +111,277 @@ def init_project_structure(config_path: str, template: str = 'default'):
         logger.error(f"An unexpected error occurred while initializing project structure: {str(e)}")
         raise
 
-def build_project(directory: str) -> Tuple[bool, List[str]]:
+def generate_project_structure(config_data: Dict, template_config: Dict, workers: Optional[int] = None,
+                               max_open_files: Optional[int] = None, incremental: bool = False,
+                               variables: Optional[Dict[str, str]] = None,
+                               backend: Optional[FileSystem] = None,
+                               precedence: str = DEFAULT_PRECEDENCE,
+                               assets_dir: Optional[str] = None,
+                               content_store: Optional[ContentStore] = None) -> Dict[str, int]:
+    """
+    Create a project structure in the current directory from an already parsed configuration.
+
+    This is the part of init_project_structure that runs once per generated project,
+    so a configuration can be parsed once and materialized many times.
+
+    Args:
+        config_data (Dict): The parsed user configuration.
+        template_config (Dict): Directories and files of the selected template.
+        workers (Optional[int]): Number of threads used to write files.
+        max_open_files (Optional[int]): Maximum number of files the writers keep open at once.
+        incremental (bool): Only write files that are new or changed since the previous run.
+        variables (Optional[Dict[str, str]]): Template variables overriding the configuration.
+        backend (Optional[FileSystem]): Where directories and files are written.
+        precedence (str): Whether the configuration or the template keeps a file both list.
+        assets_dir (Optional[str]): Directory the ``source`` of file entries is relative to,
+            the current directory by default.
+        content_store (Optional[ContentStore]): Link files to identical ones already written
+            through this store, which may be shared by several runs.
+
+    Returns:
+        Dict[str, int]: Counts of the directories and files handled by the run.
+    """
+    # Merge template configuration with user configuration
+    with metrics.phase('merge'):
+        merged_config = merge_template_config(config_data, template_config, precedence)
+    logger.debug("Merged configuration: %s", merged_config)
+
+    # Substitute template variables, refusing to write anything if one is undefined
+    engine = TemplateEngine.from_config(config_data, variables)
+    if engine.enabled:
+        with metrics.phase('render'):
+            engine.check(merged_config['directories'], merged_config['files'])
+            merged_config = {
+                'directories': [engine.render(directory) for directory in merged_config['directories']],
+                'files': [engine.render_file(file) for file in merged_config['files']],
+            }
+        logger.debug(f"Rendered configuration with {len(engine.variables)} variables")
+
+    # Point sources at the asset files, refusing invalid entries before anything is written
+    assets_dir = os.path.abspath(assets_dir or '.')
+    merged_config['files'] = [resolve_source(file, assets_dir) for file in merged_config['files']]
+
+    # Only hand new or changed files to the writers in incremental mode
+    files_to_write = merged_config['files']
+    incremental_plan = None
+    if incremental:
+        with metrics.phase('incremental_plan'):
+            incremental_plan = IncrementalPlan(Manifest.load(), merged_config['files'])
+        files_to_write = incremental_plan.to_write
+
+    # Initialize managers
+    dir_manager = DirectoryManager(merged_config['directories'], logger, files=files_to_write, backend=backend)
+    file_manager = FileManager(files_to_write, logger, workers=workers, max_open_files=max_open_files,
+                               create_parents=False, backend=backend, content_store=content_store)
+    stats_before = dict(content_store.stats) if content_store is not None else None
+
+    # Create project structure
+    with metrics.phase('directories'):
+        directory_stats = dir_manager.create_directories()
+    with metrics.phase('files'):
+        file_errors = file_manager.create_files()
+    _count_directories(directory_stats)
+    metrics.count('file_errors', len(file_errors))
+    if file_errors:
+        logger.warning(f"Failed to create {len(file_errors)} files: {', '.join(path for path, _ in file_errors)}")
+
+    # Log summary
+    summary = {
+        'directories': len(merged_config['directories']),
+        'files': len(files_to_write) - len(file_errors),
+        'errors': len(file_errors),
+    }
+    if content_store is not None:
+        summary.update(_dedup_summary(content_store.stats, stats_before))
+    if incremental_plan is not None:
+        with metrics.phase('manifest'):
+            incremental_plan.commit(path for path, _ in file_errors)
+        summary.update(incremental_plan.summary())
+        logger.info(f"Incremental run: {summary['created']} created, {summary['updated']} updated, "
+                    f"{summary['unchanged']} unchanged, {summary['orphaned']} orphaned files")
+    logger.info(f"Created {len(merged_config['directories'])} directories and {summary['files']} files")
+    return summary
+
+def _stream_project_structure(config_path: str, template_config: Dict, workers: Optional[int] = None,
+                              max_open_files: Optional[int] = None,
+                              variables: Optional[Dict[str, str]] = None,
+                              backend: Optional[FileSystem] = None,
+                              precedence: str = DEFAULT_PRECEDENCE,
+                              assets_dir: Optional[str] = None,
+                              content_store: Optional[ContentStore] = None) -> Dict[str, int]:
+    """
+    Create the project structure while the configuration file is being parsed.
+
+    Entries are created in the same order as the eager path writes them (configuration
+    first, then template), so configurations that fit in memory produce the same tree.
+    Template variables may be defined anywhere in the file, so a first pass over the
+    stream collects them and validates every placeholder before anything is written.
+    Only the template's file paths are kept to apply precedence; a path listed twice
+    by the configuration itself is written twice, the last entry winning.
+
+    Args:
+        config_path (str): Path to the configuration file.
+        template_config (Dict): Directories and files of the selected template.
+        workers (Optional[int]): Number of threads used to write files.
+        max_open_files (Optional[int]): Maximum number of files the writers keep open at once.
+        variables (Optional[Dict[str, str]]): Template variables overriding the configuration.
+        backend (Optional[FileSystem]): Where directories and files are written.
+        precedence (str): Whether the configuration or the template keeps a file both list.
+        assets_dir (Optional[str]): Directory the ``source`` of file entries is relative to.
+            Defaults to the one named by the configuration, see init_project_structure.
+        content_store (Optional[ContentStore]): Link files to identical ones already written.
+
+    Returns:
+        Dict[str, int]: Counts of the directories and files handled by the run.
+    """
+    template_files, _ = merge_files([], template_config['files'], precedence)
+    template_paths = {normalize_path(file['path']) for file in template_files if file.get('path')}
+    config_variables = {}
+    config_assets = None
+    used_names = TemplateEngine.placeholders(template_config['directories'], template_config['files'])
+    with metrics.phase('scan_variables'):
+        for key, value in ConfigLoader.iter_config(config_path):
+            if key == 'directories':
+                used_names.update(TemplateEngine.placeholders(directories=[value]))
+            elif key == 'files':
+                used_names.update(TemplateEngine.placeholders(files=[value]))
+                resolve_source(value, '')
+            elif key in ('project_name', 'variables'):
+                config_variables[key] = value
+            elif key == 'assets':
+                config_assets = value
+    engine = TemplateEngine.from_config(config_variables, variables)
+    if engine.enabled:
+        engine.check(names=used_names)
+    assets_dir = assets_dir or assets_dir_for(config_path, {'assets': config_assets})
+
+    plan = DirectoryPlan(filesystem=backend)
+    dir_manager = DirectoryManager([], logger, plan=plan, backend=backend)
+    file_manager = FileManager([], logger, workers=workers, max_open_files=max_open_files,
+                               create_parents=False, directory_plan=plan, backend=backend,
+                               content_store=content_store)
+    stats_before = dict(content_store.stats) if content_store is not None else None
+    directories = set()
+    file_count = [0]
+    # Template paths also listed by the configuration, and the entries that lost to another one.
+    claimed = set()
+    overridden = []
+
+    def create_directory(path):
+        if engine.enabled:
+            path = engine.render(path)
+        directories.add(path)
+        dir_manager.create_directory(path)
+
+    def entries():
+        for key, value in ConfigLoader.iter_config(config_path):
+            if key == 'directories':
+                create_directory(value)
+            elif key == 'files':
+                path = normalize_path(value.get('path'))
+                if path in template_paths:
+                    if precedence == 'template':
+                        overridden.append(value['path'])
+                        continue
+                    claimed.add(path)
+                file_count[0] += 1
+                yield resolve_source(engine.render_file(value) if engine.enabled else value, assets_dir)
+        for directory in template_config['directories']:
+            create_directory(directory)
+        for file in template_files:
+            if file.get('path') and normalize_path(file['path']) in claimed:
+                overridden.append(file['path'])
+                continue
+            file_count[0] += 1
+            yield resolve_source(engine.render_file(file) if engine.enabled else file, assets_dir)
+
+    with metrics.phase('stream'):
+        file_errors = file_manager.create_files(entries())
+    report_overridden(overridden, precedence)
+    if file_errors:
+        logger.warning(f"Failed to create {len(file_errors)} files: {', '.join(path for path, _ in file_errors)}")
+    _count_directories(plan.stats)
+    metrics.count('file_errors', len(file_errors))
+
+    summary = {
+        'directories': len(directories),
+        'files': file_count[0] - len(file_errors),
+        'errors': len(file_errors),
+    }
+    if content_store is not None:
+        summary.update(_dedup_summary(content_store.stats, stats_before))
+    logger.info(f"Created {summary['directories']} directories and {summary['files']} files")
+    return summary
+
+def _dedup_summary(stats: Dict[str, int], before: Dict[str, int]) -> Dict[str, int]:
+    """Return the files linked by one run of a possibly shared ContentStore."""
+    linked = stats['linked_files'] - before['linked_files']
+    bytes_saved = stats['bytes_saved'] - before['bytes_saved']
+    if linked:
+        logger.info(f"Linked {linked} files to identical ones, saving {bytes_saved} bytes of writes")
+    return {'linked': linked, 'bytes_saved': bytes_saved}
+
+def _count_directories(stats: Dict[str, int]):
+    """Add the syscalls of a DirectoryPlan to the metrics of the command."""
+    metrics.count('mkdir_calls', stats['mkdir'])
+    metrics.count('stat_calls', stats['stat'])
+    metrics.count('directories_existing', stats['existing'])
+    metrics.count('makedirs_avoided', stats['makedirs_avoided'])
+
+def build_project(directory: str, jobs: Optional[int] = None,
+                  on_output: Optional[Callable[[str, str], None]] = None,
+                  use_cache: bool = True) -> Tuple[bool, List[str]]:
     """
     Build the project in the specified directory.
-    
+
+    The build steps detected for the project run in the project directory, independent
+    steps concurrently. Their output is captured line by line.
+
     Args:
         directory (str): The directory of the project to build.
-    
+        jobs (Optional[int]): Maximum number of steps running at the same time.
+        on_output (Optional[Callable[[str, str], None]]): Called with the step name and each
+            output line as soon as the step prints it.
+        use_cache (bool): Skip or restore steps whose inputs match a previous successful run.
+
     Returns:
         Tuple[bool, List[str]]: A tuple containing a success flag and a list of actions taken.
     """
+    # Only build needs asyncio and the cache, keep them out of every other command's startup.
+    from .build_cache import BuildCache
+    from .build_pipeline import BuildPipeline, default_build_steps
+
     actions = []
     try:
         logger.info(f"Building project in directory: {directory}")
 
-        # Run setup.py if it exists
-        setup_path = os.path.join(directory, 'setup.py')
-        if os.path.exists(setup_path):
-            logger.debug(f"Running 'python setup.py build'")
-            os.system(f"python {setup_path} build")
-            actions.append("Ran 'python setup.py build'")
-        else:
+        steps = default_build_steps(directory)
+        if not os.path.exists(os.path.join(directory, 'setup.py')):
             logger.debug("No setup.py found, skipping Python build")
             actions.append("No setup.py found, skipping Python build")
-        
-        # Run npm install if package.json exists
-        package_json_path = os.path.join(directory, 'package.json')
-        if os.path.exists(package_json_path):
-            logger.debug("Running 'npm install'")
-            os.system("npm install")
-            actions.append("Ran 'npm install'")
-        else:
+        if not os.path.exists(os.path.join(directory, 'package.json')):
             logger.debug("No package.json found, skipping npm install")
             actions.append("No package.json found, skipping npm install")
-        
+
+        cache = BuildCache() if use_cache else None
+        with metrics.phase('build'):
+            results = BuildPipeline(steps, jobs=jobs, on_output=on_output, cache=cache).run()
+        for result in results:
+            # Steps overlap, so their times are recorded as measured rather than summed into 'build'.
+            metrics.record(f"step:{result.step.name}", result.elapsed)
+            actions.append(result.describe())
+        if cache is not None:
+            metrics.count('build_cache_hits', cache.hits)
+            metrics.count('build_cache_misses', cache.misses)
+        if cache is not None and steps:
+            logger.info(cache.describe())
+            actions.append(cache.describe())
+
+        failed = [result.step.name for result in results if not result.ok]
+        if failed:
+            logger.error(f"Build steps failed: {', '.join(failed)}")
+            return False, actions
+
         logger.info("Project built successfully")
         return True, actions
     except Exception as e:
@@ -146,44 +389,63 @@ def build_project(directory: str) -> Tuple[bool, List[str]]:
         actions.append(f"Error: {str(e)}")
         return False, actions
 
-def clean_project(directory: str, all_files: bool = False) -> Tuple[bool, List[str]]:
+def clean_project(directory: str, all_files: bool = False, dry_run: bool = False,
+                  workers: Optional[int] = None) -> Tuple[bool, List[str]]:
     """
     Clean the project in the specified directory.
 
     Args:
         directory (str): The directory of the project to clean.
         all_files (bool): If True, remove all generated files. If False, keep some cache files.
+        dry_run (bool): Only report what would be removed, with file counts and bytes reclaimed.
+        workers (Optional[int]): Number of threads removing files and directories.
 
     Returns:
         Tuple[bool, List[str]]: A tuple containing a success flag and a list of actions taken.
     """
+    from .cleaner import Cleaner
+
     actions = []
     try:
         logger.info(f"Cleaning project in directory: {directory}")
         logger.debug(f"Cleaning all files: {all_files}")
 
-        dirs_to_clean = ['build', 'dist', '__pycache__']
-        files_to_clean = ['*.pyc', '*.pyo', '*.pyd', '*.so']
-        
-        if all_files:
-            dirs_to_clean.extend(['.pytest_cache', '.mypy_cache', '.tox'])
-            files_to_clean.extend(['.coverage'])
-
-        for root, dirs, files in os.walk(directory):
-            for d in dirs_to_clean:
-                if d in dirs:
-                    dir_path = os.path.join(root, d)
-                    logger.debug(f"Removing directory: {dir_path}")
-                    shutil.rmtree(dir_path)
-                    actions.append(f"Removed directory: {dir_path}")
-            
-            for pattern in files_to_clean:
-                for f in files:
-                    if f.endswith(pattern[1:]):
-                        file_path = os.path.join(root, f)
-                        logger.debug(f"Removing file: {file_path}")
-                        os.remove(file_path)
-                        actions.append(f"Removed file: {file_path}")
+        cleaner = Cleaner.for_project(all_files, workers)
+        with metrics.phase('scan'):
+            targets = cleaner.scan(directory, measure=dry_run)
+        metrics.count('clean_targets', len(targets))
+
+        if dry_run:
+            for target in targets:
+                actions.append(f"Would remove {target.kind}: {target.path} ({target.files} files, {target.size} bytes)")
+            files = sum(target.files for target in targets)
+            size = sum(target.size for target in targets)
+            metrics.count('files_reclaimable', files)
+            metrics.count('bytes_reclaimable', size)
+            logger.info(f"Dry run: {len(targets)} entries would be removed, reclaiming {files} files and {size} bytes")
+            actions.append(f"Would reclaim {files} files and {size} bytes")
+            return True, actions
+
+        with metrics.phase('remove'):
+            errors = cleaner.remove(targets)
+        metrics.count('clean_errors', len(errors))
+        failed = {path for path, _ in errors}
+        debug = logger.isEnabledFor(logging.DEBUG)
+        for target in targets:
+            if target.path not in failed:
+                if debug:
+                    logger.debug("Removing %s: %s", target.kind, target.path)
+                actions.append(f"Removed {target.kind}: {target.path}")
+
+        if errors:
+            for path, error in errors:
+                logger.error(f"Error removing {path}: {str(error)}")
+            permission_errors = [error for _, error in errors if isinstance(error, PermissionError)]
+            if permission_errors:
+                actions.append(f"Error: Permission denied - {str(permission_errors[0])}")
+            else:
+                actions.append(f"Error: {str(errors[0][1])}")
+            return False, actions
 
         if not actions:
             logger.info("No files or directories needed cleaning")
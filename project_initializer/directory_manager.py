@@ -1,23 +1,47 @@
 # Directory: project_initializer/
 # File: directory_manager.py
 
-import os
 import logging
+from .directory_plan import DirectoryPlan
+from .filesystem import OSFileSystem
 
 class DirectoryManager:
-    def __init__(self, directories, logger=None):
+    def __init__(self, directories, logger=None, files=None, plan=None, backend=None):
         self.directories = directories
+        self.files = files or []
+        self.directory_plan = plan
+        # The FileSystem directories are created in, e.g. a MemoryFileSystem or an ArchiveBackend.
+        self.backend = backend or OSFileSystem()
         self.logger = logger or logging.getLogger(__name__)
 
+    def plan(self):
+        if self.directory_plan is not None:
+            return self.directory_plan
+        return DirectoryPlan(self.directories, (file['path'] for file in self.files if file.get('path')),
+                             filesystem=self.backend)
+
     def create_directories(self):
+        plan = self.plan()
         self.logger.info(f"Creating {len(self.directories)} directories")
-        for directory in self.directories:
-            self.create_directory(directory)
+        try:
+            stats = plan.create()
+            self.logger.debug(f"Created {stats['mkdir'] - stats['existing']} directories with {stats['mkdir']} mkdir "
+                              f"and {stats['stat']} stat calls ({stats['makedirs_avoided']} makedirs calls avoided)")
+            return stats
+        except PermissionError as e:
+            self.logger.error(f"Permission denied when creating directories: {str(e)}")
+            raise
+        except Exception as e:
+            self.logger.error(f"Unexpected error creating directories: {str(e)}")
+            raise
 
     def create_directory(self, path):
         try:
-            os.makedirs(path, exist_ok=True)
-            self.logger.debug(f"Created directory: {path}")
+            if self.directory_plan is not None:
+                self.directory_plan.ensure(path)
+            else:
+                self.backend.makedirs(path)
+            self.logger.debug("Created directory: %s", path)
         except PermissionError as e:
             self.logger.error(f"Permission denied when creating directory {path}: {str(e)}")
             raise
@@ -0,0 +1,139 @@
+# Directory: project_initializer/
+# File: directory_plan.py
+
+"""Module for planning the directories needed by a project structure."""
+
+import os
+import logging
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+from .filesystem import FileSystem, OSFileSystem
+
+logger = logging.getLogger(__name__)
+
+# Path components that always exist and must never be created.
+_EXISTING_COMPONENTS = ('', '.', '..')
+
+
+def _split_path(path: str) -> List[str]:
+    """Split a path into its normalized components, keeping the root anchor of absolute paths."""
+    path = os.path.normpath(path)
+    drive, rest = os.path.splitdrive(path)
+    parts = [part for part in rest.split(os.sep) if part]
+    if os.path.isabs(path):
+        parts.insert(0, drive + os.sep)
+    return parts
+
+
+class DirectoryPlan:
+    """
+    A path trie of every directory a project structure needs.
+
+    Directories and the parents of files are merged into a single trie so that
+    shared parents are only visited once. Creating the plan issues exactly one
+    ``mkdir`` per directory, walking the trie parent-first, instead of one
+    ``os.makedirs`` (and its stat calls) per configured directory and per file.
+    """
+
+    def __init__(self, directories: Iterable[str] = (), files: Iterable[str] = (),
+                 filesystem: Optional[FileSystem] = None):
+        self.filesystem = filesystem or OSFileSystem()
+        self._root: Dict[str, dict] = {}
+        self.requested = 0
+        self.stats = {'mkdir': 0, 'stat': 0, 'existing': 0, 'makedirs_avoided': 0}
+        for directory in directories:
+            self.add_directory(directory)
+        for path in files:
+            self.add_file(path)
+
+    def add_directory(self, path: str):
+        """Add a directory, and implicitly all of its parents, to the plan."""
+        self.requested += 1
+        node = self._root
+        for part in _split_path(path):
+            node = node.setdefault(part, {})
+
+    def add_file(self, path: str):
+        """Add the parent directory of a file to the plan."""
+        directory = os.path.dirname(path)
+        if directory:
+            self.add_directory(directory)
+
+    def _walk(self) -> Iterator[Tuple[str, bool]]:
+        """Yield (path, is_leaf) for every node of the trie in parent-first order."""
+        stack = [(name, child) for name, child in reversed(list(self._root.items()))]
+        while stack:
+            path, node = stack.pop()
+            yield path, not node
+            stack.extend((os.path.join(path, name), child) for name, child in reversed(list(node.items())))
+
+    def directories(self) -> List[str]:
+        """Return every directory of the plan in parent-first order."""
+        return [path for path, _ in self._walk()]
+
+    def leaves(self) -> List[str]:
+        """Return the minimal set of directories whose creation yields the whole plan."""
+        return [path for path, is_leaf in self._walk() if is_leaf]
+
+    def create(self, base_dir: str = '.') -> Dict[str, int]:
+        """
+        Create every directory of the plan under base_dir.
+
+        Args:
+            base_dir (str): Directory the planned paths are relative to.
+
+        Returns:
+            Dict[str, int]: Syscall counters of the plan. ``mkdir`` and ``stat``
+            count the calls that were made, ``existing`` the directories that
+            were already present and ``makedirs_avoided`` the ``os.makedirs``
+            calls a per-entry approach would have issued on top of them.
+        """
+        for path, _ in self._walk():
+            self._mkdir(base_dir, path)
+        self._log_stats()
+        return self.stats
+
+    def ensure(self, path: str, base_dir: str = '.', is_file: bool = False):
+        """
+        Add a directory (or the parent of a file) to the plan and create its missing parts right away.
+
+        Used when entries arrive one at a time and cannot be planned up front.
+        Every directory already in the trie is assumed to exist on disk, so
+        only the newly added components are created.
+        """
+        if is_file:
+            path = os.path.dirname(path)
+            if not path:
+                return
+        self.requested += 1
+        node = self._root
+        current = ''
+        for part in _split_path(path):
+            current = os.path.join(current, part)
+            if part not in node:
+                node[part] = {}
+                self._mkdir(base_dir, current)
+            node = node[part]
+        self.stats['makedirs_avoided'] = max(self.requested - self.stats['mkdir'], 0)
+
+    def _mkdir(self, base_dir: str, path: str):
+        if os.path.basename(path) in _EXISTING_COMPONENTS or path == os.path.dirname(path):
+            return
+        target = os.path.join(base_dir, path)
+        try:
+            self.stats['mkdir'] += 1
+            self.filesystem.mkdir(target)
+        except FileExistsError:
+            # Only pay for a stat when something is already in the way.
+            self.stats['stat'] += 1
+            if not self.filesystem.isdir(target):
+                raise
+            self.stats['existing'] += 1
+
+    def _log_stats(self):
+        stats = self.stats
+        stats['makedirs_avoided'] = max(self.requested - stats['mkdir'], 0)
+        logger.debug(f"Directory plan: {stats['mkdir']} mkdir, {stats['stat']} stat, "
+                     f"{stats['existing']} existing, {stats['makedirs_avoided']} makedirs calls avoided")
+
+    def __len__(self):
+        return sum(1 for _ in self._walk())
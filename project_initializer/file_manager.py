@@ -3,33 +3,203 @@
 
 import os
 import logging
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from .filesystem import OSFileSystem
+from . import metrics
+
+# Upper bound on files held open at the same time by the concurrent writers.
+DEFAULT_MAX_OPEN_FILES = 64
+
 
 class FileManager:
-    def __init__(self, files, logger=None):
+    def __init__(self, files, logger=None, workers=None, max_open_files=None, executor=None, create_parents=True,
+                 directory_plan=None, backend=None, content_store=None):
         self.files = files
+        self.create_parents = create_parents
+        self.directory_plan = directory_plan
+        # The FileSystem files are written to, e.g. a MemoryFileSystem or an ArchiveBackend.
+        self.backend = backend or OSFileSystem()
         self.logger = logger or logging.getLogger(__name__)
+        self.workers = workers
+        self.max_open_files = max_open_files or DEFAULT_MAX_OPEN_FILES
+        self.executor = executor
+        # Set to write each distinct body once and link identical files to it, see ContentStore.
+        self.content_store = content_store
+        self.errors = []
+        self._open_files = threading.BoundedSemaphore(self.max_open_files)
+
+    @property
+    def concurrent(self):
+        return self.executor is not None or (self.workers or 1) > 1
+
+    def create_files(self, files=None):
+        """
+        Create every file entry and return the list of (path, error) pairs that failed.
+
+        files defaults to the entries given to the constructor. Any other iterable,
+        such as a generator streaming entries out of a config, is consumed lazily.
+        """
+        files = self.files if files is None else files
+        if isinstance(files, (list, tuple)):
+            self.logger.info(f"Creating {len(files)} files")
+        else:
+            self.logger.info("Creating files as they are streamed")
+        self.errors = []
+        if not self.backend.concurrent:
+            self._create_files_in_order(files)
+        elif not self.concurrent:
+            for file in files:
+                self._ensure_parent(file.get('path'))
+                self.create_entry(file)
+        elif isinstance(files, (list, tuple)):
+            self._create_files_concurrently(files)
+        else:
+            self._stream_files_concurrently(files)
+        return self.errors
+
+    def _create_files_in_order(self, files):
+        # Backends such as archives are a single stream, so entries are written one
+        # at a time, and known lists keep only the last entry per path, as on disk.
+        if isinstance(files, (list, tuple)):
+            entries = {}
+            for file in files:
+                entries.pop(file.get('path'), None)
+                entries[file.get('path')] = file
+            files = entries.values()
+        for file in files:
+            self._ensure_parent(file.get('path'))
+            self.create_entry(file)
+
+    def _ensure_parent(self, path):
+        if self.directory_plan is not None and path:
+            self.directory_plan.ensure(path, is_file=True)
+
+    def _create_files_concurrently(self, files):
+        # Later entries win in the serial path, so keep only the last entry for
+        # each path to get the same tree regardless of completion order.
+        entries = {}
+        for file in files:
+            entries.pop(file.get('path'), None)
+            entries[file.get('path')] = file
+            self._ensure_parent(file.get('path'))
+
+        if self.executor is not None:
+            list(self.executor.map(self.create_entry, entries.values()))
+            return
 
-    def create_files(self):
-        self.logger.info(f"Creating {len(self.files)} files")
-        for file in self.files:
-            self.create_file(file['path'], file.get('content', ''))
+        self.logger.debug(f"Writing files with {self.workers} workers, at most {self.max_open_files} open")
+        with ThreadPoolExecutor(max_workers=self.workers) as executor:
+            list(executor.map(self.create_entry, entries.values()))
 
-    def create_file(self, path, content=''):
+    def _stream_files_concurrently(self, files):
+        # Only max_open_files entries are in flight at once so that memory stays
+        # bounded, and writes to the same path keep their order.
+        executor = self.executor or ThreadPoolExecutor(max_workers=self.workers)
+        pending = deque()
+        latest = {}
+        try:
+            for file in files:
+                path = file.get('path')
+                self._ensure_parent(path)
+                if path in latest:
+                    latest[path].result()
+                while len(pending) >= self.max_open_files:
+                    self._release(pending.popleft(), latest)
+                future = executor.submit(self.create_entry, file)
+                pending.append((path, future))
+                latest[path] = future
+            while pending:
+                self._release(pending.popleft(), latest)
+        finally:
+            if executor is not self.executor:
+                executor.shutdown(wait=True)
+
+    @staticmethod
+    def _release(item, latest):
+        path, future = item
+        future.result()
+        if latest.get(path) is future:
+            del latest[path]
+
+    def create_entry(self, file):
+        """Create a file from a configuration entry, with inline content or a source to copy."""
+        if file.get('source'):
+            self.create_file(file.get('path'), source=file['source'], link=file.get('link', 'copy'))
+        elif self.content_store is not None and file.get('content') and not self.content_store.excluded(file):
+            self._create_deduplicated(file.get('path'), file['content'])
+        else:
+            self.create_file(file.get('path'), file.get('content', ''))
+
+    def _create_deduplicated(self, path, content):
+        store = self.content_store
+        local_path = self.backend.local_path(path) if path else None
+        if local_path is None:
+            # Only files on the local disk can be linked.
+            self.create_file(path, content)
+            return
+        data = content.encode('utf-8')
+        body, first = store.claim(store.digest(data), local_path)
+        if first:
+            store.written(body, self.create_file(path, content))
+            return
+        if store.wait(body):
+            try:
+                directory = os.path.dirname(path)
+                if directory and self.create_parents:
+                    self.backend.makedirs(directory)
+                with self._open_files:
+                    method = self.backend.copy_file(path, body.path, store.link)
+                if method in ('hard', 'reflink'):
+                    store.linked(len(data))
+                    metrics.count('files_linked')
+                    metrics.count('bytes_saved', len(data))
+                else:
+                    metrics.count('files_written')
+                    metrics.count('bytes_written', len(data))
+                self.logger.debug("Linked file: %s to %s", path, body.path)
+                return
+            except FileNotFoundError:
+                # The first copy was removed since, e.g. by a later run; write this one instead.
+                store.forget(body)
+            except OSError as e:
+                self.logger.error(f"Error creating file {path}: {str(e)}")
+                self.errors.append((path, e))
+                return
+        self.create_file(path, content)
+
+    def create_file(self, path, content='', source=None, link='copy'):
+        """Create one file and return whether it was written; failures are added to errors."""
         try:
             if not path:
                 self.logger.warning(f"Skipping file creation due to empty path")
-                return
+                return False
 
-            # Handle files in the root directory
+            # Handle files in the root directory. Parents are skipped when a
+            # DirectoryPlan has already created them.
             directory = os.path.dirname(path)
-            if directory:
-                os.makedirs(directory, exist_ok=True)
-            
-            # Create the file
-            with open(path, 'w', encoding='utf-8') as f:
-                f.write(content)
-            self.logger.debug(f"Created file: {path}")
+            if directory and self.create_parents:
+                self.backend.makedirs(directory)
+
+            # Create the file, letting the backend copy sources without reading them here
+            with self._open_files:
+                if source is not None:
+                    method = self.backend.copy_file(path, source, link)
+                else:
+                    self.backend.write_file(path, content)
+            if metrics.enabled():
+                metrics.count('files_written')
+                if source is not None:
+                    metrics.count(f"files_copied_{method or 'backend'}")
+                else:
+                    metrics.count('bytes_written', len(content.encode('utf-8')))
+            self.logger.debug("Created file: %s", path)
+            return True
         except IOError as e:
             self.logger.error(f"Error creating file {path}: {str(e)}")
+            self.errors.append((path, e))
         except Exception as e:
             self.logger.error(f"Unexpected error creating file {path}: {str(e)}")
+            self.errors.append((path, e))
+        return False
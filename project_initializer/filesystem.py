@@ -0,0 +1,190 @@
+# Directory: project_initializer/
+# File: filesystem.py
+
+"""Module for the filesystems that generated directories and files are written to."""
+
+import os
+import posixpath
+import threading
+from abc import ABC, abstractmethod
+from typing import Dict, Optional, Union
+
+
+def _memory_path(path: str) -> str:
+    return os.path.normpath(path).replace(os.sep, '/')
+
+
+def open_unshared(path: str, mode: str = 'w', **kwargs):
+    """
+    Open path for writing from its start, like open(path, mode).
+
+    A file with other hard links is unlinked first instead of being truncated,
+    so writing it never changes the other names of its inode.
+    """
+    fd = os.open(path, os.O_WRONLY | os.O_CREAT, 0o666)
+    try:
+        st = os.fstat(fd)
+        if st.st_nlink > 1:
+            os.close(fd)
+            fd = -1
+            os.unlink(path)
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o666)
+        elif st.st_size:
+            os.ftruncate(fd, 0)
+    except BaseException:
+        if fd >= 0:
+            os.close(fd)
+        raise
+    return open(fd, mode, **kwargs)
+
+
+class FileSystem(ABC):
+    """
+    The operations DirectoryPlan, DirectoryManager and FileManager write through.
+
+    Paths are relative to the project root, or absolute. ``concurrent`` tells
+    whether write_file may be called from several threads at the same time.
+    """
+
+    concurrent = True
+
+    @abstractmethod
+    def mkdir(self, path: str):
+        """Create one directory, raising FileExistsError if something is already there."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def makedirs(self, path: str):
+        """Create a directory and its missing parents; existing directories are fine."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def isdir(self, path: str) -> bool:
+        raise NotImplementedError
+
+    @abstractmethod
+    def write_file(self, path: str, content: str):
+        """Create or replace a file with the given text, encoded as UTF-8. Its parent must exist."""
+        raise NotImplementedError
+
+    @abstractmethod
+    def copy_file(self, path: str, source: str, link: str = 'copy') -> Optional[str]:
+        """
+        Create or replace a file with the bytes of the local file source. Its parent must exist.
+
+        Returns:
+            Optional[str]: How the bytes were copied, when the backend can tell.
+        """
+        raise NotImplementedError
+
+    def local_path(self, path: str) -> Optional[str]:
+        """Return the absolute path a file is written to on the local disk, or None if it is not."""
+        return None
+
+
+class OSFileSystem(FileSystem):
+    """
+    Writes to the real filesystem, relative to root.
+
+    Without a root, paths are relative to the current directory. A root lets
+    several threads generate into different directories without changing it.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        self.root = root
+
+    def _path(self, path: str) -> str:
+        return os.path.join(self.root, path) if self.root is not None else path
+
+    def mkdir(self, path: str):
+        os.mkdir(self._path(path))
+
+    def makedirs(self, path: str):
+        os.makedirs(self._path(path), exist_ok=True)
+
+    def isdir(self, path: str) -> bool:
+        return os.path.isdir(self._path(path))
+
+    def write_file(self, path: str, content: str):
+        # Generated files may be hard links to identical ones, see ContentStore.
+        with open_unshared(self._path(path), 'w', encoding='utf-8') as f:
+            f.write(content)
+
+    def copy_file(self, path: str, source: str, link: str = 'copy') -> Optional[str]:
+        from .assets import copy_file
+
+        return copy_file(source, self._path(path), link)
+
+    def local_path(self, path: str) -> Optional[str]:
+        return os.path.abspath(self._path(path))
+
+
+class MemoryFileSystem(FileSystem):
+    """
+    Records the tree in memory instead of writing it, with the same errors as the OS.
+
+    Paths are kept normalized with ``/`` separators. After a run, ``directories``
+    holds every created directory and ``files`` maps every file to its content,
+    as bytes for files copied from a source.
+    """
+
+    def __init__(self):
+        self.directories = set()
+        self.files: Dict[str, Union[str, bytes]] = {}
+        self._lock = threading.Lock()
+
+    def _check_parent(self, path: str):
+        parent = posixpath.dirname(path)
+        if parent and parent not in self.directories and not posixpath.isabs(parent):
+            raise FileNotFoundError(f"No such directory: {parent}")
+
+    def mkdir(self, path: str):
+        path = _memory_path(path)
+        with self._lock:
+            if path == '.' or path in self.directories or path in self.files:
+                raise FileExistsError(f"File exists: {path}")
+            self._check_parent(path)
+            self.directories.add(path)
+
+    def makedirs(self, path: str):
+        path = _memory_path(path)
+        with self._lock:
+            missing = []
+            while path not in ('', '.', '/') and path not in self.directories:
+                if path in self.files:
+                    raise FileExistsError(f"File exists: {path}")
+                missing.append(path)
+                path = posixpath.dirname(path)
+            self.directories.update(missing)
+
+    def isdir(self, path: str) -> bool:
+        path = _memory_path(path)
+        return path == '.' or path in self.directories
+
+    def write_file(self, path: str, content: str):
+        path = _memory_path(path)
+        with self._lock:
+            if path in self.directories:
+                raise IsADirectoryError(f"Is a directory: {path}")
+            self._check_parent(path)
+            self.files[path] = content
+
+    def copy_file(self, path: str, source: str, link: str = 'copy') -> Optional[str]:
+        with open(source, 'rb') as f:
+            data = f.read()
+        path = _memory_path(path)
+        with self._lock:
+            if path in self.directories:
+                raise IsADirectoryError(f"Is a directory: {path}")
+            self._check_parent(path)
+            self.files[path] = data
+        return None
+
+    def read_file(self, path: str) -> Union[str, bytes]:
+        return self.files[_memory_path(path)]
+
+    def tree(self) -> Dict[str, Optional[Union[str, bytes]]]:
+        """Return every path in sorted order, mapped to its content, or None for directories."""
+        tree: Dict[str, Optional[Union[str, bytes]]] = dict.fromkeys(self.directories)
+        tree.update(self.files)
+        return dict(sorted(tree.items()))
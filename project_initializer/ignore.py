@@ -0,0 +1,189 @@
+# Directory: project_initializer/
+# File: ignore.py
+
+"""Module for matching paths against .gitignore files and exclude globs."""
+
+import os
+import re
+from typing import Iterable, List, Optional, Tuple
+
+# Never worth listing or capturing, whatever the .gitignore files say.
+DEFAULT_EXCLUDES = ('.git/', 'node_modules/')
+GITIGNORE = '.gitignore'
+
+
+def _translate(pattern: str) -> str:
+    """Translate the glob of a .gitignore pattern into a regular expression."""
+    i, n = 0, len(pattern)
+    parts = []
+    while i < n:
+        c = pattern[i]
+        if c == '*':
+            if pattern.startswith('**/', i):
+                # Zero or more directories.
+                parts.append('(?:.*/)?')
+                i += 3
+                continue
+            if pattern.startswith('**', i):
+                parts.append('.*')
+                i += 2
+                continue
+            parts.append('[^/]*')
+        elif c == '?':
+            parts.append('[^/]')
+        elif c == '[':
+            end = pattern.find(']', i + 2)
+            if end == -1:
+                parts.append(re.escape(c))
+            else:
+                body = pattern[i + 1:end].replace('\\', '\\\\')
+                if body.startswith('!'):
+                    body = '^' + body[1:]
+                parts.append(f"[{body}]")
+                i = end + 1
+                continue
+        elif c == '\\' and i + 1 < n:
+            parts.append(re.escape(pattern[i + 1]))
+            i += 2
+            continue
+        else:
+            parts.append(re.escape(c))
+        i += 1
+    return ''.join(parts)
+
+
+def parse_pattern(line: str) -> Optional[Tuple[str, bool, bool]]:
+    """
+    Parse one line of a .gitignore file.
+
+    Returns:
+        Optional[Tuple[str, bool, bool]]: The regular expression matching the path relative to the
+            directory of the file, whether the pattern is negated and whether it only matches
+            directories, or None for blank lines and comments.
+    """
+    line = line.rstrip('\r\n')
+    if not line.endswith('\\ '):
+        line = line.rstrip(' ')
+    if not line or line.startswith('#'):
+        return None
+    negate = line.startswith('!')
+    if negate:
+        line = line[1:]
+    elif line.startswith(('\\!', '\\#')):
+        line = line[1:]
+    dir_only = line.endswith('/')
+    line = line.rstrip('/')
+    if not line:
+        return None
+    # A slash anywhere but at the end anchors the pattern to the directory of the file.
+    anchored = '/' in line
+    regex = _translate(line.lstrip('/'))
+    if not anchored:
+        regex = '(?:.*/)?' + regex
+    return regex, negate, dir_only
+
+
+class IgnoreRules:
+    """
+    The patterns of one .gitignore file, or exclude globs, applying below base.
+
+    Paths are relative to the walked root with ``/`` separators. As in git, the
+    last matching pattern decides, and a ``!`` pattern includes a path again.
+    Rule sets without negations are matched with one combined expression.
+    """
+
+    def __init__(self, patterns: Iterable[str], base: str = ''):
+        self.base = base
+        self._prefix = f"{base}/" if base else ''
+        self.rules: List[Tuple['re.Pattern', bool, bool]] = []
+        for line in patterns:
+            parsed = parse_pattern(line)
+            if parsed is not None:
+                regex, negate, dir_only = parsed
+                self.rules.append((re.compile(regex), negate, dir_only))
+        self._any = self._dirs = None
+        if not any(negate for _, negate, _ in self.rules):
+            self._any = self._combine(pattern for pattern, _, dir_only in self.rules if not dir_only)
+            self._dirs = self._combine(pattern for pattern, _, dir_only in self.rules if dir_only)
+
+    @staticmethod
+    def _combine(patterns) -> Optional['re.Pattern']:
+        patterns = [pattern.pattern for pattern in patterns]
+        return re.compile('|'.join(f"(?:{pattern})" for pattern in patterns)) if patterns else None
+
+    @classmethod
+    def from_file(cls, path: str, base: str = '') -> 'IgnoreRules':
+        with open(path, 'r', encoding='utf-8', errors='replace') as f:
+            return cls(f.read().splitlines(), base)
+
+    def __bool__(self) -> bool:
+        return bool(self.rules)
+
+    def match(self, path: str, is_dir: bool) -> Optional[bool]:
+        """Return True if path is ignored, False if it is included again, or None if no pattern matches."""
+        if self._prefix:
+            if not path.startswith(self._prefix):
+                return None
+            path = path[len(self._prefix):]
+        if self._any is not None or self._dirs is not None:
+            if self._any is not None and self._any.fullmatch(path):
+                return True
+            if is_dir and self._dirs is not None and self._dirs.fullmatch(path):
+                return True
+            return None
+        for pattern, negate, dir_only in reversed(self.rules):
+            if (is_dir or not dir_only) and pattern.fullmatch(path):
+                return not negate
+        return None
+
+
+class IgnoreMatcher:
+    """
+    The rules in effect in one directory: those of its parents, then its own.
+
+    Deeper .gitignore files take precedence over the ones above them, and the
+    exclude globs given to the root take precedence over every file.
+    """
+
+    def __init__(self, rules: Tuple[IgnoreRules, ...] = (), excludes: Optional[IgnoreRules] = None):
+        self.rules = rules
+        self.excludes = excludes
+
+    @classmethod
+    def for_root(cls, root: str, excludes: Iterable[str] = DEFAULT_EXCLUDES, gitignore: bool = True) -> 'IgnoreMatcher':
+        """Return the matcher of a walked root, with its .gitignore and .git/info/exclude files."""
+        matcher = cls(excludes=IgnoreRules(excludes))
+        if gitignore:
+            matcher = matcher.child(root, '', gitignore=True,
+                                    extra=os.path.join(root, '.git', 'info', 'exclude'))
+        return matcher
+
+    def child(self, directory: str, base: str, gitignore: bool = True, extra: Optional[str] = None) -> 'IgnoreMatcher':
+        """Return the matcher of directory, adding its .gitignore file if it has one."""
+        if not gitignore:
+            return self
+        rules = self.rules
+        for path in (extra, os.path.join(directory, GITIGNORE)):
+            if path is None:
+                continue
+            try:
+                found = IgnoreRules.from_file(path, base)
+            except OSError:
+                continue
+            if found:
+                rules = rules + (found,)
+        return IgnoreMatcher(rules, self.excludes) if rules is not self.rules else self
+
+    def with_patterns(self, patterns: Iterable[str], base: str) -> 'IgnoreMatcher':
+        """Return the matcher of a directory whose .gitignore patterns are already known."""
+        found = IgnoreRules(patterns, base)
+        return IgnoreMatcher(self.rules + (found,), self.excludes) if found else self
+
+    def ignored(self, path: str, is_dir: bool) -> bool:
+        if self.excludes is not None and self.excludes.match(path, is_dir):
+            return True
+        for rules in reversed(self.rules):
+            result = rules.match(path, is_dir)
+            if result is not None:
+                return result
+        return False
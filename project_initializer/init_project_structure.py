@@ -2,6 +2,7 @@ import os
 import yaml
 from pathlib import Path
 import logging
+from .template_engine import TemplateEngine
 
 def init_project_structure(config_path, template='default'):
     """Initialize project structure based on the configuration file."""
@@ -12,11 +13,14 @@ def init_project_structure(config_path, template='default'):
         config = yaml.safe_load(config_file)
     
     logger.info(f"Initializing project structure using {template} template...")
+
+    # project_name keeps its historical 'My Project' default
+    engine = TemplateEngine.from_config({'project_name': 'My Project', **config})
     
     # Create base directories
     for directory in config.get('directories', []):
         os.makedirs(directory, exist_ok=True)
-        logger.debug(f"Created directory: {directory}")
+        logger.debug("Created directory: %s", directory)
     
     # Create base files
     for file_info in config.get('files', []):
@@ -24,11 +28,11 @@ def init_project_structure(config_path, template='default'):
         content = file_info['content']
         
         # Replace placeholders in content
-        content = content.replace('${project_name}', config.get('project_name', 'My Project'))
+        content = engine.render(content, keep_undefined=True)
         
         with open(file_path, 'w') as f:
             f.write(content)
-        logger.debug(f"Created file: {file_path}")
+        logger.debug("Created file: %s", file_path)
     
     # Apply template-specific configuration
     if template in config.get('templates', {}):
@@ -37,7 +41,7 @@ def init_project_structure(config_path, template='default'):
         # Create additional directories
         for directory in template_config.get('additional_directories', []):
             os.makedirs(directory, exist_ok=True)
-            logger.debug(f"Created template directory: {directory}")
+            logger.debug("Created template directory: %s", directory)
         
         # Create additional files
         for file_info in template_config.get('additional_files', []):
@@ -45,10 +49,10 @@ def init_project_structure(config_path, template='default'):
             content = file_info['content']
             
             # Replace placeholders in content
-            content = content.replace('${project_name}', config.get('project_name', 'My Project'))
+            content = engine.render(content, keep_undefined=True)
             
             with open(file_path, 'w') as f:
                 f.write(content)
-            logger.debug(f"Created template file: {file_path}")
+            logger.debug("Created template file: %s", file_path)
     
     logger.info("Project structure initialized successfully.")
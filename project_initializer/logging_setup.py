@@ -0,0 +1,104 @@
+# Directory: project_initializer/
+# File: logging_setup.py
+
+"""Module for configuring logging, optionally with handler I/O moved off the calling threads."""
+
+import sys
+import json
+import logging
+from typing import List, Optional
+
+TEXT_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+LOG_FORMATS = ('text', 'json')
+
+# Handlers and listener installed by the last configure_logging call.
+_installed_handlers: List[logging.Handler] = []
+_listener: Optional['logging.handlers.QueueListener'] = None
+
+
+class JsonLinesFormatter(logging.Formatter):
+    """Formats each record as a single JSON object per line."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry = {
+            'time': self.formatTime(record),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exception'] = self.formatException(record.exc_info)
+        return json.dumps(entry)
+
+
+def _make_formatter(log_format: str) -> logging.Formatter:
+    if log_format == 'json':
+        return JsonLinesFormatter()
+    return logging.Formatter(TEXT_FORMAT)
+
+
+def configure_logging(verbose: bool = False, log_file: Optional[str] = None, log_format: str = 'text',
+                      use_queue: bool = False, console: bool = True) -> Optional['logging.handlers.QueueListener']:
+    """
+    Configure the root logger for the CLI.
+
+    Only the root logger's level is set; every project logger inherits it. Calling
+    this again replaces the handlers installed by the previous call.
+
+    Args:
+        verbose (bool): Log DEBUG messages instead of INFO and above.
+        log_file (Optional[str]): Also write the log to this file.
+        log_format (str): ``'text'`` or ``'json'`` for one JSON object per line.
+        use_queue (bool): Hand records to a queue and let a background listener
+            thread format them and write them out.
+        console (bool): Write the log to stderr.
+
+    Returns:
+        Optional[QueueListener]: The started listener when use_queue is set. Stop it,
+        or call stop_logging, to flush the remaining records.
+    """
+    if log_format not in LOG_FORMATS:
+        raise ValueError(f"Unknown log format '{log_format}', expected one of: {', '.join(LOG_FORMATS)}")
+    global _listener
+    stop_logging()
+
+    level = logging.DEBUG if verbose else logging.INFO
+    formatter = _make_formatter(log_format)
+    handlers: List[logging.Handler] = [logging.StreamHandler(sys.stderr)] if console else []
+    if log_file:
+        handlers.append(logging.FileHandler(log_file))
+    for handler in handlers:
+        handler.setLevel(level)
+        handler.setFormatter(formatter)
+
+    root = logging.getLogger()
+    root.setLevel(level)
+    if use_queue:
+        # Only imported here: logging.handlers pulls in socket and pickle, too much for every CLI start.
+        import queue
+        from logging.handlers import QueueHandler, QueueListener
+
+        records: queue.SimpleQueue = queue.SimpleQueue()
+        _listener = QueueListener(records, *handlers, respect_handler_level=True)
+        _listener.start()
+        _installed_handlers.append(QueueHandler(records))
+    else:
+        _installed_handlers.extend(handlers)
+    for handler in _installed_handlers:
+        root.addHandler(handler)
+    return _listener
+
+
+def stop_logging():
+    """Flush and remove the handlers installed by configure_logging."""
+    global _listener
+    if _listener is not None:
+        _listener.stop()
+        for handler in _listener.handlers:
+            handler.close()
+        _listener = None
+    root = logging.getLogger()
+    for handler in _installed_handlers:
+        root.removeHandler(handler)
+        handler.close()
+    del _installed_handlers[:]
@@ -0,0 +1,169 @@
+# Directory: project_initializer/
+# File: manifest.py
+
+"""Module for tracking generated files so that re-initialization only writes what changed."""
+
+import os
+import json
+import hashlib
+import logging
+from typing import Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+MANIFEST_FILENAME = '.project-initializer-manifest.json'
+MANIFEST_VERSION = 1
+
+# Read size used when a file on disk has to be hashed.
+_HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def hash_bytes(data: bytes) -> str:
+    """Return the hex digest used to identify file contents."""
+    return hashlib.sha256(data).hexdigest()
+
+
+def hash_file(path: str) -> str:
+    """Hash a file on disk in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(_HASH_CHUNK_SIZE), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def normalize_path(path: str) -> str:
+    """Normalize a configured path into the form used as a manifest key."""
+    return os.path.normpath(path).replace(os.sep, '/')
+
+
+class Manifest:
+    """
+    A record of the files written by a previous run, stored in the output directory.
+
+    Each entry maps a normalized path to the content hash, mode, size and
+    mtime of the file as it was left by the run that wrote it. The size and
+    mtime allow a stat call to prove a file is untouched without hashing it.
+    """
+
+    def __init__(self, base_dir: str = '.', entries: Optional[Dict[str, Dict]] = None):
+        self.base_dir = base_dir
+        self.entries = entries or {}
+
+    @property
+    def path(self) -> str:
+        return os.path.join(self.base_dir, MANIFEST_FILENAME)
+
+    @classmethod
+    def load(cls, base_dir: str = '.') -> 'Manifest':
+        """
+        Load the manifest stored in base_dir.
+
+        A missing or unreadable manifest yields an empty one, which makes the
+        next run fall back to comparing against the files on disk.
+        """
+        manifest = cls(base_dir)
+        try:
+            with open(manifest.path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if data.get('version') == MANIFEST_VERSION:
+                manifest.entries = data.get('files', {})
+            else:
+                logger.warning(f"Ignoring manifest with unsupported version: {manifest.path}")
+        except FileNotFoundError:
+            logger.debug(f"No manifest found in {base_dir}")
+        except (ValueError, OSError) as e:
+            logger.warning(f"Ignoring unreadable manifest {manifest.path}: {str(e)}")
+        return manifest
+
+    def save(self):
+        """Atomically write the manifest to the output directory."""
+        tmp_path = f"{self.path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            json.dump({'version': MANIFEST_VERSION, 'files': self.entries}, f, indent=1, sort_keys=True)
+        os.replace(tmp_path, self.path)
+
+    def record(self, path: str, digest: str):
+        """Record the state of a file that has just been written."""
+        key = normalize_path(path)
+        st = os.stat(os.path.join(self.base_dir, key))
+        self.entries[key] = {'hash': digest, 'mode': st.st_mode, 'size': st.st_size, 'mtime_ns': st.st_mtime_ns}
+
+    def _is_current(self, key: str, size: int, digest: str) -> bool:
+        """Tell whether the file on disk already has that size and digest, hashing it only as a last resort."""
+        try:
+            st = os.stat(os.path.join(self.base_dir, key))
+        except FileNotFoundError:
+            return False
+        if st.st_size != size:
+            return False
+        entry = self.entries.get(key)
+        if entry and entry.get('size') == st.st_size and entry.get('mtime_ns') == st.st_mtime_ns:
+            return entry.get('hash') == digest
+        return hash_file(os.path.join(self.base_dir, key)) == digest
+
+
+class IncrementalPlan:
+    """
+    The result of comparing configured files against a manifest.
+
+    Attributes:
+        to_write (List[Dict]): File entries that are new or changed, deduplicated by path.
+        created, updated, unchanged, orphaned (List[str]): Normalized paths in each state.
+    """
+
+    def __init__(self, manifest: Manifest, files: List[Dict]):
+        self.manifest = manifest
+        self.to_write: List[Dict] = []
+        self.created: List[str] = []
+        self.updated: List[str] = []
+        self.unchanged: List[str] = []
+        self.digests: Dict[str, str] = {}
+
+        # The last entry for a path wins, as it does when every entry is written.
+        latest = {}
+        for file in files:
+            if file.get('path'):
+                latest[normalize_path(file['path'])] = file
+
+        for key, file in latest.items():
+            if file.get('source'):
+                size, digest = os.stat(file['source']).st_size, hash_file(file['source'])
+            else:
+                data = file.get('content', '').encode('utf-8')
+                size, digest = len(data), hash_bytes(data)
+            self.digests[key] = digest
+            if manifest._is_current(key, size, digest):
+                self.unchanged.append(key)
+                # Keep the previous entry, or adopt a matching file written by hand.
+                if key not in manifest.entries:
+                    manifest.record(key, digest)
+                continue
+            exists = os.path.lexists(os.path.join(manifest.base_dir, key))
+            (self.updated if exists else self.created).append(key)
+            self.to_write.append(file)
+
+        self.orphaned = sorted(key for key in manifest.entries if key not in latest)
+
+    def commit(self, failed_paths=()):
+        """Record every successfully written file, then save the manifest."""
+        failed = {normalize_path(path) for path in failed_paths}
+        for file in self.to_write:
+            key = normalize_path(file['path'])
+            if key not in failed:
+                self.manifest.record(key, self.digests[key])
+            else:
+                self.manifest.entries.pop(key, None)
+        # Orphans are left on disk, and stay tracked until they are removed.
+        for key in self.orphaned:
+            if not os.path.lexists(os.path.join(self.manifest.base_dir, key)):
+                self.manifest.entries.pop(key, None)
+        self.manifest.save()
+
+    def summary(self) -> Dict[str, int]:
+        return {
+            'created': len(self.created),
+            'updated': len(self.updated),
+            'unchanged': len(self.unchanged),
+            'orphaned': len(self.orphaned),
+        }
@@ -0,0 +1,99 @@
+# Directory: project_initializer/
+# File: merge.py
+
+"""Module for merging the entries of a user configuration with those of a template."""
+
+import os
+import logging
+from typing import Dict, Iterable, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Which side keeps a file listed by both the configuration and the template.
+PRECEDENCES = ('config', 'template')
+DEFAULT_PRECEDENCE = 'config'
+
+
+def normalize_path(path: str) -> str:
+    """Return the key two entries share when they point to the same file or directory."""
+    return os.path.normpath(path).replace(os.sep, '/') if path else path
+
+
+def merge_directories(*sources: Iterable[str]) -> List[str]:
+    """Return every directory once, in the order it is first listed."""
+    seen = set()
+    merged = []
+    for directories in sources:
+        for directory in directories:
+            key = normalize_path(directory)
+            if key not in seen:
+                seen.add(key)
+                merged.append(directory)
+    return merged
+
+
+def merge_files(config_files: List[Dict], template_files: List[Dict],
+                precedence: str = DEFAULT_PRECEDENCE) -> Tuple[List[Dict], List[str]]:
+    """
+    Return every file once, and the paths of the entries that lost to another one.
+
+    Files keep the position where their path is first listed, configuration
+    files first. A path listed twice on the same side keeps its last entry, as
+    writing it twice would. Across sides, precedence decides which one is kept.
+    Entries without a path are passed through unmerged, to be reported when they
+    are written.
+
+    Raises:
+        ValueError: If precedence is not one of PRECEDENCES.
+    """
+    if precedence not in PRECEDENCES:
+        raise ValueError(f"Unknown precedence '{precedence}', expected one of: {', '.join(PRECEDENCES)}")
+    # Normalized path -> (side, entry), in first listed order. Entries without a path get a key of their own.
+    entries: Dict[object, Tuple[str, Dict]] = {}
+    overridden = []
+    for side, files in (('config', config_files), ('template', template_files)):
+        for file in files:
+            if not file.get('path'):
+                entries[object()] = (side, file)
+                continue
+            key = normalize_path(file['path'])
+            previous = entries.get(key)
+            if previous is None or previous[0] == side or side == precedence:
+                if previous is not None:
+                    overridden.append(previous[1]['path'])
+                entries[key] = (side, file)
+            else:
+                overridden.append(file['path'])
+    return [file for _, file in entries.values()], overridden
+
+
+def report_overridden(overridden: List[str], precedence: str):
+    """Log the file entries that were dropped in favor of another entry with the same path."""
+    if overridden:
+        logger.info(f"{len(overridden)} file entries overridden, {precedence} entries taking precedence: "
+                    f"{', '.join(overridden)}")
+
+
+def merge_template_config(config_data: Dict, template_config: Dict,
+                          precedence: str = DEFAULT_PRECEDENCE) -> Dict[str, List]:
+    """
+    Merge the directories and files of a template into a user configuration.
+
+    Entries are matched by normalized path before template variables are
+    substituted, and each path is listed once.
+
+    Args:
+        config_data (Dict): The parsed user configuration.
+        template_config (Dict): Directories and files of the selected template.
+        precedence (str): 'config' to keep the configuration's file when both list a path,
+            'template' to keep the template's.
+
+    Returns:
+        Dict[str, List]: The merged ``directories`` and ``files`` lists.
+    """
+    files, overridden = merge_files(config_data.get('files') or [], template_config['files'], precedence)
+    report_overridden(overridden, precedence)
+    return {
+        'directories': merge_directories(config_data.get('directories') or [], template_config['directories']),
+        'files': files,
+    }
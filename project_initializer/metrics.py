@@ -0,0 +1,178 @@
+# Directory: project_initializer/
+# File: metrics.py
+
+"""Module for recording the wall time, CPU time and counters of each phase of a command."""
+
+import sys
+import json
+import time
+import logging
+import threading
+from contextlib import contextmanager
+from typing import Callable, Dict, Iterator, List, Optional
+
+# The collector of the running command, or None when metrics are off.
+_active: Optional['Metrics'] = None
+# Collectors installed by collecting() for the calling thread only, in place of _active.
+_local = threading.local()
+# Root handlers whose handle() is timed as the 'logging' phase.
+_timed_handlers: List[logging.Handler] = []
+
+
+class Metrics:
+    """
+    Wall and CPU time per named phase, plus integer counters.
+
+    CPU time is the process CPU time by default, so it includes every thread that
+    worked during the phase; pass ``cpu_clock=time.thread_time`` to only measure
+    the calling thread. Phases and counters may be recorded from any thread.
+    """
+
+    def __init__(self, command: Optional[str] = None, cpu_clock: Callable[[], float] = time.process_time):
+        self.command = command
+        self._cpu_clock = cpu_clock
+        self.phases: Dict[str, Dict[str, float]] = {}
+        self.counters: Dict[str, int] = {}
+        self.started = time.time()
+        self._wall = time.perf_counter()
+        self._cpu = cpu_clock()
+        self.wall: Optional[float] = None
+        self.cpu: Optional[float] = None
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def phase(self, name: str) -> Iterator[None]:
+        wall, cpu = time.perf_counter(), self._cpu_clock()
+        try:
+            yield
+        finally:
+            self.record(name, time.perf_counter() - wall, self._cpu_clock() - cpu)
+
+    def record(self, name: str, wall: float, cpu: Optional[float] = None):
+        """Add a measured duration to a phase. Phases entered several times accumulate."""
+        with self._lock:
+            phase = self.phases.setdefault(name, {'wall': 0.0, 'cpu': 0.0, 'calls': 0})
+            phase['wall'] += wall
+            if cpu is not None:
+                phase['cpu'] += cpu
+            phase['calls'] += 1
+
+    def count(self, name: str, value: int = 1):
+        with self._lock:
+            self.counters[name] = self.counters.get(name, 0) + value
+
+    def stop(self):
+        self.wall = time.perf_counter() - self._wall
+        self.cpu = self._cpu_clock() - self._cpu
+
+    def to_dict(self) -> Dict:
+        return {
+            'command': self.command,
+            'argv': sys.argv[1:],
+            'started': time.strftime('%Y-%m-%dT%H:%M:%S%z', time.localtime(self.started)),
+            'wall': self.wall,
+            'cpu': self.cpu,
+            'phases': self.phases,
+            'counters': dict(sorted(self.counters.items())),
+        }
+
+    def write(self, path: str):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.to_dict(), f, indent=2)
+            f.write('\n')
+
+
+def start(command: Optional[str] = None) -> Metrics:
+    """Start collecting metrics for the rest of the process, replacing any previous collector."""
+    global _active
+    _active = Metrics(command)
+    return _active
+
+
+def time_logging():
+    """
+    Time every record handled by the root logger's handlers as the 'logging' phase.
+
+    With a queue listener only the enqueueing is timed, which is what the threads
+    that log wait for. Undone by stop().
+    """
+    collector = _active
+    if collector is None:
+        return
+    for handler in logging.getLogger().handlers:
+        if handler in _timed_handlers:
+            continue
+
+        def handle(record, handler=handler):
+            with collector.phase('logging'):
+                return type(handler).handle(handler, record)
+
+        handler.handle = handle
+        _timed_handlers.append(handler)
+
+
+def stop() -> Optional[Metrics]:
+    """Stop collecting and return the collector, with its total wall and CPU time set."""
+    global _active
+    while _timed_handlers:
+        handler = _timed_handlers.pop()
+        handler.__dict__.pop('handle', None)
+    collector, _active = _active, None
+    if collector is not None:
+        collector.stop()
+    return collector
+
+
+def _current() -> Optional[Metrics]:
+    return getattr(_local, 'collector', None) or _active
+
+
+@contextmanager
+def collecting(collector: Metrics) -> Iterator[Metrics]:
+    """
+    Record the phases and counters of the calling thread into collector instead of the active one.
+
+    Used to measure one of several requests handled at the same time; work done by
+    other threads, including ones started inside the block, is not recorded in it.
+    """
+    previous = getattr(_local, 'collector', None)
+    _local.collector = collector
+    try:
+        yield collector
+    finally:
+        _local.collector = previous
+
+
+def enabled() -> bool:
+    return _current() is not None
+
+
+class _NoPhase:
+    def __enter__(self):
+        return None
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        return False
+
+
+_NO_PHASE = _NoPhase()
+
+
+def phase(name: str):
+    """Time a block as the named phase of the active collector; does nothing when metrics are off."""
+    collector = _current()
+    if collector is None:
+        return _NO_PHASE
+    return collector.phase(name)
+
+
+def record(name: str, wall: float, cpu: Optional[float] = None):
+    collector = _current()
+    if collector is not None:
+        collector.record(name, wall, cpu)
+
+
+def count(name: str, value: int = 1):
+    collector = _current()
+    if collector is not None:
+        collector.count(name, value)
@@ -0,0 +1,343 @@
+# Directory: project_initializer/
+# File: security.py
+
+"""Module for running the security checks of a project concurrently, caching their results."""
+
+import os
+import sys
+import glob
+import json
+import time
+import shutil
+import signal
+import asyncio
+import hashlib
+import logging
+from typing import Dict, Iterable, List, Optional, Sequence, TextIO
+from . import metrics
+from .build_cache import EXCLUDED_INPUT_DIRS
+from .config_loader import cache_root
+from .manifest import hash_file
+
+logger = logging.getLogger(__name__)
+
+CHECK_NAMES = ('bandit', 'safety', 'pip-audit')
+DEFAULT_TIMEOUT = 300.0
+# Results computed from an online advisory database go stale as advisories are published.
+DEFAULT_CACHE_TTL = 24 * 60 * 60.0
+_CACHE_FORMAT = 1
+_READ_SIZE = 64 * 1024
+
+
+def requirement_files(root: str) -> List[str]:
+    """Return the requirements*.txt files of root, sorted."""
+    return sorted(glob.glob(os.path.join(root, 'requirements*.txt')))
+
+
+def default_sources(root: str) -> List[str]:
+    """Return the top-level packages of root, or root itself when it has none."""
+    packages = [name for name in sorted(os.listdir(root))
+                if name not in EXCLUDED_INPUT_DIRS and os.path.isfile(os.path.join(root, name, '__init__.py'))]
+    return packages or ['.']
+
+
+def _files_under(root: str, paths: Iterable[str], suffix: str = '') -> List[str]:
+    files = []
+    for path in paths:
+        full_path = os.path.join(root, path)
+        if os.path.isfile(full_path):
+            files.append(full_path)
+            continue
+        for dirpath, dirnames, filenames in os.walk(full_path):
+            dirnames[:] = sorted(name for name in dirnames if name not in EXCLUDED_INPUT_DIRS)
+            files.extend(os.path.join(dirpath, name) for name in sorted(filenames) if name.endswith(suffix))
+    return files
+
+
+class SecurityCheck:
+    """
+    A scanner run as a subprocess, with the files its result depends on.
+
+    ``inputs`` are hashed into the cache key together with the command, so a
+    check is only run again when one of them, or the scanner itself, changes.
+    Checks that also depend on data outside their inputs, such as an online
+    advisory database, have a ``max_age`` in seconds after which their cached
+    result is not used. A check with a ``skip_reason`` is reported but never run.
+
+    Only a pass or a genuine finding is cached. ``finding_returncodes`` are the
+    exit codes with which the scanner reports findings; any other failure, such
+    as an advisory database that could not be fetched, runs the check again next
+    time. By default every non-zero exit code reports findings.
+    """
+
+    def __init__(self, name: str, argv: Sequence[str], inputs: Sequence[str] = (), cwd: str = '.',
+                 timeout: Optional[float] = DEFAULT_TIMEOUT, skip_reason: Optional[str] = None,
+                 max_age: Optional[float] = None, finding_returncodes: Optional[Sequence[int]] = None):
+        self.name = name
+        self.argv = list(argv)
+        self.inputs = list(inputs)
+        self.cwd = cwd
+        self.timeout = timeout
+        self.skip_reason = skip_reason
+        self.max_age = max_age
+        self.finding_returncodes = None if finding_returncodes is None else tuple(finding_returncodes)
+
+    def cacheable(self, returncode: int) -> bool:
+        """Tell whether a finished run is a result to reuse rather than an error of the scanner."""
+        return returncode == 0 or self.finding_returncodes is None or returncode in self.finding_returncodes
+
+    def fingerprint(self) -> Optional[str]:
+        """Return the cache key of the check, or None when its executable cannot be found."""
+        executable = shutil.which(self.argv[0])
+        if executable is None:
+            return None
+        st = os.stat(executable)
+        digest = hashlib.sha256(json.dumps([self.name, self.argv, executable, st.st_size,
+                                            st.st_mtime_ns]).encode('utf-8'))
+        for path in sorted(self.inputs):
+            relative = os.path.relpath(path, self.cwd).replace(os.sep, '/')
+            content = hash_file(path) if os.path.isfile(path) else 'missing'
+            digest.update(f"{relative}\0{content}\n".encode('utf-8'))
+        return digest.hexdigest()
+
+
+class CheckResult:
+    """The outcome of a check: passed, failed, timeout, missing (not installed) or skipped."""
+
+    __slots__ = ('name', 'status', 'returncode', 'elapsed', 'cached', 'reason')
+
+    def __init__(self, name: str, status: str, returncode: Optional[int] = None, elapsed: float = 0.0,
+                 cached: bool = False, reason: Optional[str] = None):
+        self.name = name
+        self.status = status
+        self.returncode = returncode
+        self.elapsed = elapsed
+        self.cached = cached
+        self.reason = reason
+
+    @property
+    def ok(self) -> bool:
+        return self.status in ('passed', 'skipped')
+
+
+def default_checks(root: str = '.', sources: Optional[Sequence[str]] = None, checks: Sequence[str] = CHECK_NAMES,
+                   timeouts: Optional[Dict[str, float]] = None, safety_db: Optional[str] = None,
+                   offline: bool = False, cache_ttl: float = DEFAULT_CACHE_TTL) -> List[SecurityCheck]:
+    """
+    Build the Bandit, Safety and pip-audit checks of the project in root.
+
+    Args:
+        root (str): Project directory; commands run in it.
+        sources (Optional[Sequence[str]]): Paths scanned by Bandit, the top-level packages by default.
+        checks (Sequence[str]): Names of the checks to run.
+        timeouts (Optional[Dict[str, float]]): Seconds per check name; the ``''`` key is the default.
+        safety_db (Optional[str]): Local Safety advisory database, used instead of fetching one.
+        offline (bool): Skip the checks that need the network: Safety without a local
+            database, and pip-audit, which has no offline mode.
+        cache_ttl (float): Seconds a cached result of a check using an online advisory
+            database is reused. Bandit and Safety with a local database are cached until
+            their inputs change.
+    """
+    root = os.path.abspath(root)
+    timeouts = timeouts or {}
+    sources = list(sources) if sources else default_sources(root)
+    requirements = requirement_files(root)
+    no_requirements = None if requirements else 'no requirements*.txt'
+    result = []
+    for name in checks:
+        timeout = timeouts.get(name, timeouts.get('', DEFAULT_TIMEOUT))
+        if name == 'bandit':
+            result.append(SecurityCheck(name, ['bandit', '-r'] + sources + ['-f', 'custom'],
+                                        _files_under(root, sources, '.py'), root, timeout,
+                                        finding_returncodes=[1]))
+        elif name == 'safety':
+            argv = ['safety', 'check']
+            for path in requirements:
+                argv += ['-r', os.path.relpath(path, root)]
+            inputs = list(requirements)
+            if safety_db:
+                argv += ['--db', safety_db]
+                inputs += _files_under(root, [safety_db])
+            skip_reason = no_requirements
+            if offline and not safety_db:
+                skip_reason = skip_reason or 'offline without a local advisory database (--safety-db)'
+            # Safety exits with 64 when it found vulnerabilities, and with other codes on errors.
+            result.append(SecurityCheck(name, argv, inputs, root, timeout, skip_reason,
+                                        None if safety_db else cache_ttl, finding_returncodes=[64]))
+        elif name == 'pip-audit':
+            argv = ['pip-audit', '--progress-spinner', 'off']
+            for path in requirements:
+                argv += ['-r', os.path.relpath(path, root)]
+            skip_reason = no_requirements or ('offline' if offline else None)
+            # pip-audit exits with 1 both on vulnerabilities and on errors, so only passes are cached.
+            result.append(SecurityCheck(name, argv, requirements, root, timeout, skip_reason, cache_ttl,
+                                        finding_returncodes=[]))
+        else:
+            raise ValueError(f"Unknown security check: {name}")
+    return result
+
+
+class SecurityRunner:
+    """
+    Runs checks concurrently as asyncio subprocesses.
+
+    Output lines are written to ``output`` as they arrive, prefixed with the name
+    of their check, and to a log file in the cache. A check whose cache key is
+    already in the cache is not run: its result and output are replayed. Checks
+    that time out are killed, with their process group on POSIX, and, like checks
+    that could not be started or failed without reporting findings, are never cached. Results older than the
+    ``max_age`` of their check are not replayed.
+    """
+
+    def __init__(self, checks: Sequence[SecurityCheck], output: Optional[TextIO] = None,
+                 cache_dir: Optional[str] = None, use_cache: bool = True):
+        self.checks = list(checks)
+        self.output = sys.stdout if output is None else output
+        self.cache_dir = cache_dir or os.path.join(cache_root(), 'security')
+        self.use_cache = use_cache
+        self.width = max((len(check.name) for check in self.checks), default=0)
+
+    def _emit(self, name: str, line: str):
+        self.output.write(f"{name:<{self.width}} | {line}\n")
+        self.output.flush()
+
+    def _entry_path(self, fingerprint: str) -> str:
+        return os.path.join(self.cache_dir, fingerprint[:2], fingerprint)
+
+    def _replay(self, check: SecurityCheck, fingerprint: str) -> Optional[CheckResult]:
+        entry = self._entry_path(fingerprint)
+        try:
+            with open(f"{entry}.json", 'r', encoding='utf-8') as f:
+                meta = json.load(f)
+            if meta.get('format') != _CACHE_FORMAT:
+                return None
+            if check.max_age is not None and time.time() - meta['created'] > check.max_age:
+                logger.info(f"{check.name}: cached result is older than {check.max_age:.0f}s, running again")
+                return None
+            with open(f"{entry}.log", 'r', encoding='utf-8', errors='replace') as f:
+                for line in f:
+                    self._emit(check.name, line.rstrip('\n'))
+        except (OSError, ValueError):
+            return None
+        return CheckResult(check.name, meta['status'], meta['returncode'], meta['elapsed'], cached=True)
+
+    async def _pump(self, name: str, stream: asyncio.StreamReader, log):
+        # Read in chunks rather than with readline, whose buffer limit a long line would overrun.
+        pending = b''
+        while True:
+            chunk = await stream.read(_READ_SIZE)
+            if not chunk:
+                break
+            lines = (pending + chunk).split(b'\n')
+            pending = lines.pop()
+            for line in lines:
+                text = line.decode('utf-8', errors='replace').rstrip('\r')
+                self._emit(name, text)
+                log.write(text + '\n')
+        if pending:
+            text = pending.decode('utf-8', errors='replace').rstrip('\r')
+            self._emit(name, text)
+            log.write(text + '\n')
+
+    async def _run(self, check: SecurityCheck) -> CheckResult:
+        if check.skip_reason:
+            self._emit(check.name, f"skipped: {check.skip_reason}")
+            return CheckResult(check.name, 'skipped', reason=check.skip_reason)
+        # Hashing reads every input file, so it stays off the event loop.
+        fingerprint = await asyncio.get_running_loop().run_in_executor(None, check.fingerprint)
+        if fingerprint is None:
+            self._emit(check.name, f"{check.argv[0]} is not installed")
+            return CheckResult(check.name, 'missing', reason=f"{check.argv[0]} not found")
+        if self.use_cache:
+            result = self._replay(check, fingerprint)
+            if result is not None:
+                logger.info(f"{check.name}: inputs unchanged, reusing the result of {result.elapsed:.1f}s")
+                return result
+
+        entry = self._entry_path(fingerprint)
+        os.makedirs(os.path.dirname(entry), exist_ok=True)
+        log_path = f"{entry}.{os.getpid()}.log.tmp"
+        start = time.perf_counter()
+        kwargs = {'start_new_session': True} if os.name == 'posix' else {}
+        try:
+            process = await asyncio.create_subprocess_exec(*check.argv, cwd=check.cwd, stdin=asyncio.subprocess.DEVNULL,
+                                                           stdout=asyncio.subprocess.PIPE,
+                                                           stderr=asyncio.subprocess.PIPE, **kwargs)
+        except OSError as e:
+            self._emit(check.name, f"cannot run {check.argv[0]}: {str(e)}")
+            return CheckResult(check.name, 'missing', reason=str(e))
+        timed_out = False
+        with open(log_path, 'w', encoding='utf-8') as log:
+            try:
+                await asyncio.wait_for(asyncio.gather(self._pump(check.name, process.stdout, log),
+                                                      self._pump(check.name, process.stderr, log),
+                                                      process.wait()), check.timeout)
+            except asyncio.TimeoutError:
+                timed_out = True
+                self._kill(process)
+                await process.wait()
+        elapsed = time.perf_counter() - start
+        if timed_out:
+            os.remove(log_path)
+            self._emit(check.name, f"timed out after {elapsed:.1f}s")
+            return CheckResult(check.name, 'timeout', process.returncode, elapsed,
+                               reason=f"no result within {check.timeout}s")
+        status = 'passed' if process.returncode == 0 else 'failed'
+        if check.cacheable(process.returncode):
+            self._store(entry, log_path, status, process.returncode, elapsed)
+        else:
+            os.remove(log_path)
+        return CheckResult(check.name, status, process.returncode, elapsed)
+
+    @staticmethod
+    def _kill(process):
+        try:
+            if os.name == 'posix':
+                # Scanners may have started children of their own holding the pipes open.
+                os.killpg(process.pid, signal.SIGKILL)
+            else:
+                process.kill()
+        except ProcessLookupError:
+            pass
+
+    def _store(self, entry: str, log_path: str, status: str, returncode: int, elapsed: float):
+        """Keep the result of a finished check. Failures only mean the check runs again next time."""
+        try:
+            os.replace(log_path, f"{entry}.log")
+            tmp_path = f"{entry}.{os.getpid()}.json.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'format': _CACHE_FORMAT, 'status': status, 'returncode': returncode,
+                           'elapsed': elapsed, 'created': time.time()}, f)
+            os.replace(tmp_path, f"{entry}.json")
+        except OSError as e:
+            logger.warning(f"Could not cache the security check result {entry}: {str(e)}")
+
+    async def _run_all(self) -> List[CheckResult]:
+        return list(await asyncio.gather(*(self._run(check) for check in self.checks)))
+
+    def run(self) -> List[CheckResult]:
+        """Run every check at once and return their results in the order of the checks."""
+        if sys.platform == 'win32' and sys.version_info < (3, 8):
+            # Subprocesses need the proactor loop, the default only since Python 3.8.
+            asyncio.set_event_loop_policy(asyncio.WindowsProactorEventLoopPolicy())
+        with metrics.phase('security'):
+            results = asyncio.run(self._run_all())
+        metrics.count('security_checks_run', sum(1 for result in results
+                                                 if not result.cached and result.status in ('passed', 'failed')))
+        metrics.count('security_checks_cached', sum(1 for result in results if result.cached))
+        return results
+
+
+def run_security_checks(root: str = '.', output: Optional[TextIO] = None, use_cache: bool = True,
+                        **options) -> List[CheckResult]:
+    """
+    Run the security checks of the project in root and return their results.
+
+    Args:
+        root (str): Project directory.
+        output (Optional[TextIO]): Where the prefixed output of the checks is streamed, stdout by default.
+        use_cache (bool): Replay the result of a check whose inputs did not change.
+        **options: Passed on to default_checks (sources, checks, timeouts, safety_db, offline).
+    """
+    runner = SecurityRunner(default_checks(root, **options), output, use_cache=use_cache)
+    return runner.run()
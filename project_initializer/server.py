@@ -0,0 +1,388 @@
+# Directory: project_initializer/
+# File: server.py
+
+"""Module for a long-running generator that serves generation requests over a local socket."""
+
+import os
+import hmac
+import json
+import time
+import socket
+import secrets
+import logging
+import threading
+import socketserver
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Optional, Tuple
+from . import metrics
+from .filesystem import OSFileSystem
+
+logger = logging.getLogger(__name__)
+
+# Requests accepted beyond the busy workers before new ones are turned away.
+DEFAULT_MAX_PENDING = 64
+# Suffix of the file, next to a Unix socket, holding the token clients must send.
+TOKEN_SUFFIX = '.token'
+MAX_REQUEST_BYTES = 1024 * 1024
+# Request keys and their types; config and output must be absolute paths.
+REQUEST_FIELDS = {
+    'config': str,
+    'output': str,
+    'template': str,
+    'variables': dict,
+    'precedence': str,
+    'staged': bool,
+}
+
+
+class RequestError(ValueError):
+    """A generation request that is malformed, as opposed to one that failed."""
+
+
+class GeneratorService:
+    """
+    Generates projects from requests, keeping parsed configurations and templates in memory.
+
+    A configuration is parsed again only when its size or mtime changes. Templates
+    are memoized by the template registry. Every request writes through its own
+    rooted OSFileSystem, so requests run concurrently without changing the current
+    directory, and each file is written by the request's thread.
+
+    A staged request replaces its output directory as a whole. Unless
+    ``replace_existing`` is set, it is refused when that directory already exists
+    and was not created by an earlier request to this service.
+    """
+
+    def __init__(self, replace_existing: bool = False):
+        self.started = time.time()
+        self.requests = 0
+        self.replace_existing = replace_existing
+        self._created = set()
+        self._configs: Dict[str, Tuple[int, int, Dict]] = {}
+        self._config_lock = threading.Lock()
+        self._lock = threading.Lock()
+
+    def load_config(self, config_path: str) -> Dict:
+        """Return the parsed configuration, from memory while the file is unchanged."""
+        from .config_loader import ConfigLoader
+
+        st = os.stat(config_path)
+        cached = self._configs.get(config_path)
+        if cached is not None and cached[:2] == (st.st_size, st.st_mtime_ns):
+            metrics.count('config_memory_hits')
+            return cached[2]
+        # Loads are serialized; the on-disk config cache is not written by two threads at once.
+        with self._config_lock:
+            data = ConfigLoader.load_config(config_path)
+            self._configs[config_path] = (st.st_size, st.st_mtime_ns, data)
+        return data
+
+    def preload(self, config_paths: Iterable[str] = (), templates: bool = True):
+        """Parse configurations and every template up front, so first requests are hot too."""
+        from .template_registry import default_registry
+
+        for config_path in config_paths:
+            self.load_config(os.path.abspath(config_path))
+        if templates:
+            registry = default_registry()
+            for name in registry.names():
+                registry.load(name)
+
+    @staticmethod
+    def validate(request: Dict) -> Dict:
+        """
+        Return the request with its defaults filled in.
+
+        Raises:
+            RequestError: If a key is unknown, has the wrong type or a path is relative.
+        """
+        from .merge import PRECEDENCES
+
+        if not isinstance(request, dict):
+            raise RequestError("A generation request must be a JSON object")
+        unknown = set(request) - set(REQUEST_FIELDS)
+        if unknown:
+            raise RequestError(f"Unknown request keys: {', '.join(sorted(unknown))}")
+        for key in ('config', 'output'):
+            if key not in request:
+                raise RequestError(f"Missing request key: {key}")
+        for key, value in request.items():
+            if not isinstance(value, REQUEST_FIELDS[key]):
+                raise RequestError(f"Request key {key} must be of type {REQUEST_FIELDS[key].__name__}")
+        for key in ('config', 'output'):
+            if not os.path.isabs(request[key]):
+                raise RequestError(f"Request key {key} must be an absolute path, got {request[key]}")
+        request = dict({'template': 'default', 'variables': {}, 'precedence': 'config', 'staged': False}, **request)
+        if request['precedence'] not in PRECEDENCES:
+            raise RequestError(f"Unknown precedence '{request['precedence']}'")
+        return request
+
+    def generate(self, request: Dict) -> Dict:
+        """
+        Generate one project and return its result, with the metrics of this request.
+
+        Raises:
+            RequestError: If the request is malformed or names an unknown template.
+        """
+        from .assets import assets_dir_for
+        from .core import generate_project_structure
+        from .staging import StagedOutput
+        from .template_registry import default_registry
+
+        request = self.validate(request)
+        if not os.path.isfile(request['config']):
+            raise RequestError(f"Configuration file not found: {request['config']}")
+        with self._lock:
+            self.requests += 1
+        collector = metrics.Metrics('serve', cpu_clock=time.thread_time)
+        if request['template'] not in default_registry():
+            raise RequestError(f"Unknown template '{request['template']}'")
+        # Counters recorded by the engine in this thread go to this request, not to the server's collector.
+        with metrics.collecting(collector):
+            with collector.phase('load_template'):
+                template_config = default_registry().load(request['template'])
+            with collector.phase('load_config'):
+                config_data = self.load_config(request['config'])
+
+            output = os.path.normpath(request['output'])
+            existed = os.path.lexists(output)
+            if request['staged'] and existed and not self.replace_existing:
+                with self._lock:
+                    created = output in self._created
+                if not created:
+                    raise RequestError(f"Refusing to replace {output}, which was not created by this server")
+            options = {'variables': request['variables'], 'precedence': request['precedence'],
+                       'assets_dir': assets_dir_for(request['config'], config_data)}
+            with collector.phase('generate'):
+                if request['staged']:
+                    with StagedOutput(output, logger) as staging_dir:
+                        summary = generate_project_structure(config_data, template_config,
+                                                             backend=OSFileSystem(staging_dir), **options)
+                        if summary['errors']:
+                            raise RuntimeError(f"{summary['errors']} files could not be written, {output} was not changed")
+                else:
+                    os.makedirs(output, exist_ok=True)
+                    summary = generate_project_structure(config_data, template_config, backend=OSFileSystem(output),
+                                                         **options)
+            if not existed:
+                with self._lock:
+                    self._created.add(output)
+        collector.stop()
+        return {
+            'ok': not summary['errors'],
+            'output': output,
+            'summary': summary,
+            'metrics': {'wall': collector.wall, 'cpu': collector.cpu, 'phases': collector.phases,
+                        'counters': collector.counters},
+        }
+
+    def health(self) -> Dict:
+        from .template_registry import default_registry
+
+        return {
+            'ok': True,
+            'pid': os.getpid(),
+            'uptime': time.time() - self.started,
+            'requests': self.requests,
+            'configs': len(self._configs),
+            'templates': default_registry().names(),
+        }
+
+
+class GeneratorRequestHandler(BaseHTTPRequestHandler):
+    """
+    HTTP/JSON interface of a GeneratorService.
+
+    ``GET /health`` reports the state of the server. ``POST /generate`` takes a
+    request object and answers with the result of the generation. It must be sent
+    as ``application/json`` with the server's token as ``Authorization: Bearer``,
+    so that web pages, which can only send simple cross-origin requests without
+    reading the token, cannot generate anything.
+    """
+
+    server_version = 'project-initializer'
+
+    def do_GET(self):
+        if self.path == '/health':
+            self._send_json(200, self.server.service.health())
+        else:
+            self._send_json(404, {'ok': False, 'error': f"Unknown path {self.path}"})
+
+    def do_POST(self):
+        if self.path != '/generate':
+            self._send_json(404, {'ok': False, 'error': f"Unknown path {self.path}"})
+            return
+        try:
+            length = int(self.headers.get('Content-Length', 0))
+            if length > MAX_REQUEST_BYTES:
+                raise RequestError(f"Request body is larger than {MAX_REQUEST_BYTES} bytes")
+            # Read before answering, so that a rejected client is not cut off while still sending.
+            body = self.rfile.read(length)
+            if self.headers.get_content_type() != 'application/json':
+                self._send_json(415, {'ok': False, 'error': "Requests must be sent as application/json"})
+                return
+            if not hmac.compare_digest(self.headers.get('Authorization', '').encode('utf-8'),
+                                       f"Bearer {self.server.token}".encode('utf-8')):
+                self._send_json(401, {'ok': False, 'error': "Missing or invalid token"})
+                return
+            request = json.loads(body or b'null')
+            result = self.server.service.generate(request)
+        except (RequestError, ValueError) as e:
+            # Also covers invalid JSON and Content-Length.
+            self._send_json(400, {'ok': False, 'error': str(e)})
+        except Exception as e:
+            logger.error(f"Generation request failed: {str(e)}", exc_info=True)
+            self._send_json(500, {'ok': False, 'error': f"{type(e).__name__}: {str(e)}"})
+        else:
+            self._send_json(200, result)
+
+    def _send_json(self, status: int, body: Dict):
+        data = json.dumps(body).encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        # client_address is empty on Unix sockets, so the default format does not apply.
+        logger.debug("%s %s", self.requestline, format % args)
+
+
+class _PooledServerMixIn:
+    """Handles connections on a fixed number of threads, turning requests away once too many are waiting."""
+
+    service: GeneratorService
+    token: str
+
+    def start_pool(self, workers: int, max_pending: int = DEFAULT_MAX_PENDING):
+        self.workers = workers
+        self._pool = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='project-initializer-serve')
+        self._slots = threading.BoundedSemaphore(workers + max_pending)
+
+    def process_request(self, request, client_address):
+        if not self._slots.acquire(blocking=False):
+            self._reject(request)
+            return
+        self._pool.submit(self._process, request, client_address)
+
+    def _process(self, request, client_address):
+        try:
+            self.finish_request(request, client_address)
+        except Exception:
+            self.handle_error(request, client_address)
+        finally:
+            self.shutdown_request(request)
+            self._slots.release()
+
+    def _reject(self, request):
+        body = b'{"ok": false, "error": "Server is busy"}'
+        try:
+            request.sendall(b"HTTP/1.0 503 Service Unavailable\r\nContent-Type: application/json\r\n"
+                            b"Content-Length: " + str(len(body)).encode('ascii') + b"\r\n\r\n" + body)
+        except OSError:
+            pass
+        self.shutdown_request(request)
+
+    def handle_error(self, request, client_address):
+        logger.error("Error handling a generation request", exc_info=True)
+
+    def server_close(self):
+        super().server_close()
+        self._pool.shutdown(wait=True)
+
+
+class UnixGeneratorServer(_PooledServerMixIn, socketserver.UnixStreamServer):
+    """
+    Serves a GeneratorService on a Unix socket only the current user can connect to.
+
+    The token is written next to the socket, readable by the current user only.
+    """
+
+    def __init__(self, socket_path: str, service: GeneratorService, request_queue_size: int = 5,
+                 token: Optional[str] = None):
+        self.service = service
+        self.socket_path = socket_path
+        self.token_path = socket_path + TOKEN_SUFFIX
+        self.token = token or secrets.token_urlsafe(32)
+        self.request_queue_size = request_queue_size
+        if os.path.exists(socket_path):
+            _remove_stale_socket(socket_path)
+        previous_umask = os.umask(0o177)
+        try:
+            super().__init__(socket_path, GeneratorRequestHandler)
+            with open(self.token_path, 'w', encoding='utf-8') as f:
+                f.write(self.token)
+        finally:
+            os.umask(previous_umask)
+
+    def server_close(self):
+        super().server_close()
+        for path in (self.socket_path, self.token_path):
+            try:
+                os.remove(path)
+            except OSError:
+                pass
+
+
+class TCPGeneratorServer(_PooledServerMixIn, HTTPServer):
+    """Serves a GeneratorService over HTTP, on localhost by default."""
+
+    def __init__(self, host: str, port: int, service: GeneratorService, request_queue_size: int = 5,
+                 token: Optional[str] = None):
+        self.service = service
+        self.token = token or secrets.token_urlsafe(32)
+        self.request_queue_size = request_queue_size
+        super().__init__((host, port), GeneratorRequestHandler)
+
+
+def _remove_stale_socket(socket_path: str):
+    # Refuse to take over a socket another server still answers on.
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.connect(socket_path)
+    except OSError:
+        os.remove(socket_path)
+    else:
+        raise OSError(f"A server is already listening on {socket_path}")
+    finally:
+        probe.close()
+
+
+def make_server(socket_path: Optional[str] = None, host: str = '127.0.0.1', port: Optional[int] = None,
+                workers: Optional[int] = None, max_pending: int = DEFAULT_MAX_PENDING,
+                service: Optional[GeneratorService] = None, token: Optional[str] = None):
+    """
+    Create a server for a GeneratorService, listening on socket_path or on host:port.
+
+    Args:
+        socket_path (Optional[str]): Unix socket to listen on.
+        host (str): Interface to listen on when serving HTTP over TCP.
+        port (Optional[int]): TCP port, 0 for any free port. Used when socket_path is None.
+        workers (Optional[int]): Number of requests handled at the same time. Defaults to the CPU count.
+        max_pending (int): Connections waiting for a worker before new ones get a 503 answer.
+        service (Optional[GeneratorService]): The service to serve, a new one by default.
+        token (Optional[str]): Token clients must send with generation requests, a random one by default.
+    """
+    service = service or GeneratorService()
+    workers = workers or os.cpu_count() or 1
+    # The listen backlog must hold every connection the pool admits, or a burst of clients
+    # is refused by the kernel before the server can queue or turn them away.
+    backlog = workers + max_pending + 1
+    if socket_path is not None:
+        server = UnixGeneratorServer(socket_path, service, backlog, token)
+    elif port is not None:
+        server = TCPGeneratorServer(host, port, service, backlog, token)
+    else:
+        raise ValueError("Either a socket path or a port is required")
+    server.start_pool(workers, max_pending)
+    return server
+
+
+def server_address(server) -> str:
+    """Return the address clients connect to, as accepted by GeneratorClient."""
+    if isinstance(server, UnixGeneratorServer):
+        return server.socket_path
+    host, port = server.server_address[:2]
+    return f"http://{host}:{port}"
@@ -0,0 +1,281 @@
+# Directory: project_initializer/
+# File: snapshot.py
+
+"""Module for capturing an existing directory tree as a configuration file."""
+
+import os
+import re
+import logging
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, TextIO, Tuple
+from . import metrics
+from .ignore import DEFAULT_EXCLUDES, GITIGNORE, IgnoreMatcher
+
+logger = logging.getLogger(__name__)
+
+# Larger files are referenced with ``source:`` instead of being inlined.
+DEFAULT_MAX_INLINE_SIZE = 64 * 1024
+# Only the start of a file is looked at to tell binaries apart.
+SNIFF_BYTES = 8 * 1024
+# File reads in flight ahead of the writer, bounding memory to about this many inline bodies.
+DEFAULT_MAX_PENDING = 256
+
+# Text a literal block scalar reproduces exactly: printable, and no line breaks other than \n.
+_LITERAL_SAFE = re.compile('[\t\n\x20-\x7e\xa0-\u2027\u202a-\ud7ff\ue000-\ufffd\U00010000-\U0010ffff]*')
+_BLOCK_INDENT = ' ' * 6
+
+
+class SnapshotEntry:
+    """A file of the captured tree: inline text, a source reference, or skipped with a reason."""
+
+    __slots__ = ('path', 'content', 'source', 'size', 'skipped')
+
+    def __init__(self, path: str, size: int, content: Optional[str] = None, source: Optional[str] = None,
+                 skipped: Optional[str] = None):
+        self.path = path
+        self.size = size
+        self.content = content
+        self.source = source
+        self.skipped = skipped
+
+
+def quote(value: str) -> str:
+    """Return value as a YAML scalar that is always read back as the same string."""
+    if _LITERAL_SAFE.fullmatch(value) and '\n' not in value and '\t' not in value:
+        return "'" + value.replace("'", "''") + "'"
+    import yaml
+
+    return yaml.safe_dump(value, default_style='"', width=float('inf'), allow_unicode=True).rstrip('\n')
+
+
+def content_scalar(content: str) -> str:
+    """Return the YAML of a file body, as a literal block wherever that is exact."""
+    if not content:
+        return "''"
+    if not _LITERAL_SAFE.fullmatch(content):
+        return quote(content)
+    if not content.endswith('\n'):
+        header = '|2-'
+    elif content.endswith('\n\n'):
+        header = '|2+'
+    else:
+        header = '|2'
+    lines = content[:-1].split('\n') if content.endswith('\n') else content.split('\n')
+    body = '\n'.join(_BLOCK_INDENT + line if line else '' for line in lines)
+    return f"{header}\n{body}"
+
+
+def escape_placeholders(text: str) -> str:
+    """Escape ${name} so that the text is written out as is when variables are substituted."""
+    return text.replace('${', '$${') if '${' in text else text
+
+
+def sniff(data: bytes) -> bool:
+    """Tell whether data looks like the start of a binary file."""
+    return b'\0' in data[:SNIFF_BYTES]
+
+
+class Snapshot:
+    """
+    Captures a directory tree as a configuration with ``directories`` and ``files``.
+
+    Directories are listed with ``os.scandir`` on a thread pool, ahead of the
+    depth-first walk that consumes them in sorted order, and pruned when ignored
+    as in the tree command. Files are read on the same pool, at most
+    ``max_pending`` ahead of the writer. Text files up to ``max_inline_size`` are
+    inlined. Binaries, detected by a NUL byte in their first bytes or invalid
+    UTF-8, and larger files become ``source:`` references to the captured tree,
+    which the configuration names as its ``assets`` directory. Files above
+    ``max_file_size`` are left out, as are symlinks and special files.
+    """
+
+    def __init__(self, root: str, excludes: Iterable[str] = DEFAULT_EXCLUDES, gitignore: bool = True,
+                 jobs: Optional[int] = None, max_inline_size: int = DEFAULT_MAX_INLINE_SIZE,
+                 max_file_size: Optional[int] = None, sources: bool = True, max_pending: int = DEFAULT_MAX_PENDING,
+                 skip_paths: Sequence[str] = ()):
+        self.root = os.path.abspath(root)
+        self.gitignore = gitignore
+        self.jobs = jobs
+        self.max_inline_size = max_inline_size
+        self.max_file_size = max_file_size
+        self.sources = sources
+        self.max_pending = max_pending
+        # Absolute paths never captured, such as the configuration being written into the tree.
+        self.skip_paths = {os.path.abspath(path) for path in skip_paths}
+        self.matcher = IgnoreMatcher.for_root(self.root, excludes, gitignore)
+        self.stats = {'directories': 0, 'inline': 0, 'sources': 0, 'skipped': 0, 'ignored': 0, 'inline_bytes': 0}
+
+    def _list(self, path: str) -> Tuple[List[str], List[Tuple[str, int]], Optional[List[str]]]:
+        """Return the subdirectories, regular files with their sizes, and .gitignore lines of a directory."""
+        directories = []
+        files = []
+        gitignore = None
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.name)
+                elif entry.is_file(follow_symlinks=False):
+                    files.append((entry.name, entry.stat(follow_symlinks=False).st_size))
+                else:
+                    logger.debug("Skipping %s, which is not a regular file", entry.path)
+        if self.gitignore and any(name == GITIGNORE for name, _ in files):
+            try:
+                with open(os.path.join(path, GITIGNORE), 'r', encoding='utf-8', errors='replace') as f:
+                    gitignore = f.read().splitlines()
+            except OSError:
+                pass
+        directories.sort()
+        files.sort()
+        return directories, files, gitignore
+
+    def _read(self, relpath: str, size: int) -> SnapshotEntry:
+        if self.max_file_size is not None and size > self.max_file_size:
+            return SnapshotEntry(relpath, size, skipped=f"larger than {self.max_file_size} bytes")
+        if size > self.max_inline_size:
+            return self._source(relpath, size, f"larger than {self.max_inline_size} bytes")
+        try:
+            with open(os.path.join(self.root, relpath), 'rb') as f:
+                data = f.read(self.max_inline_size + 1)
+        except OSError as e:
+            return SnapshotEntry(relpath, size, skipped=str(e))
+        if len(data) > self.max_inline_size:
+            # The file grew since it was listed.
+            return self._source(relpath, len(data), f"larger than {self.max_inline_size} bytes")
+        if sniff(data):
+            return self._source(relpath, len(data), 'binary')
+        try:
+            return SnapshotEntry(relpath, len(data), content=data.decode('utf-8'))
+        except UnicodeDecodeError:
+            return self._source(relpath, len(data), 'not UTF-8')
+
+    def _source(self, relpath: str, size: int, reason: str) -> SnapshotEntry:
+        if not self.sources:
+            return SnapshotEntry(relpath, size, skipped=reason)
+        return SnapshotEntry(relpath, size, source=relpath)
+
+    def _walk(self, executor: ThreadPoolExecutor, directories: List[str]) -> Iterator[Tuple[str, int]]:
+        """Yield the path and size of every file to capture in depth-first order, collecting directories."""
+        stack: List[Tuple[str, Future, IgnoreMatcher]] = [('', executor.submit(self._list, self.root), self.matcher)]
+        while stack:
+            relpath, listing, matcher = stack.pop()
+            try:
+                subdirectories, files, gitignore = listing.result()
+            except OSError as e:
+                logger.warning(f"Cannot read directory {os.path.join(self.root, relpath)}: {str(e)}")
+                continue
+            if relpath:
+                directories.append(relpath)
+                self.stats['directories'] += 1
+                if gitignore:
+                    matcher = matcher.with_patterns(gitignore, relpath)
+            prefix = f"{relpath}/" if relpath else ''
+            for name, size in files:
+                path = prefix + name
+                if matcher.ignored(path, False) or os.path.join(self.root, path) in self.skip_paths:
+                    self.stats['ignored'] += 1
+                    continue
+                yield path, size
+            children = []
+            for name in subdirectories:
+                path = prefix + name
+                if matcher.ignored(path, True):
+                    self.stats['ignored'] += 1
+                    continue
+                # Listed ahead on the pool while the files before them are read and written.
+                children.append((path, executor.submit(self._list, os.path.join(self.root, path)), matcher))
+            stack.extend(reversed(children))
+
+    def entries(self, directories: List[str]) -> Iterator[SnapshotEntry]:
+        """
+        Yield every captured file in depth-first order, appending each directory to directories.
+        """
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            pending = deque()
+            for path, size in self._walk(executor, directories):
+                if len(pending) >= self.max_pending:
+                    yield pending.popleft().result()
+                pending.append(executor.submit(self._read, path, size))
+            while pending:
+                yield pending.popleft().result()
+
+    def write(self, output: TextIO, assets: Optional[str] = None) -> Dict[str, int]:
+        """
+        Stream the configuration to output and return the counts of what was captured.
+
+        Args:
+            output (TextIO): Where the YAML is written.
+            assets (Optional[str]): The ``assets`` key, i.e. the captured tree relative to the
+                directory of the configuration. Written whenever a file is a source reference.
+        """
+        output.write(f"# Captured from {self.root} by project-initializer snapshot\n")
+        # Placeholders are escaped, so the captured text survives any --var given to init.
+        output.write(f"variables:\n  project_name: {quote(os.path.basename(self.root))}\n")
+        if self.sources:
+            output.write(f"assets: {quote(assets or self.root)}\n")
+        directories: List[str] = []
+        wrote_files = False
+        with metrics.phase('snapshot'):
+            for entry in self.entries(directories):
+                if entry.skipped is not None:
+                    self.stats['skipped'] += 1
+                    logger.info(f"Skipping {entry.path}: {entry.skipped}")
+                    continue
+                if not wrote_files:
+                    output.write("files:\n")
+                    wrote_files = True
+                output.write(f"  - path: {quote(escape_placeholders(entry.path))}\n")
+                if entry.source is not None:
+                    self.stats['sources'] += 1
+                    output.write(f"    source: {quote(escape_placeholders(entry.source))}\n")
+                else:
+                    self.stats['inline'] += 1
+                    self.stats['inline_bytes'] += entry.size
+                    output.write(f"    content: {content_scalar(escape_placeholders(entry.content))}\n")
+        if not wrote_files:
+            output.write("files: []\n")
+        # Files come first so that they are streamed; directories are only paths.
+        if directories:
+            output.write("directories:\n")
+            for directory in directories:
+                output.write(f"  - {quote(escape_placeholders(directory))}\n")
+        else:
+            output.write("directories: []\n")
+        for name in ('directories', 'inline', 'sources', 'skipped', 'ignored'):
+            metrics.count(f"snapshot_{name}", self.stats[name])
+        return self.stats
+
+
+def snapshot_tree(root: str, output_path: str, **options) -> Dict[str, int]:
+    """
+    Capture root into the configuration file output_path, streamed into a temporary file renamed over it.
+
+    Args:
+        root (str): Directory to capture.
+        output_path (str): Configuration file to write. Sources are written relative to it.
+        **options: Passed on to Snapshot (excludes, gitignore, jobs, max_inline_size,
+            max_file_size, sources).
+
+    Returns:
+        Dict[str, int]: The numbers of directories, inline files, source references, skipped
+            and ignored entries, and the bytes inlined.
+    """
+    output_path = os.path.abspath(output_path)
+    directory = os.path.dirname(output_path)
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(output_path)}.{os.getpid()}.tmp")
+    snapshot = Snapshot(root, skip_paths=[output_path, tmp_path], **options)
+    assets = os.path.relpath(snapshot.root, directory)
+    try:
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            stats = snapshot.write(f, assets)
+        os.replace(tmp_path, output_path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        raise
+    logger.info(f"Captured {stats['directories']} directories, {stats['inline']} inline files and "
+                f"{stats['sources']} source files of {root} into {output_path}")
+    return stats
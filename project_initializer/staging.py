@@ -0,0 +1,140 @@
+# Directory: project_initializer/
+# File: staging.py
+
+"""Module for generating a tree in a staging directory and publishing it with one atomic rename."""
+
+import os
+import sys
+import shutil
+import uuid
+import logging
+from typing import Optional
+
+_AT_FDCWD = -100
+_RENAME_EXCHANGE = 2
+
+
+def exchange_paths(first: str, second: str) -> bool:
+    """
+    Atomically swap two paths with renameat2(RENAME_EXCHANGE).
+
+    Returns:
+        bool: False when the platform, the C library or the filesystem does not support it.
+
+    Raises:
+        OSError: If the exchange is supported but failed.
+    """
+    if not sys.platform.startswith('linux'):
+        return False
+    import ctypes
+    import errno
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    renameat2 = getattr(libc, 'renameat2', None)
+    if renameat2 is None:
+        return False
+    result = renameat2(_AT_FDCWD, os.fsencode(first), _AT_FDCWD, os.fsencode(second), _RENAME_EXCHANGE)
+    if result == 0:
+        return True
+    error = ctypes.get_errno()
+    if error in (errno.ENOSYS, errno.EINVAL, errno.ENOTSUP):
+        return False
+    raise OSError(error, os.strerror(error), first)
+
+
+def _sibling_path(target: str, kind: str) -> str:
+    parent, name = os.path.split(target)
+    return os.path.join(parent, f".{name}.{kind}-{os.getpid()}-{uuid.uuid4().hex[:8]}")
+
+
+def _sync_directory(path: str):
+    # Makes the rename itself durable; the files were written without any fsync.
+    if not hasattr(os, 'O_DIRECTORY'):
+        return
+    try:
+        fd = os.open(path, os.O_RDONLY | os.O_DIRECTORY)
+    except OSError:
+        return
+    try:
+        os.fsync(fd)
+    except OSError:
+        pass
+    finally:
+        os.close(fd)
+
+
+class StagedOutput:
+    """
+    A staging directory next to target that replaces target when the block succeeds.
+
+    The staging directory is created in the parent of target, so it is on the same
+    filesystem and can be published with a rename. A missing target is created by a
+    single ``rename``. An existing target is swapped with ``renameat2`` exchange where
+    available, or moved aside and replaced by two renames otherwise; the previous
+    tree is then deleted. If the block raises, the staging directory is deleted and
+    target is left untouched::
+
+        with StagedOutput('out') as staging_dir:
+            generate_into(staging_dir)
+    """
+
+    def __init__(self, target: str, logger: Optional[logging.Logger] = None):
+        self.target = os.path.abspath(target)
+        self.logger = logger or logging.getLogger(__name__)
+        self.path: Optional[str] = None
+
+    def __enter__(self) -> str:
+        if os.path.exists(self.target) and not os.path.isdir(self.target):
+            raise NotADirectoryError(f"Output path is not a directory: {self.target}")
+        cwd = os.path.abspath(os.getcwd())
+        if cwd == self.target or cwd.startswith(self.target + os.sep):
+            raise ValueError(f"Staged output cannot replace the current working directory: {self.target}")
+        os.makedirs(os.path.dirname(self.target), exist_ok=True)
+        self.path = _sibling_path(self.target, 'staging')
+        # Created like any directory, so the published tree gets the usual permissions.
+        os.mkdir(self.path)
+        if os.path.isdir(self.target):
+            shutil.copymode(self.target, self.path)
+        self.logger.debug("Staging output for %s in %s", self.target, self.path)
+        return self.path
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is not None:
+            self.rollback()
+            return False
+        try:
+            self.commit()
+        except BaseException:
+            self.rollback()
+            raise
+        return False
+
+    def commit(self):
+        """Publish the staging directory as target."""
+        parent = os.path.dirname(self.target)
+        if not os.path.exists(self.target):
+            os.rename(self.path, self.target)
+            self.logger.info(f"Published {self.target}")
+        elif exchange_paths(self.path, self.target):
+            # The staging path now holds the previous tree.
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.logger.info(f"Published {self.target}, replacing the previous tree")
+        else:
+            previous = _sibling_path(self.target, 'previous')
+            os.rename(self.target, previous)
+            try:
+                os.rename(self.path, self.target)
+            except OSError:
+                os.rename(previous, self.target)
+                raise
+            shutil.rmtree(previous, ignore_errors=True)
+            self.logger.info(f"Published {self.target}, replacing the previous tree")
+        self.path = None
+        _sync_directory(parent)
+
+    def rollback(self):
+        """Delete the staging directory, leaving target as it was."""
+        if self.path is not None:
+            self.logger.info(f"Discarding staged output {self.path}")
+            shutil.rmtree(self.path, ignore_errors=True)
+            self.path = None
@@ -0,0 +1,153 @@
+# Directory: project_initializer/
+# File: template_engine.py
+
+"""Module for substituting ${variable} placeholders in generated paths and file contents."""
+
+import re
+import logging
+from functools import lru_cache
+from typing import Dict, Iterable, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# ${name} is a placeholder, $${name} is written out literally as ${name}.
+PLACEHOLDER_PATTERN = re.compile(r'\$(\$)?\{([A-Za-z_][A-Za-z0-9_.-]*)\}')
+
+# Number of compiled bodies kept in memory, shared by every run of the process.
+COMPILE_CACHE_SIZE = 4096
+# Larger bodies are compiled on every use rather than pinned in the cache.
+MAX_CACHED_TEXT_SIZE = 64 * 1024
+
+
+class UndefinedVariablesError(ValueError):
+    """Raised when placeholders reference variables that were never defined."""
+
+    def __init__(self, names: Iterable[str]):
+        self.names = sorted(names)
+        super().__init__(f"Undefined template variables: {', '.join(self.names)}")
+
+
+class CompiledTemplate:
+    """
+    A text split once into literal and variable segments.
+
+    ``literals`` always holds one more item than ``names``; rendering
+    interleaves them, so a body is rendered in a single join.
+    """
+
+    __slots__ = ('literals', 'names')
+
+    def __init__(self, text: str):
+        self.literals: List[str] = []
+        self.names: List[str] = []
+        pending = []
+        position = 0
+        for match in PLACEHOLDER_PATTERN.finditer(text):
+            pending.append(text[position:match.start()])
+            position = match.end()
+            if match.group(1):
+                pending.append(match.group(0)[1:])
+                continue
+            self.literals.append(''.join(pending))
+            self.names.append(match.group(2))
+            pending = []
+        pending.append(text[position:])
+        self.literals.append(''.join(pending))
+
+    def render(self, variables: Dict[str, str], keep_undefined: bool = False) -> str:
+        if not self.names:
+            return self.literals[0]
+        parts = [self.literals[0]]
+        for name, literal in zip(self.names, self.literals[1:]):
+            if keep_undefined and name not in variables:
+                parts.append(f"${{{name}}}")
+            else:
+                parts.append(variables[name])
+            parts.append(literal)
+        return ''.join(parts)
+
+
+@lru_cache(maxsize=COMPILE_CACHE_SIZE)
+def _compile_cached(text: str) -> CompiledTemplate:
+    return CompiledTemplate(text)
+
+
+def compile_template(text: str) -> CompiledTemplate:
+    """Compile a text, reusing the compiled form of identical small texts."""
+    if len(text) > MAX_CACHED_TEXT_SIZE:
+        return CompiledTemplate(text)
+    return _compile_cached(text)
+
+
+class TemplateEngine:
+    """
+    Renders directory paths and file entries with a fixed set of variables.
+
+    A strict engine refuses placeholders without a value; otherwise they are
+    written out unchanged.
+    """
+
+    def __init__(self, variables: Optional[Dict[str, object]] = None, strict: bool = True):
+        self.variables = {str(name): str(value) for name, value in (variables or {}).items()}
+        self.strict = strict
+
+    @classmethod
+    def from_config(cls, config_data: Dict, overrides: Optional[Dict[str, str]] = None) -> 'TemplateEngine':
+        """
+        Collect variables from a configuration and command line overrides.
+
+        The configuration provides a ``variables`` mapping and, for compatibility
+        with older configurations, ``project_name``. Overrides win over both.
+        Only a ``variables`` mapping or overrides make the engine strict, so a
+        configuration setting just ``project_name`` keeps other placeholders,
+        such as ``${HOME}`` in a shell script, as they are.
+        """
+        variables = {}
+        if config_data.get('project_name') is not None:
+            variables['project_name'] = config_data['project_name']
+        variables.update(config_data.get('variables') or {})
+        variables.update(overrides or {})
+        return cls(variables, strict='variables' in config_data or bool(overrides))
+
+    @property
+    def enabled(self) -> bool:
+        """Substitution only happens when at least one variable is defined."""
+        return bool(self.variables)
+
+    @staticmethod
+    def placeholders(directories: Iterable[str] = (), files: Iterable[Dict] = ()) -> Set[str]:
+        """Return every variable name used by the given entries."""
+        names = set()
+        for directory in directories:
+            names.update(compile_template(directory).names)
+        for file in files:
+            names.update(compile_template(file.get('path') or '').names)
+            names.update(compile_template(file.get('content') or '').names)
+            names.update(compile_template(file.get('source') or '').names)
+        return names
+
+    def undefined(self, directories: Iterable[str] = (), files: Iterable[Dict] = ()) -> Set[str]:
+        """Return the names used by the given entries that have no value."""
+        return self.placeholders(directories, files).difference(self.variables)
+
+    def check(self, directories: Iterable[str] = (), files: Iterable[Dict] = (), names: Iterable[str] = ()):
+        """Raise UndefinedVariablesError if any entry, or any of the given names, is undefined."""
+        if not self.strict:
+            return
+        missing = self.undefined(directories, files).union(set(names).difference(self.variables))
+        if missing:
+            raise UndefinedVariablesError(missing)
+
+    def render(self, text: str, keep_undefined: bool = False) -> str:
+        return compile_template(text).render(self.variables, keep_undefined or not self.strict)
+
+    def render_file(self, file: Dict) -> Dict:
+        """Return a copy of a file entry with its path, content and source rendered."""
+        rendered = dict(file)
+        if file.get('path'):
+            rendered['path'] = self.render(file['path'])
+        if file.get('content'):
+            rendered['content'] = self.render(file['content'])
+        if file.get('source'):
+            rendered['source'] = self.render(file['source'])
+        return rendered
@@ -0,0 +1,265 @@
+# Directory: project_initializer/
+# File: template_registry.py
+
+"""Module for discovering, indexing and loading project templates."""
+
+import os
+import re
+import sys
+import json
+import hashlib
+import logging
+import functools
+import threading
+from typing import Dict, List, NamedTuple, Optional, Sequence, Tuple
+from .assets import resolve_source
+from .config_loader import ConfigLoader, cache_root
+
+logger = logging.getLogger(__name__)
+
+# Directories searched for templates, separated like PATH; earlier ones win.
+TEMPLATE_PATH_ENV = 'PROJECT_INITIALIZER_TEMPLATE_PATH'
+# Entry point group of installed template packages.
+ENTRY_POINT_GROUP = 'project_initializer.templates'
+BUILTIN_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'templates')
+DEFAULT_TEMPLATE = 'default'
+TEMPLATE_SUFFIXES = ('.yaml', '.yml')
+
+_INDEX_FORMAT = 1
+# Read from the raw file, so indexing never parses YAML.
+_VERSION_PATTERN = re.compile(rb'^version:[ \t]*["\']?([^"\'\s#]+)', re.MULTILINE)
+
+
+class TemplateInfo(NamedTuple):
+    """An entry of the template index."""
+    name: str
+    version: str
+    hash: str
+    size: int
+    # 'builtin', 'directory' or 'entry_point'
+    source: str
+    # The template file, or the 'module:attribute' of an entry point
+    location: str
+
+
+def template_path() -> List[str]:
+    """Return the template directories listed in PROJECT_INITIALIZER_TEMPLATE_PATH."""
+    value = os.environ.get(TEMPLATE_PATH_ENV, '')
+    return [os.path.expanduser(directory) for directory in value.split(os.pathsep) if directory]
+
+
+def default_index_path() -> str:
+    return os.path.join(cache_root(), 'templates.json')
+
+
+def _template_entry_points() -> list:
+    try:
+        from importlib.metadata import entry_points
+    except ImportError:
+        # Python 3.7 only has the backport, if it is installed at all.
+        try:
+            from importlib_metadata import entry_points
+        except ImportError:
+            return []
+    found = entry_points()
+    if hasattr(found, 'select'):
+        return list(found.select(group=ENTRY_POINT_GROUP))
+    return list(found.get(ENTRY_POINT_GROUP, []))
+
+
+def _site_state() -> List[List]:
+    # Installing, upgrading or removing a distribution changes the mtime of its sys.path entry.
+    state = []
+    for path in sys.path:
+        try:
+            state.append([path, os.stat(path or '.').st_mtime_ns])
+        except OSError:
+            continue
+    return state
+
+
+def _normalize(name: str, data) -> Dict[str, List]:
+    if not isinstance(data, dict):
+        raise ValueError(f"Template {name} must be a mapping with 'directories' and 'files'")
+    directories = data.get('directories') or []
+    files = data.get('files') or []
+    if not isinstance(directories, list) or not isinstance(files, list):
+        raise ValueError(f"The directories and files of template {name} must be lists")
+    return {'directories': directories, 'files': files}
+
+
+class TemplateRegistry:
+    """
+    Templates found in directories and entry points, loaded one at a time.
+
+    Each ``<name>.yaml`` file of a template directory is a template with the
+    ``directories`` and ``files`` keys of a configuration, and an optional
+    ``version``. An entry point of the ``project_initializer.templates`` group
+    names a template and resolves to such a mapping, or to a function returning
+    one. Directories listed first take precedence over later ones, directories
+    over entry points, and entry points over the builtin templates.
+
+    Only the index (name, version, hash and size of every template) is built to
+    list templates. It is kept in the cache directory, so unchanged files are
+    only stat'ed, and entry points are only looked up again once the sys.path
+    entries change. A template is parsed when it is loaded, once per content hash.
+    """
+
+    def __init__(self, directories: Optional[Sequence[str]] = None, entry_points: bool = True,
+                 builtin: bool = True, index_path: Optional[str] = None):
+        self.directories = list(directories) if directories is not None else template_path()
+        self.use_entry_points = entry_points
+        self.builtin = builtin
+        self.index_path = index_path or default_index_path()
+        self._index: Optional[Dict[str, TemplateInfo]] = None
+        self._entry_points = {}
+        self._parsed: Dict[Tuple[str, str], Dict[str, List]] = {}
+        self._lock = threading.Lock()
+
+    def index(self) -> Dict[str, TemplateInfo]:
+        """Return every available template by name, building the index on first use."""
+        with self._lock:
+            if self._index is None:
+                self._index = self._build_index()
+            return self._index
+
+    def names(self) -> List[str]:
+        return sorted(self.index())
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.index()
+
+    def info(self, name: str) -> TemplateInfo:
+        try:
+            return self.index()[name]
+        except KeyError:
+            raise KeyError(f"Unknown template '{name}', expected one of: {', '.join(self.names())}") from None
+
+    def load(self, name: str) -> Dict[str, List]:
+        """
+        Parse and return the directories and files of one template.
+
+        Raises:
+            KeyError: If no template has that name.
+            ValueError: If the template is not a mapping of lists.
+        """
+        info = self.info(name)
+        key = (info.name, info.hash)
+        with self._lock:
+            cached = self._parsed.get(key)
+        if cached is not None:
+            return cached
+        if info.source == 'entry_point':
+            if name not in self._entry_points:
+                self._entry_points.update((entry_point.name, entry_point) for entry_point in _template_entry_points())
+            data = self._entry_points[name].load()
+            if callable(data):
+                data = data()
+        else:
+            data = ConfigLoader.load_config(info.location)
+        template = _normalize(name, data)
+        if info.source != 'entry_point':
+            # Sources of a template file are relative to the directory it is in.
+            directory = os.path.dirname(info.location)
+            template['files'] = [resolve_source(file, directory) for file in template['files']]
+        logger.debug(f"Loaded template {name} {info.version} from {info.location}")
+        with self._lock:
+            self._parsed[key] = template
+        return template
+
+    def _build_index(self) -> Dict[str, TemplateInfo]:
+        cached = self._read_index()
+        stored = {'format': _INDEX_FORMAT, 'files': {}, 'entry_points': cached.get('entry_points')}
+        index: Dict[str, TemplateInfo] = {}
+        # Lowest precedence first, so later sources replace earlier ones.
+        if self.builtin:
+            self._index_directory(BUILTIN_DIR, 'builtin', cached.get('files', {}), stored['files'], index)
+        if self.use_entry_points:
+            stored['entry_points'] = self._index_entry_points(cached.get('entry_points'), index)
+        for directory in reversed(self.directories):
+            self._index_directory(directory, 'directory', cached.get('files', {}), stored['files'], index)
+        if stored != cached:
+            self._write_index(stored)
+        logger.debug(f"Indexed {len(index)} templates")
+        return index
+
+    def _index_directory(self, directory: str, source: str, cached: Dict, files: Dict,
+                         index: Dict[str, TemplateInfo]):
+        try:
+            entries = sorted(os.scandir(directory), key=lambda entry: entry.name)
+        except OSError as e:
+            logger.warning(f"Cannot read template directory {directory}: {str(e)}")
+            return
+        for entry in entries:
+            name, suffix = os.path.splitext(entry.name)
+            if suffix not in TEMPLATE_SUFFIXES or not entry.is_file():
+                continue
+            path = os.path.abspath(entry.path)
+            st = entry.stat()
+            record = cached.get(path)
+            if not record or record['size'] != st.st_size or record['mtime_ns'] != st.st_mtime_ns:
+                with open(path, 'rb') as f:
+                    source_bytes = f.read()
+                match = _VERSION_PATTERN.search(source_bytes)
+                record = {
+                    'size': st.st_size,
+                    'mtime_ns': st.st_mtime_ns,
+                    'sha256': hashlib.sha256(source_bytes).hexdigest(),
+                    'version': match.group(1).decode('utf-8', 'replace') if match else '0',
+                }
+            files[path] = record
+            index[name] = TemplateInfo(name, record['version'], record['sha256'], record['size'], source, path)
+
+    def _index_entry_points(self, cached: Optional[Dict], index: Dict[str, TemplateInfo]) -> Dict:
+        # Looking entry points up reads the metadata of every installed distribution.
+        site_state = _site_state()
+        if not cached or cached.get('site') != site_state:
+            records = []
+            for entry_point in _template_entry_points():
+                dist = getattr(entry_point, 'dist', None)
+                records.append({'name': entry_point.name, 'value': entry_point.value,
+                                'version': getattr(dist, 'version', None) or '0'})
+                self._entry_points[entry_point.name] = entry_point
+            cached = {'site': site_state, 'entries': records}
+        for record in cached['entries']:
+            # Nothing is imported to index an entry point, so its hash stands for the distribution release.
+            digest = hashlib.sha256(f"{record['value']}@{record['version']}".encode('utf-8')).hexdigest()
+            index[record['name']] = TemplateInfo(record['name'], record['version'], digest, 0, 'entry_point',
+                                                 record['value'])
+        return cached
+
+    def _read_index(self) -> Dict:
+        try:
+            with open(self.index_path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return {}
+        if not isinstance(data, dict) or data.get('format') != _INDEX_FORMAT:
+            return {}
+        return data
+
+    def _write_index(self, data: Dict):
+        """Store the index. Failures only mean the files are read again next time."""
+        try:
+            os.makedirs(os.path.dirname(self.index_path), exist_ok=True)
+            tmp_path = f"{self.index_path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump(data, f)
+            os.replace(tmp_path, self.index_path)
+        except OSError as e:
+            logger.debug(f"Could not write template index {self.index_path}: {str(e)}")
+
+
+@functools.lru_cache(maxsize=None)
+def default_registry() -> TemplateRegistry:
+    """Return the registry of the process, searching PROJECT_INITIALIZER_TEMPLATE_PATH."""
+    return TemplateRegistry()
+
+
+def load_template(name: str) -> Dict[str, List]:
+    """Load a template from the default registry, falling back to the default template for unknown names."""
+    registry = default_registry()
+    if name not in registry:
+        logger.warning(f"Unknown template '{name}', using the {DEFAULT_TEMPLATE} template")
+        name = DEFAULT_TEMPLATE
+    return registry.load(name)
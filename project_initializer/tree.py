@@ -0,0 +1,294 @@
+# Directory: project_initializer/
+# File: tree.py
+
+"""Module for listing a project tree, honoring .gitignore files, as the text of PROJECT_STRUCTURE.md."""
+
+import os
+import json
+import time
+import shutil
+import hashlib
+import logging
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+from . import metrics
+from .config_loader import cache_root
+from .ignore import DEFAULT_EXCLUDES, GITIGNORE, IgnoreMatcher
+
+logger = logging.getLogger(__name__)
+
+INDENT = '    '
+_CACHE_FORMAT = 1
+# Directories modified this recently may change again within the same mtime tick,
+# so their listings are not trusted by the next run.
+_RACY_NS = 2 * 1000 * 1000 * 1000
+
+# (mtime_ns, directories, files, .gitignore state as [size, mtime_ns, lines] or None)
+Listing = Tuple[int, List[str], List[str], Optional[List]]
+
+
+def default_cache_path(root: str) -> str:
+    key = hashlib.sha256(os.path.abspath(root).encode('utf-8')).hexdigest()[:16]
+    return os.path.join(cache_root(), 'tree', f"{key}.json")
+
+
+class ListingCache:
+    """
+    Directory listings of a previous walk, reused while the mtime of their directory is unchanged.
+
+    Adding, removing or renaming an entry changes the mtime of its directory, so
+    an unchanged mtime means an unchanged listing. A reused directory costs one
+    ``stat`` instead of reading it, and its .gitignore is only read again when its
+    size or mtime changed. Every directory still has to be stat'ed: the mtime of
+    a directory does not change when something deeper in it does.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.previous: Dict[str, Listing] = {}
+        self.current: Dict[str, Listing] = {}
+        self.started_ns = time.time_ns()
+
+    @classmethod
+    def load(cls, path: str) -> 'ListingCache':
+        cache = cls(path)
+        try:
+            with open(path, 'r', encoding='utf-8') as f:
+                data = json.load(f)
+            if isinstance(data, dict) and data.get('format') == _CACHE_FORMAT:
+                cache.previous = {key: tuple(value) for key, value in data['listings'].items()}
+        except (OSError, ValueError, KeyError, TypeError):
+            logger.debug(f"No usable tree cache at {path}")
+        return cache
+
+    def get(self, relpath: str, mtime_ns: int) -> Optional[Listing]:
+        listing = self.previous.get(relpath)
+        if listing is not None and listing[0] == mtime_ns:
+            return listing
+        return None
+
+    def put(self, relpath: str, listing: Listing):
+        if listing[0] < self.started_ns - _RACY_NS:
+            self.current[relpath] = listing
+
+    def save(self):
+        """Store the listings of this walk. Failures only mean the next walk reads every directory."""
+        try:
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                json.dump({'format': _CACHE_FORMAT, 'listings': self.current}, f)
+            os.replace(tmp_path, self.path)
+        except OSError as e:
+            logger.debug(f"Could not write tree cache {self.path}: {str(e)}")
+
+
+class TreeWalker:
+    """
+    Walks a directory tree with ``os.scandir`` in sorted, depth-first order.
+
+    Ignored directories are pruned before they are read: excluded paths, and with
+    ``gitignore`` every .gitignore file on the way and ``.git/info/exclude``.
+    Symlinks are listed but never followed. With ``jobs`` above one, the top-level
+    directories are walked by a thread pool; their lines are still produced in order.
+    Files in ``skip_paths``, such as the output being written into the tree, are left out.
+    """
+
+    def __init__(self, root: str, excludes: Iterable[str] = DEFAULT_EXCLUDES, gitignore: bool = True,
+                 jobs: int = 1, cache: Optional[ListingCache] = None, skip_paths: Sequence[str] = ()):
+        self.root = os.path.abspath(root)
+        self.gitignore = gitignore
+        self.jobs = jobs
+        self.cache = cache
+        self.skip_paths = {os.path.abspath(path) for path in skip_paths}
+        self.matcher = IgnoreMatcher.for_root(self.root, excludes, gitignore)
+        self.stats = {'scanned': 0, 'reused': 0, 'ignored': 0}
+        self._lock = threading.Lock()
+
+    def _count(self, name: str, value: int = 1):
+        with self._lock:
+            self.stats[name] += value
+
+    def _listing(self, path: str, relpath: str) -> Listing:
+        if self.cache is not None:
+            mtime_ns = os.stat(path).st_mtime_ns
+            listing = self.cache.get(relpath, mtime_ns)
+            if listing is not None:
+                listing = self._refresh_gitignore(path, listing)
+                self.cache.put(relpath, listing)
+                self._count('reused')
+                return listing
+        else:
+            mtime_ns = 0
+        directories = []
+        files = []
+        with os.scandir(path) as entries:
+            for entry in entries:
+                if entry.is_dir(follow_symlinks=False):
+                    directories.append(entry.name)
+                else:
+                    files.append(entry.name)
+        directories.sort()
+        files.sort()
+        self._count('scanned')
+        listing = (mtime_ns, directories, files, None)
+        if self.cache is not None:
+            listing = self._refresh_gitignore(path, listing)
+            self.cache.put(relpath, listing)
+        return listing
+
+    def _refresh_gitignore(self, path: str, listing: Listing) -> Listing:
+        # Editing a .gitignore in place does not change the mtime of its directory.
+        if not self.gitignore or GITIGNORE not in listing[2]:
+            return listing
+        gitignore_path = os.path.join(path, GITIGNORE)
+        try:
+            st = os.stat(gitignore_path)
+            state = listing[3]
+            if state is None or state[:2] != [st.st_size, st.st_mtime_ns]:
+                with open(gitignore_path, 'r', encoding='utf-8', errors='replace') as f:
+                    state = [st.st_size, st.st_mtime_ns, f.read().splitlines()]
+        except OSError:
+            state = None
+        return listing[:3] + (state,)
+
+    def _matcher(self, path: str, relpath: str, listing: Listing, matcher: IgnoreMatcher) -> IgnoreMatcher:
+        if not self.gitignore or not relpath or GITIGNORE not in listing[2]:
+            # The root's .gitignore is already part of self.matcher.
+            return matcher
+        if listing[3] is not None:
+            return matcher.with_patterns(listing[3][2], relpath)
+        return matcher.child(path, relpath)
+
+    def _read(self, path: str, relpath: str,
+              matcher: IgnoreMatcher) -> Optional[Tuple[IgnoreMatcher, List[str], List[str]]]:
+        """Return the matcher of a directory and its files and subdirectories that are not ignored."""
+        try:
+            listing = self._listing(path, relpath)
+        except OSError as e:
+            logger.warning(f"Cannot read directory {path}: {str(e)}")
+            return None
+        matcher = self._matcher(path, relpath, listing, matcher)
+        prefix = f"{relpath}/" if relpath else ''
+        files = [name for name in listing[2] if not matcher.ignored(prefix + name, False)]
+        if self.skip_paths:
+            files = [name for name in files if os.path.join(path, name) not in self.skip_paths]
+        directories = [name for name in listing[1] if not matcher.ignored(prefix + name, True)]
+        ignored = len(listing[1]) + len(listing[2]) - len(files) - len(directories)
+        if ignored:
+            self._count('ignored', ignored)
+        return matcher, files, directories
+
+    def _walk(self, path: str, relpath: str, depth: int, matcher: IgnoreMatcher) -> Iterator[str]:
+        read = self._read(path, relpath, matcher)
+        if read is None:
+            return
+        matcher, files, directories = read
+        indent = INDENT * (depth + 1)
+        for name in files:
+            yield f"{indent}{name}"
+        for name in directories:
+            yield f"{indent}{name}/"
+            yield from self._walk(os.path.join(path, name), f"{relpath}/{name}" if relpath else name, depth + 1,
+                                  matcher)
+
+    def _subtree(self, name: str, matcher: IgnoreMatcher) -> List[str]:
+        return list(self._walk(os.path.join(self.root, name), name, 1, matcher))
+
+    def lines(self) -> Iterator[str]:
+        """Yield one line per directory and file, indented by depth, directories ending with '/'."""
+        yield f"{os.path.basename(self.root)}/"
+        read = self._read(self.root, '', self.matcher)
+        if read is None:
+            return
+        matcher, files, directories = read
+        for name in files:
+            yield f"{INDENT}{name}"
+        if self.jobs <= 1:
+            for name in directories:
+                yield f"{INDENT}{name}/"
+                yield from self._walk(os.path.join(self.root, name), name, 1, matcher)
+            return
+        # Each top-level directory is walked on its own thread, and written once the ones before it are.
+        with ThreadPoolExecutor(max_workers=self.jobs) as executor:
+            futures = [executor.submit(self._subtree, name, matcher) for name in directories]
+            for name, future in zip(directories, futures):
+                yield f"{INDENT}{name}/"
+                yield from future.result()
+
+
+def write_tree(walker: TreeWalker, output, markdown: bool = False) -> int:
+    """
+    Write the lines of walker to the text stream output as they are produced.
+
+    Returns:
+        int: The number of lines written.
+    """
+    count = 0
+    if markdown:
+        output.write("# Project Structure\n\n```\n")
+    with metrics.phase('tree'):
+        for line in walker.lines():
+            output.write(line)
+            output.write('\n')
+            count += 1
+    if markdown:
+        output.write("```\n")
+    metrics.count('tree_directories_scanned', walker.stats['scanned'])
+    metrics.count('tree_listings_reused', walker.stats['reused'])
+    metrics.count('tree_entries_ignored', walker.stats['ignored'])
+    return count
+
+
+def dump_tree(root: str, output_path: str, excludes: Sequence[str] = DEFAULT_EXCLUDES, gitignore: bool = True,
+              jobs: int = 1, incremental: bool = False, markdown: Optional[bool] = None) -> Tuple[int, Dict[str, int]]:
+    """
+    Write the tree of root to output_path, streaming it into a temporary file renamed over the output.
+
+    Args:
+        root (str): Directory to list.
+        output_path (str): File to write.
+        excludes (Sequence[str]): .gitignore-style patterns never listed, relative to root.
+        gitignore (bool): Honor the .gitignore files of the tree.
+        jobs (int): Threads walking the top-level directories.
+        incremental (bool): Reuse the listings of directories whose mtime did not change since the last run.
+        markdown (Optional[bool]): Wrap the tree in a Markdown document, by default for ``.md`` files.
+
+    Returns:
+        Tuple[int, Dict[str, int]]: The number of lines written, and the directories scanned,
+            reused and the entries ignored.
+    """
+    if markdown is None:
+        markdown = output_path.endswith('.md')
+    output_path = os.path.abspath(output_path)
+    directory = os.path.dirname(output_path)
+    os.makedirs(directory, exist_ok=True)
+    tmp_path = os.path.join(directory, f".{os.path.basename(output_path)}.{os.getpid()}.tmp")
+    cache = ListingCache.load(default_cache_path(root)) if incremental else None
+    walker = TreeWalker(root, excludes, gitignore, jobs, cache, skip_paths=[output_path, tmp_path])
+    if os.path.isfile(output_path) and output_path.startswith(os.path.join(walker.root, '')):
+        # Renaming over the output would change the mtime of its directory, which an
+        # incremental walk could then never reuse; rewriting the file in place does not.
+        with tempfile.TemporaryFile('w+', encoding='utf-8') as buffer:
+            count = write_tree(walker, buffer, markdown)
+            buffer.seek(0)
+            with open(output_path, 'w', encoding='utf-8') as f:
+                shutil.copyfileobj(buffer, f)
+    else:
+        try:
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                count = write_tree(walker, f, markdown)
+            os.replace(tmp_path, output_path)
+        except BaseException:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            raise
+    if cache is not None:
+        cache.save()
+    logger.info(f"Listed {count} entries of {root}: {walker.stats['scanned']} directories read, "
+                f"{walker.stats['reused']} reused, {walker.stats['ignored']} entries ignored")
+    return count, walker.stats
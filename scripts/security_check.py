@@ -1,40 +1,24 @@
-import subprocess
+import os
 import sys
 
-def run_command(command):
-    process = subprocess.Popen(command, stdout=subprocess.PIPE, stderr=subprocess.PIPE, shell=True)
-    stdout, stderr = process.communicate()
-    return process.returncode, stdout, stderr
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
 
-def main():
-    print("Running security checks...")
-
-    checks = [
-        ("Bandit", "bandit -r project_initializer -f custom"),
-        ("Safety", "safety check -r requirements.txt"),
-        ("Pip-audit", "pip-audit"),
-    ]
+from project_initializer.security import run_security_checks
 
-    exit_code = 0
 
-    for check_name, command in checks:
-        print(f"\nRunning {check_name}...")
-        return_code, stdout, stderr = run_command(command)
-        
-        if return_code != 0:
-            print(f"{check_name} found issues:")
-            print(stdout.decode())
-            print(stderr.decode())
-            exit_code = 1
-        else:
-            print(f"{check_name} passed.")
+def main():
+    # `project-initializer security` has the same checks with more options (timeouts, --offline, --safety-db).
+    print("Running security checks...")
+    results = run_security_checks(PROJECT_ROOT)
+    for result in results:
+        print(f"{result.name}: {result.status}" + (" (cached)" if result.cached else ""))
 
-    if exit_code == 0:
+    if all(result.ok for result in results):
         print("\nAll security checks passed!")
-    else:
-        print("\nSome security checks failed. Please review the output above.")
-
-    sys.exit(exit_code)
+        sys.exit(0)
+    print("\nSome security checks failed. Please review the output above.")
+    sys.exit(1)
 
 if __name__ == "__main__":
     main()
@@ -1,28 +1,19 @@
 import os
 import sys
 
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, PROJECT_ROOT)
+
+from project_initializer.tree import TreeWalker, dump_tree
+
+
 def get_structure(startpath):
-    structure = []
-    for root, dirs, files in os.walk(startpath):
-        level = root.replace(startpath, '').count(os.sep)
-        indent = ' ' * 4 * level
-        structure.append(f'{indent}{os.path.basename(root)}/')
-        subindent = ' ' * 4 * (level + 1)
-        for f in files:
-            structure.append(f'{subindent}{f}')
-    return structure
+    # Kept for existing callers; `project-initializer tree` streams the same lines instead.
+    return list(TreeWalker(startpath).lines())
 
 def create_project_structure_md():
-    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
-    docs_dir = os.path.join(project_root, 'docs')
-    os.makedirs(docs_dir, exist_ok=True)
-    structure = get_structure(project_root)
-    with open(os.path.join(docs_dir, 'PROJECT_STRUCTURE.md'), 'w') as f:
-        f.write("# Project Structure\n\n")
-        f.write("```\n")
-        f.write("\n".join(structure))
-        f.write("\n```\n")
-    print("PROJECT_STRUCTURE.md has been created/updated in the docs folder.")
+    count, _ = dump_tree(PROJECT_ROOT, os.path.join(PROJECT_ROOT, 'docs', 'PROJECT_STRUCTURE.md'), incremental=True)
+    print(f"PROJECT_STRUCTURE.md has been created/updated in the docs folder ({count} entries).")
 
 if __name__ == "__main__":
     create_project_structure_md()
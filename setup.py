@@ -13,6 +13,7 @@ setup(
     long_description_content_type="text/markdown",
     url="https://github.com/skrillll/project-initializer",
     packages=find_packages(),
+    package_data={"project_initializer": ["templates/*.yaml"]},
     classifiers=[
         "Development Status :: 3 - Alpha",
         "Intended Audience :: Developers",
@@ -0,0 +1,13 @@
+import pytest
+from project_initializer.template_registry import default_registry
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache_dir(tmp_path_factory, monkeypatch):
+    """Keep the config cache of every test out of the user's cache directory."""
+    monkeypatch.setenv('PROJECT_INITIALIZER_CACHE_DIR', str(tmp_path_factory.mktemp('cache')))
+    monkeypatch.delenv('PROJECT_INITIALIZER_TEMPLATE_PATH', raising=False)
+    # The default registry reads both variables when it is created.
+    default_registry.cache_clear()
+    yield
+    default_registry.cache_clear()
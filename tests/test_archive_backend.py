@@ -0,0 +1,83 @@
+import io
+import sys
+import tarfile
+import zipfile
+import pytest
+from click.testing import CliRunner
+from project_initializer.archive_backend import ArchiveBackend, archive_format_for, archive_name
+from project_initializer.cli import cli
+from project_initializer.directory_manager import DirectoryManager
+from project_initializer.file_manager import FileManager
+
+CONFIG = ("directories:\n  - src\n  - empty/nested\n"
+          "files:\n  - path: src/app.py\n    content: 'print(1)'\n  - path: docs/guide.md\n    content: '# Guide'\n")
+
+
+def write_config(tmp_path):
+    config = tmp_path / 'config.yaml'
+    config.write_text(CONFIG)
+    return str(config)
+
+
+def tar_contents(tar):
+    return {member.name: (tar.extractfile(member).read().decode() if member.isfile() else None) for member in tar}
+
+
+@pytest.mark.parametrize('stream', [False, True])
+def test_init_writes_tar_without_touching_disk(tmp_path, stream):
+    archive = tmp_path / 'project.tar.gz'
+    args = ['init', '-c', write_config(tmp_path), '-o', str(tmp_path / 'out'), '--output-archive', str(archive)]
+    result = CliRunner().invoke(cli, args + (['--stream'] if stream else []))
+    assert result.exit_code == 0, result.output
+    assert not (tmp_path / 'out').exists()
+    with tarfile.open(archive) as tar:
+        contents = tar_contents(tar)
+    assert contents['src/app.py'] == 'print(1)'
+    assert contents['docs/guide.md'] == '# Guide'
+    assert contents['empty/nested'] is None and contents['empty'] is None
+    assert contents['README.md'].startswith('# Default Project')
+    # Parents always come before their children.
+    names = list(contents)
+    assert names.index('src') < names.index('src/app.py')
+
+
+class Pipe(io.BytesIO):
+    """An unseekable stream, like stdout redirected to a pipe."""
+
+    def seekable(self):
+        return False
+
+    def tell(self):
+        raise OSError('unseekable')
+
+
+def test_zip_to_unseekable_stdout(monkeypatch):
+    pipe = Pipe()
+    monkeypatch.setattr(sys, 'stdout', io.TextIOWrapper(pipe))
+    with ArchiveBackend.open('-', 'zip') as backend:
+        DirectoryManager(['empty/nested'], backend=backend).create_directories()
+        FileManager([{'path': 'src/app.py', 'content': 'print(1)'}], backend=backend).create_files()
+    with zipfile.ZipFile(io.BytesIO(pipe.getvalue())) as archive:
+        assert archive.read('src/app.py') == b'print(1)'
+        assert archive.namelist() == ['empty/', 'empty/nested/', 'src/', 'src/app.py']
+
+
+def test_duplicate_paths_keep_last_entry():
+    buffer = io.BytesIO()
+    with ArchiveBackend(buffer, 'tar') as backend:
+        files = [{'path': 'a.txt', 'content': 'first'}, {'path': 'a.txt', 'content': 'second'}]
+        assert FileManager(files, backend=backend).create_files() == []
+    buffer.seek(0)
+    with tarfile.open(fileobj=buffer) as tar:
+        assert tar_contents(tar) == {'a.txt': 'second'}
+
+
+def test_paths_outside_the_project_are_rejected():
+    assert archive_name('./src//app.py') == 'src/app.py'
+    with pytest.raises(ValueError):
+        archive_name('../escape.txt')
+    with pytest.raises(ValueError):
+        archive_name('/etc/passwd')
+    assert archive_format_for('out.tgz') == 'tar.gz'
+    with pytest.raises(ValueError):
+        archive_format_for('out.rar')
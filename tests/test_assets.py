@@ -0,0 +1,117 @@
+import stat
+import tarfile
+import pytest
+from click.testing import CliRunner
+from project_initializer.assets import copy_file, resolve_source
+from project_initializer.archive_backend import ArchiveBackend
+from project_initializer.cli import cli
+from project_initializer.core import init_project_structure
+from project_initializer.filesystem import MemoryFileSystem
+
+
+@pytest.fixture
+def asset(tmp_path):
+    (tmp_path / 'assets').mkdir()
+    path = tmp_path / 'assets' / 'logo.bin'
+    path.write_bytes(bytes(range(256)) * 64)
+    path.chmod(0o755)
+    return path
+
+
+@pytest.mark.parametrize('link', ['copy', 'reflink', 'hard'])
+def test_copy_file_keeps_bytes_and_mode(asset, tmp_path, link):
+    target = tmp_path / 'out.bin'
+    target.write_text('previous')
+    method = copy_file(str(asset), str(target), link)
+
+    assert target.read_bytes() == asset.read_bytes()
+    assert stat.S_IMODE(target.stat().st_mode) == 0o755
+    if link == 'hard':
+        assert method == 'hard' and target.stat().st_ino == asset.stat().st_ino
+    else:
+        assert method in ('reflink', 'copy_file_range', 'sendfile', 'read')
+        assert target.stat().st_ino != asset.stat().st_ino
+
+
+def test_resolve_source_rejects_invalid_entries(tmp_path):
+    with pytest.raises(ValueError, match='both content and a source'):
+        resolve_source({'path': 'a', 'content': 'x', 'source': 'a'}, str(tmp_path))
+    with pytest.raises(ValueError, match="Unknown link mode 'soft'"):
+        resolve_source({'path': 'a', 'source': 'a', 'link': 'soft'}, str(tmp_path))
+    resolved = resolve_source({'path': 'a', 'source': 'b/c'}, str(tmp_path))
+    assert resolved == {'path': 'a', 'source': str(tmp_path / 'b' / 'c'), 'link': 'copy'}
+
+
+@pytest.mark.parametrize('source', ['/etc/passwd', '../secret', 'b/../../secret', 'escape/secret'])
+def test_resolve_source_rejects_sources_outside_of_the_assets_directory(tmp_path, source):
+    assets = tmp_path / 'assets'
+    assets.mkdir()
+    (assets / 'escape').symlink_to(tmp_path)
+
+    with pytest.raises(ValueError, match='outside of the assets directory'):
+        resolve_source({'path': 'a', 'source': source}, str(assets))
+
+
+@pytest.fixture
+def config(tmp_path, asset):
+    (tmp_path / 'assets' / 'data.csv').write_text('a,b\n1,2\n')
+    path = tmp_path / 'config.yaml'
+    path.write_text("assets: assets\n"
+                    "directories:\n  - static\n"
+                    "files:\n"
+                    "  - path: static/data.csv\n    source: data.csv\n    link: hard\n"
+                    "  - path: static/logo.bin\n    source: logo.bin\n")
+    return path
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_init_copies_sources_from_the_assets_directory(config, asset, tmp_path, monkeypatch, streaming):
+    output = tmp_path / 'out'
+    output.mkdir()
+    monkeypatch.chdir(output)
+    init_project_structure(str(config), streaming=streaming)
+
+    assert (output / 'static' / 'data.csv').read_text() == 'a,b\n1,2\n'
+    assert (output / 'static' / 'data.csv').stat().st_ino == (tmp_path / 'assets' / 'data.csv').stat().st_ino
+    assert (output / 'static' / 'logo.bin').read_bytes() == asset.read_bytes()
+
+
+def test_incremental_runs_compare_sources(config, asset, tmp_path, monkeypatch):
+    output = tmp_path / 'out'
+    output.mkdir()
+    monkeypatch.chdir(output)
+    init_project_structure(str(config), incremental=True)
+    assert init_project_structure(str(config), incremental=True)['unchanged'] >= 2
+
+    asset.write_bytes(b'new logo')
+    summary = init_project_structure(str(config), incremental=True)
+    assert summary['updated'] == 1
+    assert (output / 'static' / 'logo.bin').read_bytes() == b'new logo'
+
+
+def test_backends_copy_sources(config, asset, tmp_path):
+    memory = MemoryFileSystem()
+    init_project_structure(str(config), backend=memory)
+    assert memory.read_file('static/data.csv') == b'a,b\n1,2\n'
+
+    archive_path = tmp_path / 'project.tar.gz'
+    with ArchiveBackend.open(str(archive_path)) as backend:
+        init_project_structure(str(config), backend=backend)
+    with tarfile.open(archive_path) as archive:
+        member = archive.getmember('static/logo.bin')
+        assert member.mode == 0o755
+        assert archive.extractfile(member).read() == asset.read_bytes()
+
+
+def test_cli_assets_option(config, tmp_path):
+    other = tmp_path / 'other'
+    other.mkdir()
+    (other / 'data.csv').write_text('other')
+    config.write_text("files:\n  - path: data.csv\n    source: data.csv\n")
+
+    result = CliRunner().invoke(cli, ['init', '-c', str(config), '-o', str(tmp_path / 'out'), '--assets', str(other)])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / 'out' / 'data.csv').read_text() == 'other'
+
+    result = CliRunner().invoke(cli, ['init', '-c', str(config), '--assets', str(other), '--dry-run'])
+    assert 'data.csv (5 bytes)' in result.output
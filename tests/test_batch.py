@@ -0,0 +1,51 @@
+import pytest
+from click.testing import CliRunner
+from project_initializer import generate_batch
+from project_initializer.cli import cli
+
+
+CONFIG = """
+directories:
+  - src/${service}
+files:
+  - path: src/${service}/__init__.py
+    content: "NAME = '${service}'  # ${org}"
+variables:
+  org: acme
+"""
+
+
+@pytest.mark.parametrize('jobs', [1, 2])
+def test_generate_batch_renders_each_project(tmp_path, jobs):
+    config = tmp_path / 'config.yaml'
+    config.write_text(CONFIG)
+    projects = [{'output': f'out/{name}', 'variables': {'service': name}} for name in ('billing', 'users')]
+    projects.append({'output': 'out/broken'})
+
+    results = generate_batch(str(config), projects, jobs=jobs, base_dir=str(tmp_path))
+
+    assert [result.ok for result in results] == [True, True, False]
+    assert 'service' in results[2].error
+    assert all(result.elapsed > 0 for result in results)
+    assert (tmp_path / 'out' / 'users' / 'src' / 'users' / '__init__.py').read_text() == "NAME = 'users'  # acme"
+    assert (tmp_path / 'out' / 'billing' / 'README.md').exists()
+
+
+def test_init_batch_command(tmp_path):
+    (tmp_path / 'config.yaml').write_text(CONFIG)
+    (tmp_path / 'matrix.yaml').write_text(
+        'config: config.yaml\n'
+        'template: cli\n'
+        'variables: {org: initech}\n'
+        'projects:\n'
+        '  - {output: a, variables: {service: a}}\n'
+        '  - {output: b, variables: {service: b}}\n'
+    )
+
+    result = CliRunner().invoke(cli, ['init', '-c', str(tmp_path / 'config.yaml'), '-o', str(tmp_path / 'out'),
+                                      '--batch', str(tmp_path / 'matrix.yaml'), '-j', '2'])
+
+    assert result.exit_code == 0, result.output
+    assert 'Generated 2/2 projects' in result.output
+    assert (tmp_path / 'out' / 'b' / 'src' / 'b' / '__init__.py').read_text() == "NAME = 'b'  # initech"
+    assert (tmp_path / 'out' / 'a' / 'src' / 'cli.py').exists()
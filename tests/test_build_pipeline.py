@@ -0,0 +1,101 @@
+import os
+import sys
+import shutil
+import pytest
+from project_initializer.build_cache import BuildCache
+from project_initializer.build_pipeline import BuildPipeline, BuildStep
+from project_initializer.core import build_project
+
+
+def python_step(name, code, cwd, depends_on=()):
+    return BuildStep(name, [sys.executable, '-c', code], cwd=str(cwd), depends_on=depends_on)
+
+
+def test_pipeline_runs_dependencies_first_and_streams_output(tmp_path):
+    lines = []
+    steps = [
+        python_step('package', "print(open('compiled.txt').read())", tmp_path, depends_on=['compile']),
+        python_step('compile', "open('compiled.txt', 'w').write('ok')", tmp_path),
+        python_step('lint', "print('lint done')", tmp_path),
+    ]
+
+    results = BuildPipeline(steps, jobs=2, on_output=lambda step, line: lines.append((step, line))).run()
+
+    assert [result.step.name for result in results] == ['package', 'compile', 'lint']
+    assert all(result.ok for result in results)
+    assert results[0].output == ['ok']
+    assert sorted(lines) == [('lint', 'lint done'), ('package', 'ok')]
+
+
+def test_pipeline_skips_steps_after_a_failure(tmp_path):
+    steps = [
+        python_step('fail', 'import sys; sys.exit(3)', tmp_path),
+        python_step('after', "print('never')", tmp_path, depends_on=['fail']),
+    ]
+
+    failed, skipped = BuildPipeline(steps).run()
+
+    assert failed.returncode == 3 and not failed.ok
+    assert skipped.skipped and skipped.output == []
+
+
+def test_pipeline_reads_lines_of_any_length(tmp_path):
+    step = python_step('long', "print('x' * (3 * 1024 * 1024)); print('done', end='')", tmp_path)
+
+    result, = BuildPipeline([step]).run()
+
+    assert result.ok
+    assert [len(line) for line in result.output] == [3 * 1024 * 1024, 4]
+
+
+def test_pipeline_rejects_cycles(tmp_path):
+    with pytest.raises(ValueError, match='cycle'):
+        BuildPipeline([python_step('a', '', tmp_path, ['b']), python_step('b', '', tmp_path, ['a'])])
+
+
+def test_build_project_reports_failing_setup_py(tmp_path):
+    (tmp_path / 'setup.py').write_text("import sys\nprint('building')\nsys.exit(1)\n")
+
+    success, actions = build_project(str(tmp_path))
+
+    assert not success
+    assert any("Failed 'python setup.py build' with exit code 1" in action for action in actions)
+    assert actions[-1] == 'Build cache: 0 hits, 1 misses'
+
+
+def test_cached_steps_are_skipped_or_restored(tmp_path):
+    (tmp_path / 'input.txt').write_text('v1')
+    cache = BuildCache(str(tmp_path / 'cache'))
+    code = "import os; os.makedirs('out', exist_ok=True); open('out/result.txt', 'w').write(open('input.txt').read())"
+
+    def run():
+        step = BuildStep('copy', [sys.executable, '-c', code], cwd=str(tmp_path), inputs=['input.txt'],
+                         outputs=['out'])
+        return BuildPipeline([step], cache=cache).run()[0]
+
+    assert run().cached is None
+    assert run().cached == 'skipped'
+
+    shutil.rmtree(tmp_path / 'out')
+    restored = run()
+    assert restored.cached == 'restored' and restored.ok
+    assert (tmp_path / 'out' / 'result.txt').read_text() == 'v1'
+
+    (tmp_path / 'input.txt').write_text('v2')
+    assert run().cached is None
+    assert (tmp_path / 'out' / 'result.txt').read_text() == 'v2'
+    assert cache.describe() == 'Build cache: 2 hits, 2 misses'
+
+
+def test_glob_inputs_never_enter_excluded_directories(tmp_path, monkeypatch):
+    (tmp_path / 'src' / 'pkg').mkdir(parents=True)
+    (tmp_path / 'src' / 'pkg' / 'mod.py').write_text('x = 1')
+    (tmp_path / 'node_modules' / 'dep').mkdir(parents=True)
+    (tmp_path / 'node_modules' / 'dep' / 'vendored.py').write_text('')
+    step = BuildStep('lint', [sys.executable, '-c', ''], cwd=str(tmp_path), inputs=['**/*.py'])
+    scanned = []
+    scandir = os.scandir
+    monkeypatch.setattr(os, 'scandir', lambda path='.': scanned.append(os.fspath(path)) or scandir(path))
+    cache = BuildCache(str(tmp_path / 'cache'))
+    assert list(cache._iter_inputs(step)) == [os.path.join('src', 'pkg', 'mod.py')]
+    assert scanned and not any('node_modules' in path for path in scanned)
@@ -0,0 +1,67 @@
+import os
+from project_initializer.cleaner import Cleaner
+from project_initializer.core import clean_project
+
+
+def make_tree(root):
+    for package in ('a', 'b'):
+        cache = root / 'src' / package / '__pycache__'
+        cache.mkdir(parents=True)
+        (cache / 'mod.cpython-311.pyc').write_bytes(b'x' * 10)
+        (root / 'src' / package / 'mod.py').write_text('')
+        (root / 'src' / package / 'stale.pyc').write_bytes(b'x' * 5)
+    (root / 'build' / 'lib' / 'nested').mkdir(parents=True)
+    (root / 'build' / 'lib' / 'nested' / 'out.txt').write_bytes(b'x' * 100)
+    (root / '.coverage').write_text('data')
+    (root / 'notes-coverage').write_text('keep me')
+
+
+def test_dry_run_reports_plan_without_removing(tmp_path):
+    make_tree(tmp_path)
+
+    success, actions = clean_project(str(tmp_path), dry_run=True)
+
+    assert success
+    assert actions[-1] == 'Would reclaim 5 files and 130 bytes'
+    assert os.path.exists(tmp_path / 'build' / 'lib' / 'nested' / 'out.txt')
+
+
+def test_clean_removes_matches_and_keeps_everything_else(tmp_path):
+    make_tree(tmp_path)
+
+    success, actions = clean_project(str(tmp_path), all_files=True, workers=4)
+
+    assert success
+    assert len(actions) == 6
+    assert not (tmp_path / 'build').exists()
+    assert not (tmp_path / '.coverage').exists()
+    assert not (tmp_path / 'src' / 'a' / '__pycache__').exists()
+    assert not (tmp_path / 'src' / 'b' / 'stale.pyc').exists()
+    assert (tmp_path / 'src' / 'a' / 'mod.py').exists()
+    assert (tmp_path / 'notes-coverage').exists()
+
+
+def test_scan_does_not_descend_into_matched_directories(tmp_path):
+    (tmp_path / 'build' / '__pycache__').mkdir(parents=True)
+
+    targets = Cleaner.for_project().scan(str(tmp_path))
+
+    assert [target.path for target in targets] == [str(tmp_path / 'build')]
+
+
+def test_scan_skips_unreadable_directories(tmp_path, monkeypatch, caplog):
+    make_tree(tmp_path)
+    unreadable = str(tmp_path / 'src' / 'a')
+    scandir = os.scandir
+
+    def failing_scandir(path):
+        if path == unreadable:
+            raise PermissionError(13, 'Permission denied', path)
+        return scandir(path)
+
+    monkeypatch.setattr(os, 'scandir', failing_scandir)
+    targets = Cleaner.for_project().scan(str(tmp_path))
+
+    assert str(tmp_path / 'src' / 'b' / 'stale.pyc') in [target.path for target in targets]
+    assert not any(target.path.startswith(unreadable) for target in targets)
+    assert f"Cannot read directory {unreadable}" in caplog.text
@@ -0,0 +1,61 @@
+import os
+import logging
+from project_initializer.config_loader import ConfigLoader, ConfigCache
+
+
+def test_load_config_uses_cache_until_content_changes(tmp_path, caplog):
+    config = tmp_path / 'config.yaml'
+    config.write_text('directories:\n  - src\n')
+    caplog.set_level(logging.DEBUG, logger='project_initializer.config_loader')
+
+    assert ConfigLoader.load_config(str(config)) == {'directories': ['src']}
+    assert ConfigLoader.load_config(str(config)) == {'directories': ['src']}
+    assert [r.message.split(':')[0] for r in caplog.records] == ['Config cache miss', 'Config cache hit']
+
+    # Same size, different content and mtime: the hash check must catch it.
+    config.write_text('directories:\n  - doc\n')
+    st = os.stat(config)
+    os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+    assert ConfigLoader.load_config(str(config)) == {'directories': ['doc']}
+
+
+def test_touched_config_is_still_a_cache_hit(tmp_path):
+    config = tmp_path / 'config.yaml'
+    config.write_text('files: []\n')
+    ConfigLoader.load_config(str(config))
+    st = os.stat(config)
+    os.utime(config, ns=(st.st_atime_ns, st.st_mtime_ns + 10 ** 9))
+
+    cache = ConfigCache()
+    assert cache.get(str(config), os.stat(config), config.read_bytes) == {'files': []}
+
+
+def test_load_config_without_cache_writes_nothing(tmp_path):
+    config = tmp_path / 'config.yaml'
+    config.write_text('files: []\n')
+    cache_dir = tmp_path / 'cache'
+
+    assert ConfigLoader.load_config(str(config), use_cache=False, cache_dir=str(cache_dir)) == {'files': []}
+    assert not cache_dir.exists()
+
+
+def test_iter_config_yields_entries_one_at_a_time(tmp_path):
+    config = tmp_path / 'config.yaml'
+    config.write_text(
+        'project_name: Demo\n'
+        'directories: [src, docs]\n'
+        'files:\n'
+        '  - path: a.txt\n'
+        '    content: &body shared\n'
+        '  - {path: b.txt, content: *body}\n'
+        'templates: {web: {additional_directories: [static]}}\n'
+    )
+
+    assert list(ConfigLoader.iter_config(str(config))) == [
+        ('project_name', 'Demo'),
+        ('directories', 'src'),
+        ('directories', 'docs'),
+        ('files', {'path': 'a.txt', 'content': 'shared'}),
+        ('files', {'path': 'b.txt', 'content': 'shared'}),
+        ('templates', {'web': {'additional_directories': ['static']}}),
+    ]
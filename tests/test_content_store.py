@@ -0,0 +1,88 @@
+import os
+import pytest
+from project_initializer.batch import generate_batch
+from project_initializer.content_store import ContentStore
+from project_initializer.core import init_project_structure
+from project_initializer.file_manager import FileManager
+from project_initializer.filesystem import MemoryFileSystem
+
+
+def duplicated_files():
+    files = [{'path': f'pkg{i}/__init__.py', 'content': '# Package\n'} for i in range(50)]
+    files += [{'path': f'pkg{i}/module.py', 'content': f'value = {i}\n'} for i in range(50)]
+    files.append({'path': 'LICENSE', 'content': '# Package\n', 'dedup': False})
+    files.append({'path': 'empty.txt', 'content': ''})
+    return files
+
+
+def make_parents(files):
+    for file in files:
+        os.makedirs(os.path.dirname(file['path']) or '.', exist_ok=True)
+
+
+@pytest.mark.parametrize('workers', [None, 8])
+def test_identical_bodies_are_written_once(tmp_path, monkeypatch, workers):
+    monkeypatch.chdir(tmp_path)
+    files = duplicated_files()
+    make_parents(files)
+    store = ContentStore('hard', exclude=['pkg49/*'])
+    assert FileManager(files, workers=workers, create_parents=False, content_store=store).create_files() == []
+
+    inodes = {os.stat(f'pkg{i}/__init__.py').st_ino for i in range(49)}
+    assert len(inodes) == 1
+    assert os.stat('pkg49/__init__.py').st_ino not in inodes
+    assert os.stat('LICENSE').st_ino not in inodes
+    assert store.stats == {'unique_files': 50, 'linked_files': 48, 'bytes_saved': 48 * len('# Package\n')}
+    assert open('pkg7/module.py').read() == 'value = 7\n'
+
+
+def test_rewriting_a_linked_file_leaves_the_others(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    store = ContentStore()
+    manager = FileManager([], content_store=store)
+    manager.create_files([{'path': 'a.txt', 'content': 'same'}, {'path': 'b.txt', 'content': 'same'}])
+    assert os.stat('a.txt').st_ino == os.stat('b.txt').st_ino
+
+    # a.txt no longer holds the body, so c.txt links to b.txt's inode or gets its own copy.
+    manager.create_files([{'path': 'a.txt', 'content': 'changed'}, {'path': 'c.txt', 'content': 'same'}])
+    assert open('a.txt').read() == 'changed'
+    assert open('b.txt').read() == 'same' and open('c.txt').read() == 'same'
+
+    os.remove('c.txt')
+    os.remove('b.txt')
+    manager.create_files([{'path': 'd.txt', 'content': 'same'}])
+    assert open('d.txt').read() == 'same'
+
+
+def test_backends_without_local_files_write_normally():
+    backend = MemoryFileSystem()
+    backend.makedirs('pkg')
+    store = ContentStore()
+    FileManager([{'path': 'pkg/a', 'content': 'x'}, {'path': 'pkg/b', 'content': 'x'}], backend=backend,
+                content_store=store).create_files()
+    assert backend.files == {'pkg/a': 'x', 'pkg/b': 'x'}
+    assert store.stats['linked_files'] == 0
+
+
+def test_init_and_batch_report_savings(tmp_path, monkeypatch):
+    config = tmp_path / 'config.yaml'
+    config.write_text("directories: [a, b]\nfiles:\n"
+                      "  - path: a/__init__.py\n    content: '# Test directory'\n"
+                      "  - path: b/__init__.py\n    content: '# Test directory'\n")
+    output = tmp_path / 'out'
+    output.mkdir()
+    monkeypatch.chdir(output)
+    summary = init_project_structure(str(config), template='web', dedup='hard')
+    assert summary['linked'] >= 1 and summary['bytes_saved'] >= len('# Test directory')
+
+    results = generate_batch(str(config), [{'output': 'one'}, {'output': 'two'}], jobs=1, base_dir=str(tmp_path),
+                             dedup='hard')
+    assert all(result.ok for result in results)
+    # Every file of the second project is linked to the first one.
+    assert results[1].summary['linked'] == results[1].summary['files']
+    assert os.stat(tmp_path / 'one' / 'a' / '__init__.py').st_ino == os.stat(tmp_path / 'two' / 'b' / '__init__.py').st_ino
+
+
+def test_unknown_link_mode():
+    with pytest.raises(ValueError, match="Unknown dedup link mode"):
+        ContentStore('soft')
@@ -0,0 +1,29 @@
+from project_initializer.core import init_project_structure
+
+
+def write_config(path, files):
+    lines = ['directories:', '  - src', 'files:']
+    for file_path, content in files.items():
+        lines.append(f'  - path: {file_path}')
+        lines.append(f'    content: "{content}"')
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def test_streaming_mode_matches_eager_mode(tmp_path, monkeypatch):
+    config = tmp_path / 'config.yaml'
+    files = {f'pkg/sub{i % 4}/mod{i}.py': f'value = {i}' for i in range(50)}
+    files['README.md'] = 'also listed by the template'
+    write_config(config, files)
+
+    trees = []
+    for name, options in [('eager', {}), ('serial', {'streaming': True}),
+                          ('threaded', {'streaming': True, 'workers': 4, 'max_open_files': 2})]:
+        out = tmp_path / name
+        out.mkdir()
+        monkeypatch.chdir(out)
+        summary = init_project_structure(str(config), 'web', **options)
+        assert summary['errors'] == 0
+        trees.append(sorted((p.relative_to(out).as_posix(), p.read_text() if p.is_file() else None)
+                            for p in out.rglob('*')))
+
+    assert trees[0] == trees[1] == trees[2]
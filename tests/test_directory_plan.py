@@ -0,0 +1,33 @@
+import os
+from project_initializer.directory_plan import DirectoryPlan
+from project_initializer.directory_manager import DirectoryManager
+
+
+def test_plan_merges_directories_and_file_parents():
+    plan = DirectoryPlan(['src', 'docs/guides', 'src/pkg'], ['src/pkg/module.py', 'README.md', './docs/guides/a.md'])
+
+    assert plan.directories() == ['src', 'src/pkg', 'docs', 'docs/guides']
+    assert plan.leaves() == ['src/pkg', 'docs/guides']
+
+
+def test_plan_issues_one_mkdir_per_directory(tmp_path):
+    files = [f'pkg/sub{i % 5}/module{i}.py' for i in range(100)]
+    plan = DirectoryPlan(['pkg', 'pkg/sub0'], files)
+
+    stats = plan.create(str(tmp_path))
+
+    assert stats == {'mkdir': 6, 'stat': 0, 'existing': 0, 'makedirs_avoided': 96}
+    assert all(os.path.isdir(tmp_path / 'pkg' / f'sub{i}') for i in range(5))
+
+    # A second run only stats directories that are already there.
+    assert plan.create(str(tmp_path))['existing'] == 6
+
+
+def test_directory_manager_creates_file_parents(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    manager = DirectoryManager(['docs'], files=[{'path': 'src/app/main.py'}, {'path': 'setup.py'}])
+
+    manager.create_directories()
+
+    assert os.path.isdir(tmp_path / 'docs')
+    assert os.path.isdir(tmp_path / 'src' / 'app')
@@ -0,0 +1,51 @@
+import os
+from concurrent.futures import ThreadPoolExecutor
+from project_initializer.file_manager import FileManager
+
+
+def read_tree(root):
+    tree = {}
+    for dirpath, _, files in os.walk(root):
+        for name in files:
+            path = os.path.join(dirpath, name)
+            with open(path, 'r', encoding='utf-8') as f:
+                tree[os.path.relpath(path, root)] = f.read()
+    return tree
+
+
+def sample_files():
+    files = [{'path': f'pkg{i % 7}/sub{i % 3}/module{i}.py', 'content': f'# module {i}\n'} for i in range(200)]
+    files.append({'path': 'README.md', 'content': '# first\n'})
+    files.append({'path': 'README.md', 'content': '# second\n'})
+    return files
+
+
+def test_concurrent_writes_match_serial(tmp_path, monkeypatch):
+    serial_dir = tmp_path / 'serial'
+    concurrent_dir = tmp_path / 'concurrent'
+    serial_dir.mkdir()
+    concurrent_dir.mkdir()
+
+    monkeypatch.chdir(serial_dir)
+    assert FileManager(sample_files()).create_files() == []
+
+    monkeypatch.chdir(concurrent_dir)
+    assert FileManager(sample_files(), workers=8, max_open_files=4).create_files() == []
+
+    assert read_tree(serial_dir) == read_tree(concurrent_dir)
+    assert read_tree(concurrent_dir)['README.md'] == '# second\n'
+
+
+def test_concurrent_writes_report_per_file_errors(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / 'blocker').write_text('not a directory')
+    files = [
+        {'path': 'ok.txt', 'content': 'ok'},
+        {'path': 'blocker/child.txt', 'content': 'fails'},
+    ]
+
+    with ThreadPoolExecutor(max_workers=2) as executor:
+        errors = FileManager(files, executor=executor).create_files()
+
+    assert [path for path, _ in errors] == ['blocker/child.txt']
+    assert (tmp_path / 'ok.txt').read_text() == 'ok'
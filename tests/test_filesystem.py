@@ -0,0 +1,93 @@
+import os
+import pytest
+from click.testing import CliRunner
+from project_initializer.cli import cli
+from project_initializer.core import init_project_structure
+from project_initializer.directory_plan import DirectoryPlan
+from project_initializer.file_manager import FileManager
+from project_initializer.filesystem import FileSystem, MemoryFileSystem
+
+
+def disk_tree(root):
+    tree = {}
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames:
+            tree[os.path.relpath(os.path.join(dirpath, name), root).replace(os.sep, '/')] = None
+        for name in filenames:
+            path = os.path.join(dirpath, name)
+            with open(path, 'r', encoding='utf-8') as f:
+                tree[os.path.relpath(path, root).replace(os.sep, '/')] = f.read()
+    return dict(sorted(tree.items()))
+
+
+def write_config(path):
+    lines = ['directories:', '  - src/empty', 'files:']
+    for i in range(30):
+        lines += [f'  - path: pkg/sub{i % 3}/mod{i}.py', f'    content: "value = {i}"']
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def test_memory_filesystem_behaves_like_the_os():
+    fs = MemoryFileSystem()
+    fs.makedirs('a/b')
+    fs.write_file('./a/b/c.txt', 'c')
+    with pytest.raises(FileExistsError):
+        fs.mkdir('a')
+    with pytest.raises(FileNotFoundError):
+        fs.write_file('missing/c.txt', 'c')
+    with pytest.raises(FileNotFoundError):
+        fs.mkdir('x/y')
+    with pytest.raises(FileExistsError):
+        fs.makedirs('a/b/c.txt/d')
+    with pytest.raises(IsADirectoryError):
+        fs.write_file('a', 'a')
+    assert fs.tree() == {'a': None, 'a/b': None, 'a/b/c.txt': 'c'}
+
+
+@pytest.mark.parametrize('options', [{}, {'streaming': True}, {'workers': 4}])
+def test_memory_tree_matches_disk(tmp_path, monkeypatch, options):
+    config = tmp_path / 'config.yaml'
+    write_config(config)
+    out = tmp_path / 'out'
+    out.mkdir()
+    monkeypatch.chdir(out)
+    init_project_structure(str(config), 'web', **options)
+    expected = disk_tree(out)
+
+    empty = tmp_path / 'empty'
+    empty.mkdir()
+    monkeypatch.chdir(empty)
+    fs = MemoryFileSystem()
+    summary = init_project_structure(str(config), 'web', backend=fs, **options)
+    assert summary['errors'] == 0
+    assert fs.tree() == expected
+    assert os.listdir(empty) == []
+
+
+def test_backends_must_implement_every_operation():
+    class ReadOnly(FileSystem):
+        def isdir(self, path):
+            return False
+
+    with pytest.raises(TypeError, match='abstract'):
+        ReadOnly()
+
+
+def test_plan_and_file_errors_go_through_the_backend():
+    fs = MemoryFileSystem()
+    fs.makedirs('src')
+    fs.write_file('src/app', 'in the way')
+    stats = DirectoryPlan(['src/lib', 'docs'], filesystem=fs).create()
+    assert (stats['mkdir'], stats['existing']) == (3, 1)
+    errors = FileManager([{'path': 'src/app/main.py', 'content': ''}], backend=fs).create_files()
+    assert [path for path, _ in errors] == ['src/app/main.py']
+
+
+def test_cli_dry_run_writes_nothing(tmp_path):
+    config = tmp_path / 'config.yaml'
+    write_config(config)
+    result = CliRunner().invoke(cli, ['init', '-c', str(config), '-o', str(tmp_path / 'out'), '--dry-run'])
+    assert result.exit_code == 0, result.output
+    assert 'pkg/sub0/mod0.py (9 bytes)' in result.output
+    assert 'src/empty/' in result.output
+    assert not (tmp_path / 'out').exists()
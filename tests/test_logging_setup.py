@@ -0,0 +1,43 @@
+import json
+import logging
+from click.testing import CliRunner
+from project_initializer.cli import cli
+from project_initializer.logging_setup import configure_logging, stop_logging
+
+
+def test_queue_listener_writes_json_lines(tmp_path):
+    log_file = tmp_path / 'log.jsonl'
+    try:
+        listener = configure_logging(verbose=True, log_file=str(log_file), log_format='json', use_queue=True)
+        assert listener is not None
+        for i in range(50):
+            logging.getLogger('project_initializer.test').debug("Created file: %s", f'file{i}.py')
+    finally:
+        stop_logging()
+
+    entries = [json.loads(line) for line in log_file.read_text().splitlines()]
+    assert [entry['message'] for entry in entries] == [f'Created file: file{i}.py' for i in range(50)]
+    assert {entry['level'] for entry in entries} == {'DEBUG'}
+
+
+def test_reconfiguring_replaces_handlers(tmp_path):
+    root = logging.getLogger()
+    before = list(root.handlers)
+    try:
+        configure_logging(log_file=str(tmp_path / 'a.log'))
+        configure_logging(log_file=str(tmp_path / 'b.log'), use_queue=True)
+        assert len(root.handlers) == len(before) + 1
+    finally:
+        stop_logging()
+    assert root.handlers == before
+
+
+def test_cli_log_queue_flushes_on_exit(tmp_path):
+    config = tmp_path / 'config.yaml'
+    config.write_text("directories:\n  - src\nfiles:\n  - path: src/a.py\n    content: ''\n")
+    log_file = tmp_path / 'run.log'
+    result = CliRunner().invoke(cli, ['-v', '--log-file', str(log_file), '--log-format', 'json', '--log-queue',
+                                      'init', '-c', str(config), '-o', str(tmp_path / 'out')])
+    assert result.exit_code == 0, result.output
+    messages = [json.loads(line)['message'] for line in log_file.read_text().splitlines()]
+    assert 'Created file: src/a.py' in messages
@@ -0,0 +1,45 @@
+import os
+from project_initializer.core import init_project_structure
+from project_initializer.manifest import MANIFEST_FILENAME, Manifest
+
+
+def write_config(path, files):
+    lines = ['directories:', '  - src', 'files:']
+    for file_path, content in files.items():
+        lines.append(f'  - path: {file_path}')
+        lines.append(f'    content: "{content}"')
+    path.write_text('\n'.join(lines) + '\n')
+
+
+def test_incremental_runs_only_write_changes(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = tmp_path / 'config.yaml'
+    write_config(config, {'src/main.py': 'print(1)', 'src/util.py': 'x = 1', 'notes.txt': 'old'})
+
+    first = init_project_structure(str(config), 'default', incremental=True)
+    assert first['created'] == 7
+    assert first['unchanged'] == first['updated'] == first['orphaned'] == 0
+    assert 'src/main.py' in Manifest.load().entries
+
+    util_mtime = os.stat('src/util.py').st_mtime_ns
+    write_config(config, {'src/main.py': 'print(2)', 'src/util.py': 'x = 1'})
+
+    second = init_project_structure(str(config), 'default', incremental=True)
+    assert (second['created'], second['updated'], second['unchanged'], second['orphaned']) == (0, 1, 5, 1)
+    assert (tmp_path / 'src' / 'main.py').read_text() == 'print(2)'
+    assert os.stat('src/util.py').st_mtime_ns == util_mtime
+    assert (tmp_path / 'notes.txt').exists()
+
+
+def test_incremental_run_rewrites_modified_files(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config = tmp_path / 'config.yaml'
+    write_config(config, {'src/main.py': 'print(1)'})
+    init_project_structure(str(config), 'default', incremental=True)
+
+    (tmp_path / 'src' / 'main.py').write_text('print(9)')
+
+    summary = init_project_structure(str(config), 'default', incremental=True)
+    assert summary['updated'] == 1
+    assert (tmp_path / 'src' / 'main.py').read_text() == 'print(1)'
+    assert (tmp_path / MANIFEST_FILENAME).exists()
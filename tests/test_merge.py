@@ -0,0 +1,68 @@
+import logging
+import pytest
+from project_initializer.core import init_project_structure
+from project_initializer.filesystem import MemoryFileSystem
+from project_initializer.merge import merge_directories, merge_files, merge_template_config
+
+
+def entry(path, content):
+    return {'path': path, 'content': content}
+
+
+def test_merge_files_lists_each_path_once():
+    config = [entry('README.md', 'user'), entry('./src/app.py', 'first'), entry('src/app.py', 'second')]
+    template = [entry('src/__init__.py', ''), entry('src//app.py', 'template'), entry('README.md', 'template')]
+
+    files, overridden = merge_files(config, template)
+    assert files == [entry('README.md', 'user'), entry('src/app.py', 'second'), entry('src/__init__.py', '')]
+    assert overridden == ['./src/app.py', 'src//app.py', 'README.md']
+
+    files, overridden = merge_files(config, template, precedence='template')
+    assert files == [entry('README.md', 'template'), entry('src//app.py', 'template'), entry('src/__init__.py', '')]
+    assert sorted(overridden) == ['./src/app.py', 'README.md', 'src/app.py']
+
+    with pytest.raises(ValueError, match='Unknown precedence'):
+        merge_files(config, template, precedence='newest')
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_entries_without_a_path_are_skipped_with_a_warning(tmp_path, monkeypatch, caplog, streaming):
+    orphan = {'content': 'orphan'}
+    files, overridden = merge_files([orphan, entry('', 'empty'), entry('a.py', 'a')], [orphan, entry('a.py', 'b')])
+    assert files == [orphan, entry('', 'empty'), entry('a.py', 'a'), orphan] and overridden == ['a.py']
+
+    config = tmp_path / 'config.yaml'
+    config.write_text("directories: []\nfiles:\n  - content: orphan\n  - path: a.py\n    content: a\n")
+    output = tmp_path / 'out'
+    output.mkdir()
+    monkeypatch.chdir(output)
+    init_project_structure(str(config), streaming=streaming)
+    assert (output / 'a.py').read_text() == 'a'
+    assert 'Skipping file creation due to empty path' in caplog.text
+
+
+def test_merge_directories_keeps_first_listed_order():
+    assert merge_directories(['src', 'docs/', 'src/pkg'], ['tests', './src', 'docs']) == ['src', 'docs/', 'src/pkg', 'tests']
+
+
+def test_overridden_entries_are_logged(caplog):
+    config = {'directories': [], 'files': [entry('README.md', 'user')]}
+    template = {'directories': ['docs'], 'files': [entry('README.md', 'template')]}
+    with caplog.at_level(logging.INFO, logger='project_initializer.merge'):
+        merged = merge_template_config(config, template)
+    assert merged == {'directories': ['docs'], 'files': [entry('README.md', 'user')]}
+    assert '1 file entries overridden, config entries taking precedence: README.md' in caplog.text
+
+
+@pytest.mark.parametrize('precedence, expected', [('config', 'user readme'), ('template', '# Web Project\n')])
+@pytest.mark.parametrize('streaming', [False, True])
+def test_precedence_decides_written_content(tmp_path, precedence, expected, streaming):
+    config = tmp_path / 'config.yaml'
+    config.write_text("directories:\n  - src\nfiles:\n  - path: ./README.md\n    content: user readme\n"
+                      "  - path: src/main.py\n    content: ''\n")
+    backend = MemoryFileSystem()
+    summary = init_project_structure(str(config), 'web', streaming=streaming, backend=backend,
+                                     precedence=precedence)
+
+    assert summary['files'] == 7
+    assert backend.read_file('README.md').startswith(expected)
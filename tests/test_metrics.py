@@ -0,0 +1,96 @@
+import json
+import logging
+import pstats
+import threading
+from click.testing import CliRunner
+from project_initializer import metrics
+from project_initializer.cli import cli
+
+
+def write_config(tmp_path):
+    config = tmp_path / 'config.yaml'
+    config.write_text("directories:\n  - src/pkg\nfiles:\n  - path: src/pkg/a.py\n    content: 'x = 1'\n"
+                      "  - path: README.md\n    content: ''\n")
+    return config
+
+
+def test_phases_accumulate_and_are_noops_when_off():
+    assert not metrics.enabled()
+    with metrics.phase('ignored'):
+        metrics.count('ignored')
+
+    collector = metrics.start('test')
+    try:
+        for _ in range(3):
+            with metrics.phase('write'):
+                metrics.count('files_written')
+        metrics.record('step:lint', 0.5)
+    finally:
+        assert metrics.stop() is collector
+
+    assert collector.phases['write']['calls'] == 3
+    assert collector.phases['step:lint'] == {'wall': 0.5, 'cpu': 0.0, 'calls': 1}
+    assert collector.counters == {'files_written': 3}
+    assert collector.wall >= collector.phases['write']['wall']
+
+
+def test_collecting_isolates_the_calling_thread():
+    collector = metrics.start('serve')
+    request = metrics.Metrics('request')
+    try:
+        with metrics.collecting(request):
+            metrics.count('files_written')
+            thread = threading.Thread(target=metrics.count, args=('files_written', 5))
+            thread.start()
+            thread.join()
+        metrics.count('requests')
+    finally:
+        metrics.stop()
+    assert request.counters == {'files_written': 1}
+    assert collector.counters == {'files_written': 5, 'requests': 1}
+
+
+def test_cli_init_writes_metrics_file(tmp_path):
+    config = write_config(tmp_path)
+    metrics_file = tmp_path / 'metrics.json'
+    result = CliRunner().invoke(cli, ['--metrics-file', str(metrics_file), 'init', '-c', str(config),
+                                      '-o', str(tmp_path / 'out'), '--no-config-cache'])
+    assert result.exit_code == 0, result.output
+
+    data = json.loads(metrics_file.read_text())
+    assert data['command'] == 'init'
+    assert {'load_config', 'parse_yaml', 'merge', 'directories', 'files'} <= set(data['phases'])
+    assert all(phase['wall'] >= 0 and phase['calls'] >= 1 for phase in data['phases'].values())
+    assert data['counters']['files_written'] >= 2
+    assert data['counters']['bytes_written'] >= len('x = 1')
+    assert data['counters']['mkdir_calls'] >= 2
+    assert not metrics.enabled()
+
+
+def test_cli_times_logging_and_restores_handlers(tmp_path):
+    config = write_config(tmp_path)
+    metrics_file = tmp_path / 'metrics.json'
+    result = CliRunner().invoke(cli, ['-v', '--log-file', str(tmp_path / 'run.log'), '--metrics-file',
+                                      str(metrics_file), 'init', '-c', str(config), '-o', str(tmp_path / 'out')])
+    assert result.exit_code == 0, result.output
+
+    data = json.loads(metrics_file.read_text())
+    assert data['phases']['logging']['calls'] > 0
+    assert all('handle' not in vars(handler) for handler in logging.getLogger().handlers)
+
+
+def test_cli_clean_profile_dumps_pstats(tmp_path):
+    project = tmp_path / 'project'
+    (project / 'pkg' / '__pycache__').mkdir(parents=True)
+    (project / 'pkg' / '__pycache__' / 'a.cpython-311.pyc').write_bytes(b'\0' * 16)
+    profile = tmp_path / 'clean.pstats'
+    metrics_file = tmp_path / 'metrics.json'
+    result = CliRunner().invoke(cli, ['--profile', str(profile), '--metrics-file', str(metrics_file),
+                                      'clean', '-d', str(project)], input='y\n')
+    assert result.exit_code == 0, result.output
+
+    assert pstats.Stats(str(profile)).total_calls > 0
+    data = json.loads(metrics_file.read_text())
+    assert data['command'] == 'clean'
+    assert {'scan', 'remove'} <= set(data['phases'])
+    assert data['counters']['clean_targets'] == 1
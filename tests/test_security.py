@@ -0,0 +1,108 @@
+import sys
+import time
+import pytest
+from click.testing import CliRunner
+from project_initializer.cli import cli
+from project_initializer.security import SecurityCheck, SecurityRunner, default_checks
+
+
+def python_check(name, code, tmp_path, timeout=10):
+    source = tmp_path / f"{name}.py"
+    source.write_text(code)
+    return SecurityCheck(name, [sys.executable, str(source)], [str(source)], str(tmp_path), timeout)
+
+
+class Output(list):
+    def write(self, text):
+        self.append(text)
+
+    def flush(self):
+        pass
+
+
+def test_checks_run_concurrently_and_stream_prefixed_lines(tmp_path):
+    checks = [python_check(name, f"import time, sys\nprint('start')\ntime.sleep(1)\nsys.exit({code})", tmp_path)
+              for name, code in (('first', 0), ('second', 1))]
+    output = Output()
+    start = time.perf_counter()
+    results = SecurityRunner(checks, output, cache_dir=str(tmp_path / 'cache')).run()
+    assert time.perf_counter() - start < 1.8
+    assert [(result.name, result.status) for result in results] == [('first', 'passed'), ('second', 'failed')]
+    assert sorted(output) == ['first  | start\n', 'second | start\n']
+
+
+def test_unchanged_inputs_reuse_the_cached_result(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    check = python_check('scan', "print('finding', end='')\nraise SystemExit(1)", tmp_path)
+    first = SecurityRunner([check], Output(), cache_dir=cache_dir).run()[0]
+    assert not first.cached
+
+    output = Output()
+    second = SecurityRunner([check], output, cache_dir=cache_dir).run()[0]
+    assert second.cached and second.status == 'failed' and second.returncode == 1
+    assert output == ['scan | finding\n']
+
+    (tmp_path / 'scan.py').write_text("print('fixed')")
+    assert not SecurityRunner([check], Output(), cache_dir=cache_dir).run()[0].cached
+
+
+def test_failures_without_findings_are_not_cached(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    check = python_check('safety', "raise SystemExit(1)", tmp_path)
+    check.finding_returncodes = (64,)
+    SecurityRunner([check], Output(), cache_dir=cache_dir).run()
+    assert not SecurityRunner([check], Output(), cache_dir=cache_dir).run()[0].cached
+
+    (tmp_path / 'safety.py').write_text("raise SystemExit(64)")
+    SecurityRunner([check], Output(), cache_dir=cache_dir).run()
+    assert SecurityRunner([check], Output(), cache_dir=cache_dir).run()[0].cached
+
+
+def test_cached_results_of_online_checks_expire(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    check = python_check('audit', "print('clean')", tmp_path)
+    check.max_age = 60
+    SecurityRunner([check], Output(), cache_dir=cache_dir).run()
+    assert SecurityRunner([check], Output(), cache_dir=cache_dir).run()[0].cached
+    check.max_age = 0
+    assert not SecurityRunner([check], Output(), cache_dir=cache_dir).run()[0].cached
+
+
+def test_timeouts_kill_the_check_and_are_not_cached(tmp_path):
+    cache_dir = str(tmp_path / 'cache')
+    check = python_check('slow', "import time\ntime.sleep(30)", tmp_path, timeout=0.3)
+    start = time.perf_counter()
+    result = SecurityRunner([check], Output(), cache_dir=cache_dir).run()[0]
+    assert result.status == 'timeout' and time.perf_counter() - start < 5
+    assert not SecurityRunner([check], Output(), cache_dir=cache_dir).run()[0].cached
+
+
+def test_offline_checks(tmp_path):
+    (tmp_path / 'pkg').mkdir()
+    (tmp_path / 'pkg' / '__init__.py').write_text('')
+    (tmp_path / 'requirements.txt').write_text('click==8.0.3\n')
+    (tmp_path / 'advisories').mkdir()
+    bandit, safety, pip_audit = default_checks(str(tmp_path), offline=True)
+    assert bandit.argv[:3] == ['bandit', '-r', 'pkg'] and bandit.skip_reason is None
+    assert safety.skip_reason and pip_audit.skip_reason
+    assert bandit.max_age is None and safety.max_age == pip_audit.max_age == 24 * 60 * 60
+
+    safety, = default_checks(str(tmp_path), checks=['safety'], timeouts={'': 5, 'safety': 60},
+                             safety_db=str(tmp_path / 'advisories'), offline=True)
+    assert safety.skip_reason is None and safety.timeout == 60 and safety.max_age is None
+    assert safety.argv == ['safety', 'check', '-r', 'requirements.txt', '--db', str(tmp_path / 'advisories')]
+
+
+def test_cli_reports_missing_tools(tmp_path, monkeypatch):
+    monkeypatch.setenv('PATH', str(tmp_path))
+    (tmp_path / 'app.py').write_text('')
+    result = CliRunner().invoke(cli, ['security', str(tmp_path), '--offline', '--timeout', 'bandit=5'])
+    assert result.exit_code == 1
+    assert 'bandit    | bandit is not installed' in result.stdout
+    assert 'safety: skipped' in result.stderr
+
+
+@pytest.mark.parametrize('value', ['bandit=soon', '0'])
+def test_cli_rejects_bad_timeouts(value):
+    result = CliRunner().invoke(cli, ['security', '--timeout', value])
+    assert result.exit_code == 2
@@ -0,0 +1,175 @@
+import os
+import json
+import shutil
+import socket
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+import pytest
+from click.testing import CliRunner
+from project_initializer.cli import cli
+from project_initializer.client import TOKEN_ENV, GeneratorClient, generate
+from project_initializer.server import make_server, server_address
+
+
+@pytest.fixture
+def config(tmp_path):
+    path = tmp_path / 'config.yaml'
+    path.write_text("directories:\n  - src\nfiles:\n  - path: src/${project_name}.py\n    content: 'x = 1'\n")
+    return str(path)
+
+
+@pytest.fixture(params=['unix', 'tcp'])
+def server(request, monkeypatch):
+    # Unix socket paths are limited to about 100 bytes, too short for pytest's tmp_path.
+    directory = tempfile.mkdtemp(prefix='pi-serve-')
+    if request.param == 'unix':
+        # Clients read the token from the file next to the socket.
+        server = make_server(socket_path=os.path.join(directory, 'serve.sock'), workers=2)
+    else:
+        server = make_server(port=0, workers=2)
+        monkeypatch.setenv(TOKEN_ENV, server.token)
+    thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+    thread.start()
+    yield server
+    server.shutdown()
+    server.server_close()
+    thread.join()
+    shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_server_generates_and_keeps_config_hot(server, config, tmp_path):
+    address = server_address(server)
+    request = {'config': config, 'output': str(tmp_path / 'one'), 'variables': {'project_name': 'one'}}
+
+    first = generate(request, address=address)
+    assert first['ok'] and first['served']
+    assert (tmp_path / 'one' / 'src' / 'one.py').read_text() == 'x = 1'
+    assert {'load_template', 'load_config', 'generate'} <= set(first['metrics']['phases'])
+
+    second = generate(dict(request, output=str(tmp_path / 'two'), staged=True), address=address)
+    assert second['ok']
+    counters = second['metrics']['counters']
+    assert counters['config_memory_hits'] == 1 and counters['files_written'] == second['summary']['files']
+    assert 'config_memory_hits' not in first['metrics']['counters']
+    assert (tmp_path / 'two' / 'README.md').exists()
+
+    health = GeneratorClient(address).health()
+    assert health['requests'] == 2 and 'default' in health['templates']
+
+
+def test_server_rejects_malformed_requests(server, config):
+    address = server_address(server)
+    relative = generate({'config': 'config.yaml', 'output': '/tmp/out'}, address=address)
+    assert not relative['ok'] and relative['served']
+    assert 'absolute path' in relative['error']
+
+    unknown = generate({'config': config, 'output': '/tmp/out', 'template': 'missing'}, address=address)
+    assert "Unknown template 'missing'" in unknown['error']
+
+
+def test_server_refuses_unauthenticated_and_cross_origin_requests(server, config, tmp_path):
+    address = server_address(server)
+    request = {'config': config, 'output': str(tmp_path / 'out')}
+    assert not generate(dict(request, output=str(tmp_path / 'fallback')), address=address, token='wrong')['served']
+
+    client = GeneratorClient(address)
+    connection = client._connection()
+    # What a web page can send without a preflight request.
+    connection.request('POST', '/generate', body=json.dumps(request), headers={'Content-Type': 'text/plain'})
+    assert connection.getresponse().status == 415
+    connection.close()
+    connection = client._connection()
+    connection.request('POST', '/generate', body=json.dumps(request), headers={'Content-Type': 'application/json'})
+    assert connection.getresponse().status == 401
+    connection.close()
+    assert not (tmp_path / 'out').exists()
+
+
+def test_staged_requests_only_replace_directories_of_the_server(server, config, tmp_path):
+    address = server_address(server)
+    (tmp_path / 'existing').mkdir()
+    (tmp_path / 'existing' / 'keep.txt').write_text('keep')
+    refused = generate({'config': config, 'output': str(tmp_path / 'existing'), 'staged': True}, address=address)
+    assert refused['served'] and 'Refusing to replace' in refused['error']
+    assert (tmp_path / 'existing' / 'keep.txt').exists()
+
+    request = {'config': config, 'output': str(tmp_path / 'new'), 'staged': True}
+    assert generate(request, address=address)['ok']
+    assert generate(request, address=address)['ok']
+
+
+def test_concurrent_requests_write_their_own_output(server, config, tmp_path):
+    address = server_address(server)
+
+    def run(index):
+        return generate({'config': config, 'output': str(tmp_path / f'out{index}'),
+                         'variables': {'project_name': f'p{index}'}, 'template': 'web'}, address=address)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(run, range(8)))
+
+    assert all(result['ok'] and result['served'] for result in results)
+    for index in range(8):
+        assert (tmp_path / f'out{index}' / 'src' / f'p{index}.py').exists()
+        assert (tmp_path / f'out{index}' / 'src' / 'app.py').exists()
+    assert os.getcwd() != str(tmp_path)
+
+
+@pytest.mark.parametrize('kind', ['unix', 'tcp'])
+def test_connection_bursts_beyond_the_default_backlog_are_served(kind):
+    directory = tempfile.mkdtemp(prefix='pi-serve-')
+    if kind == 'unix':
+        server = make_server(socket_path=os.path.join(directory, 'serve.sock'), workers=2, max_pending=30)
+        address = server.socket_path
+    else:
+        server = make_server(port=0, workers=2, max_pending=30)
+        address = server.server_address[:2]
+    # Every client connects before the server accepts any connection.
+    clients = []
+    try:
+        for _ in range(20):
+            client = socket.socket(socket.AF_UNIX if kind == 'unix' else socket.AF_INET, socket.SOCK_STREAM)
+            client.settimeout(2)
+            client.connect(address)
+            client.sendall(b"GET /health HTTP/1.0\r\n\r\n")
+            clients.append(client)
+        thread = threading.Thread(target=server.serve_forever, args=(0.05,), daemon=True)
+        thread.start()
+        for client in clients:
+            response = b''.join(iter(lambda client=client: client.recv(65536), b''))
+            assert response.startswith(b'HTTP/1.0 200'), response
+        server.shutdown()
+        thread.join()
+    finally:
+        for client in clients:
+            client.close()
+        server.server_close()
+        shutil.rmtree(directory, ignore_errors=True)
+
+
+def test_client_falls_back_to_this_process(config, tmp_path):
+    result = generate({'config': config, 'output': str(tmp_path / 'out'), 'variables': {'project_name': 'local'}},
+                      address=str(tmp_path / 'missing.sock'))
+    assert result['ok'] and not result['served']
+    assert (tmp_path / 'out' / 'src' / 'local.py').exists()
+
+
+def test_client_fallback_reports_failed_generations(tmp_path):
+    config = tmp_path / 'broken.yaml'
+    config.write_text('variables: {org: acme}\nfiles:\n  - path: a.txt\n    content: "${missing}"\n')
+
+    result = generate({'config': str(config), 'output': str(tmp_path / 'out')}, address=str(tmp_path / 'missing.sock'))
+    assert not result['ok'] and not result['served']
+    assert result['error'] == 'UndefinedVariablesError: Undefined template variables: missing'
+
+
+def test_cli_init_server_falls_back(config, tmp_path):
+    result = CliRunner().invoke(cli, ['init', '-c', config, '-o', str(tmp_path / 'out'), '--var', 'project_name=cli',
+                                      '--server', str(tmp_path / 'missing.sock')])
+    assert result.exit_code == 0, result.output
+    assert 'in this process' in result.output
+    assert (tmp_path / 'out' / 'src' / 'cli.py').exists()
+
+    result = CliRunner().invoke(cli, ['init', '-c', config, '--server', 'x.sock', '--dry-run'])
+    assert result.exit_code == 2
@@ -0,0 +1,80 @@
+import os
+import pytest
+import yaml
+from click.testing import CliRunner
+from project_initializer.cli import cli
+from project_initializer.core import init_project_structure
+from project_initializer.snapshot import content_scalar, snapshot_tree
+
+TEXTS = {
+    'README.md': '# Reference\n',
+    'src/app/main.py': 'def main():\n\treturn "${HOME}"\n',
+    'src/app/indented.txt': '    starts indented\n\n\n',
+    'src/app/no-newline.txt': 'no newline at the end',
+    'src/app/empty.txt': '',
+    'docs/unicode.md': 'café ☃\n',
+    'docs/windows.txt': 'line one\r\nline two\r\n',
+    'docs/it\'s ${here}.txt': 'quoted path\n',
+}
+
+
+def make_reference(root):
+    for path, content in TEXTS.items():
+        (root / path).parent.mkdir(parents=True, exist_ok=True)
+        (root / path).write_bytes(content.encode('utf-8'))
+    (root / 'static').mkdir()
+    (root / 'static' / 'logo.png').write_bytes(b'\x89PNG\r\n\x1a\n\0\0' + bytes(range(256)))
+    (root / 'static' / 'big.txt').write_text('x' * 2000)
+    (root / 'static' / 'huge.bin').write_bytes(b'\0' * 10000)
+    (root / 'empty-dir').mkdir()
+    (root / 'node_modules' / 'pkg').mkdir(parents=True)
+    (root / 'build').mkdir()
+    (root / 'build' / 'out.txt').write_text('ignored')
+    (root / '.gitignore').write_text('build/\n')
+
+
+@pytest.mark.parametrize('content', ['a\n', 'a', 'a\n\n', '  a\n b\n', 'a\r\n', 'tab\there\n', '\x1b[0m\n', ''])
+def test_content_scalar_round_trips(content):
+    # Block scalars are indented for a file entry, where the snapshot writes them.
+    document = f"files:\n  - path: a\n    content: {content_scalar(content)}\n"
+    assert yaml.safe_load(document)['files'][0]['content'] == content
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_snapshot_regenerates_the_tree(tmp_path, monkeypatch, streaming):
+    reference = tmp_path / 'reference'
+    reference.mkdir()
+    make_reference(reference)
+    config = tmp_path / 'configs' / 'config.yaml'
+    stats = snapshot_tree(str(reference), str(config), jobs=4, max_inline_size=1024, max_file_size=5000)
+    assert stats['sources'] == 2 and stats['skipped'] == 1
+    assert stats['inline'] == len(TEXTS) + 1
+
+    data = yaml.safe_load(config.read_text(encoding='utf-8'))
+    assert data['assets'] == os.path.join('..', 'reference')
+    assert 'empty-dir' in data['directories']
+    assert not any(file['path'].startswith(('build/', 'node_modules/')) for file in data['files'])
+
+    output = tmp_path / 'out'
+    output.mkdir()
+    monkeypatch.chdir(output)
+    init_project_structure(str(config), streaming=streaming, variables={'project_name': 'copy'})
+    for path, content in TEXTS.items():
+        assert (output / path).read_bytes() == content.encode('utf-8'), path
+    assert (output / 'static' / 'logo.png').read_bytes() == (reference / 'static' / 'logo.png').read_bytes()
+    assert (output / 'static' / 'big.txt').read_text() == 'x' * 2000
+    assert not (output / 'static' / 'huge.bin').exists()
+    assert (output / 'empty-dir').is_dir()
+
+
+def test_snapshot_skips_its_own_output(tmp_path, monkeypatch):
+    (tmp_path / 'a.txt').write_text('a\n')
+    monkeypatch.chdir(tmp_path)
+    result = CliRunner().invoke(cli, ['snapshot', '.', '-o', 'config.yaml', '--no-sources'])
+    assert result.exit_code == 0, result.output
+    data = yaml.safe_load((tmp_path / 'config.yaml').read_text())
+    assert [file['path'] for file in data['files']] == ['a.txt']
+    assert 'assets' not in data
+
+    result = CliRunner().invoke(cli, ['snapshot', '.', '-o', '-', '--exclude', '*.yaml'])
+    assert yaml.safe_load(result.stdout)['files'] == [{'path': 'a.txt', 'content': 'a\n'}]
@@ -0,0 +1,66 @@
+import os
+import stat
+import pytest
+from click.testing import CliRunner
+from project_initializer import staging
+from project_initializer.cli import cli
+from project_initializer.staging import StagedOutput
+
+CONFIG = "directories:\n  - src\nfiles:\n  - path: src/app.py\n    content: 'print(1)'\n"
+
+
+def siblings(path):
+    return sorted(name for name in os.listdir(path.parent) if name != path.name)
+
+
+def test_publishes_new_directory(tmp_path):
+    umask = os.umask(0)
+    os.umask(umask)
+    target = tmp_path / 'out'
+    with StagedOutput(str(target)) as staging_dir:
+        assert not target.exists()
+        (tmp_path / staging_dir / 'a.txt').write_text('a')
+    assert (target / 'a.txt').read_text() == 'a'
+    assert stat.S_IMODE(os.stat(target).st_mode) == 0o777 & ~umask
+    assert siblings(target) == []
+
+
+@pytest.mark.parametrize('exchange', [True, False])
+def test_replaces_existing_directory(tmp_path, monkeypatch, exchange):
+    if not exchange:
+        monkeypatch.setattr(staging, 'exchange_paths', lambda first, second: False)
+    target = tmp_path / 'out'
+    target.mkdir()
+    (target / 'stale.txt').write_text('old')
+    with StagedOutput(str(target)) as staging_dir:
+        (tmp_path / staging_dir / 'new.txt').write_text('new')
+    assert sorted(os.listdir(target)) == ['new.txt']
+    assert siblings(target) == []
+
+
+def test_failure_rolls_back(tmp_path):
+    target = tmp_path / 'out'
+    target.mkdir()
+    (target / 'keep.txt').write_text('keep')
+    with pytest.raises(RuntimeError):
+        with StagedOutput(str(target)) as staging_dir:
+            (tmp_path / staging_dir / 'partial.txt').write_text('partial')
+            raise RuntimeError('generation failed')
+    assert sorted(os.listdir(target)) == ['keep.txt']
+    assert siblings(target) == []
+
+
+def test_cli_staged_init(tmp_path):
+    config = tmp_path / 'config.yaml'
+    config.write_text(CONFIG)
+    output = tmp_path / 'out'
+    output.mkdir()
+    (output / 'stale.txt').write_text('old')
+    result = CliRunner().invoke(cli, ['init', '-c', str(config), '-o', str(output), '--staged'])
+    assert result.exit_code == 0, result.output
+    assert (output / 'src' / 'app.py').read_text() == 'print(1)'
+    assert not (output / 'stale.txt').exists()
+    assert siblings(output) == ['config.yaml']
+
+    result = CliRunner().invoke(cli, ['init', '-c', str(config), '-o', str(output), '--staged', '--incremental'])
+    assert result.exit_code == 2
@@ -0,0 +1,41 @@
+import os
+import subprocess
+import sys
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+def loaded_modules(code, *args):
+    env = dict(os.environ, PYTHONPATH=ROOT)
+    script = f"{code}\nimport sys\nprint('\\n'.join(sys.modules), file=sys.stderr)"
+    process = subprocess.run([sys.executable, '-c', script] + list(args), env=env,
+                             stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, universal_newlines=True)
+    return set(process.stderr.split())
+
+
+def test_import_package_is_lazy():
+    modules = loaded_modules('import project_initializer')
+    assert not {'click', 'yaml', 'asyncio', 'project_initializer.core'} & modules
+
+
+def test_help_does_not_load_engine():
+    code = "from project_initializer.cli import cli\ntry:\n    cli()\nexcept SystemExit:\n    pass"
+    modules = loaded_modules(code, '--help')
+    assert 'click' in modules
+    assert not {'yaml', 'asyncio', 'project_initializer.core'} & modules
+
+
+def test_lazy_attributes_resolve():
+    import project_initializer
+    from project_initializer.core import init_project_structure
+
+    assert project_initializer.init_project_structure is init_project_structure
+    assert 'generate_batch' in dir(project_initializer)
+
+
+def test_cli_attribute_survives_submodule_import():
+    import click
+    import project_initializer
+    import project_initializer.cli
+
+    assert isinstance(project_initializer.cli, click.Group)
@@ -0,0 +1,59 @@
+import pytest
+from project_initializer.core import init_project_structure
+from project_initializer.template_engine import CompiledTemplate, TemplateEngine, UndefinedVariablesError
+
+
+def test_compiled_template_renders_in_one_pass():
+    template = CompiledTemplate('# ${name} v${version}\n$${HOME} stays\n')
+
+    assert template.names == ['name', 'version']
+    assert template.render({'name': 'demo', 'version': '1.0'}) == '# demo v1.0\n${HOME} stays\n'
+
+
+def test_variables_come_from_config_and_overrides():
+    engine = TemplateEngine.from_config({'project_name': 'Demo', 'variables': {'org': 'acme', 'version': 1.5}},
+                                        {'org': 'initech'})
+
+    assert engine.variables == {'project_name': 'Demo', 'org': 'initech', 'version': '1.5'}
+    assert engine.render_file({'path': 'src/${org}/__init__.py', 'content': '${project_name}'}) == \
+        {'path': 'src/initech/__init__.py', 'content': 'Demo'}
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_undefined_variables_are_reported_before_writing(tmp_path, monkeypatch, streaming):
+    monkeypatch.chdir(tmp_path)
+    config = tmp_path / 'config.yaml'
+    config.write_text(
+        'files:\n'
+        '  - path: first.txt\n'
+        '    content: "${org}"\n'
+        '  - path: second.txt\n'
+        '    content: "${license} ${missing}"\n'
+        'variables:\n'
+        '  org: acme\n'
+    )
+
+    with pytest.raises(UndefinedVariablesError) as excinfo:
+        init_project_structure(str(config), 'default', streaming=streaming, variables={'license': 'MIT'})
+
+    assert excinfo.value.names == ['missing']
+    assert not (tmp_path / 'first.txt').exists()
+
+    init_project_structure(str(config), 'default', streaming=streaming, variables={'license': 'MIT', 'missing': 'x'})
+    assert (tmp_path / 'second.txt').read_text() == 'MIT x'
+
+
+@pytest.mark.parametrize('streaming', [False, True])
+def test_project_name_alone_keeps_other_placeholders(tmp_path, monkeypatch, streaming):
+    monkeypatch.chdir(tmp_path)
+    config = tmp_path / 'config.yaml'
+    config.write_text(
+        'project_name: demo\n'
+        'files:\n'
+        '  - path: run.sh\n'
+        '    content: "# ${project_name}\\necho ${HOME}\\n"\n'
+    )
+
+    init_project_structure(str(config), 'default', streaming=streaming)
+
+    assert (tmp_path / 'run.sh').read_text() == '# demo\necho ${HOME}\n'
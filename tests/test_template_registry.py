@@ -0,0 +1,111 @@
+import pytest
+from click.testing import CliRunner
+from project_initializer import template_registry
+from project_initializer.cli import cli
+from project_initializer.config_loader import ConfigLoader
+from project_initializer.template_registry import TemplateRegistry
+
+
+class FakeEntryPoint:
+    def __init__(self, name, template):
+        self.name = name
+        self.value = f'fake_templates:{name}'
+        self.dist = None
+        self.loads = 0
+        self._template = template
+
+    def load(self):
+        self.loads += 1
+        return lambda: self._template
+
+
+def write_template(directory, name, version='1.0', path='app.py'):
+    directory.mkdir(parents=True, exist_ok=True)
+    template = directory / f'{name}.yaml'
+    template.write_text(f"version: '{version}'\ndirectories:\n  - src\nfiles:\n  - path: {path}\n    content: ''\n")
+    return template
+
+
+def test_builtin_templates_are_indexed_without_parsing(tmp_path, monkeypatch):
+    monkeypatch.setattr(ConfigLoader, 'load_config', pytest.fail)
+    registry = TemplateRegistry(directories=[], entry_points=False, index_path=str(tmp_path / 'index.json'))
+    assert registry.names() == ['cli', 'data-science', 'default', 'web']
+    info = registry.info('web')
+    assert (info.version, info.source) == ('1.0', 'builtin')
+    assert info.size > 0 and len(info.hash) == 64
+
+
+def test_directories_override_builtins_and_parse_once(tmp_path, monkeypatch):
+    first, second = tmp_path / 'first', tmp_path / 'second'
+    write_template(first, 'web', version='2.1', path='first.py')
+    write_template(second, 'web', path='second.py')
+    write_template(second, 'internal')
+    registry = TemplateRegistry(directories=[str(first), str(second)], entry_points=False,
+                                index_path=str(tmp_path / 'index.json'))
+
+    assert registry.info('web').version == '2.1'
+    assert 'internal' in registry
+
+    calls = []
+    load_config = ConfigLoader.load_config
+    monkeypatch.setattr(ConfigLoader, 'load_config', lambda path: calls.append(path) or load_config(path))
+    assert registry.load('web')['files'] == [{'path': 'first.py', 'content': ''}]
+    assert registry.load('web') is registry.load('web')
+    assert len(calls) == 1
+
+    with pytest.raises(KeyError, match='Unknown template'):
+        registry.load('missing')
+
+
+def test_index_only_rereads_changed_files(tmp_path, monkeypatch):
+    directory = tmp_path / 'templates'
+    template = write_template(directory, 'internal')
+    index_path = str(tmp_path / 'index.json')
+    assert TemplateRegistry([str(directory)], entry_points=False, index_path=index_path).info('internal').version == '1.0'
+
+    reads = []
+    real_open = open
+
+    def tracking_open(path, *args, **kwargs):
+        if str(path).endswith('.yaml'):
+            reads.append(path)
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr('builtins.open', tracking_open)
+    assert TemplateRegistry([str(directory)], entry_points=False, index_path=index_path).names()
+    assert reads == []
+
+    write_template(directory, 'internal', version='1.10')
+    assert TemplateRegistry([str(directory)], entry_points=False, index_path=index_path).info('internal').version == '1.10'
+    assert reads == [str(template)]
+
+
+def test_entry_points_are_loaded_only_when_selected(tmp_path, monkeypatch):
+    selected = FakeEntryPoint('plugin', {'directories': ['lib'], 'files': []})
+    other = FakeEntryPoint('other', {'directories': [], 'files': []})
+    monkeypatch.setattr(template_registry, '_template_entry_points', lambda: [selected, other])
+    registry = TemplateRegistry(directories=[], index_path=str(tmp_path / 'index.json'))
+
+    assert {'plugin', 'other'} <= set(registry.names())
+    assert registry.info('plugin').source == 'entry_point'
+    assert registry.load('plugin') == {'directories': ['lib'], 'files': []}
+    assert (selected.loads, other.loads) == (1, 0)
+
+
+def test_cli_choices_come_from_template_path(tmp_path, monkeypatch):
+    write_template(tmp_path / 'templates', 'internal', path='internal.py')
+    monkeypatch.setenv(template_registry.TEMPLATE_PATH_ENV, str(tmp_path / 'templates'))
+    config = tmp_path / 'config.yaml'
+    config.write_text("directories: []\nfiles: []\n")
+
+    listing = CliRunner().invoke(cli, ['templates'])
+    assert listing.exit_code == 0, listing.output
+    assert 'internal\t1.0\tdirectory' in listing.output
+
+    result = CliRunner().invoke(cli, ['init', '-c', str(config), '-o', str(tmp_path / 'out'), '-t', 'internal'])
+    assert result.exit_code == 0, result.output
+    assert (tmp_path / 'out' / 'internal.py').exists()
+
+    result = CliRunner().invoke(cli, ['init', '-c', str(config), '-t', 'missing'])
+    assert result.exit_code == 2
+    assert 'internal' in result.output
@@ -0,0 +1,124 @@
+import os
+import time
+import pytest
+from click.testing import CliRunner
+from project_initializer.cli import cli
+from project_initializer.ignore import IgnoreMatcher, IgnoreRules
+from project_initializer.tree import ListingCache, TreeWalker, dump_tree
+
+
+@pytest.mark.parametrize('pattern, path, is_dir, expected', [
+    ('*.pyc', 'a/b/mod.pyc', False, True),
+    ('build/', 'src/build', True, True),
+    ('build/', 'src/build', False, None),
+    ('/dist', 'dist', True, True),
+    ('/dist', 'src/dist', True, None),
+    ('docs/*.md', 'docs/a.md', False, True),
+    ('docs/*.md', 'docs/sub/a.md', False, None),
+    ('a/**/z', 'a/b/c/z', False, True),
+    ('a/**/z', 'a/z', False, True),
+    ('**/cache', 'x/y/cache', True, True),
+    ('file[0-9].txt', 'file7.txt', False, True),
+    ('# comment', '# comment', False, None),
+])
+def test_gitignore_patterns(pattern, path, is_dir, expected):
+    assert IgnoreRules([pattern]).match(path, is_dir) is expected
+
+
+def test_negation_and_nested_rules():
+    root = IgnoreRules(['*.log', '!keep.log'])
+    assert root.match('debug.log', False) is True
+    assert root.match('keep.log', False) is False
+    nested = IgnoreMatcher((root, IgnoreRules(['*.txt', '!important.log'], base='sub')))
+    assert nested.ignored('sub/notes.txt', False)
+    assert not nested.ignored('sub/important.log', False)
+    assert not nested.ignored('notes.txt', False)
+
+
+def make_tree(root):
+    (root / '.git' / 'objects').mkdir(parents=True)
+    (root / 'node_modules' / 'pkg').mkdir(parents=True)
+    (root / 'src' / 'app' / '__pycache__').mkdir(parents=True)
+    (root / 'src' / 'app' / 'main.py').write_text('')
+    (root / 'src' / 'app' / '__pycache__' / 'main.pyc').write_text('')
+    (root / 'src' / '.gitignore').write_text('generated.py\n')
+    (root / 'src' / 'generated.py').write_text('')
+    (root / 'docs').mkdir()
+    (root / 'docs' / 'index.md').write_text('')
+    (root / 'debug.log').write_text('')
+    (root / '.gitignore').write_text('__pycache__/\n*.log\n')
+
+
+EXPECTED = [
+    '{root}/',
+    '    .gitignore',
+    '    docs/',
+    '        index.md',
+    '    src/',
+    '        .gitignore',
+    '        app/',
+    '            main.py',
+]
+
+
+@pytest.mark.parametrize('jobs', [1, 4])
+def test_walker_prunes_ignored_entries(tmp_path, jobs):
+    make_tree(tmp_path)
+    walker = TreeWalker(str(tmp_path), jobs=jobs)
+    assert list(walker.lines()) == [line.format(root=tmp_path.name) for line in EXPECTED]
+    # .git, node_modules, __pycache__, debug.log and generated.py
+    assert walker.stats['ignored'] == 5
+
+
+def age(root, seconds=60):
+    past = time.time() - seconds
+    for dirpath, _, _ in os.walk(root):
+        os.utime(dirpath, (past, past))
+
+
+def test_incremental_walks_reuse_unchanged_listings(tmp_path):
+    root = tmp_path / 'project'
+    make_tree(root)
+    age(root)
+    cache_path = str(tmp_path / 'tree.json')
+    first = ListingCache.load(cache_path)
+    lines = list(TreeWalker(str(root), cache=first).lines())
+    first.save()
+
+    second = ListingCache.load(cache_path)
+    walker = TreeWalker(str(root), cache=second)
+    assert list(walker.lines()) == lines
+    assert walker.stats['scanned'] == 0 and walker.stats['reused'] == 4
+
+    (root / 'docs' / 'new.md').write_text('')
+    (root / 'src' / '.gitignore').write_text('')
+    walker = TreeWalker(str(root), cache=ListingCache.load(cache_path))
+    lines = list(walker.lines())
+    assert '        new.md' in lines and '        generated.py' in lines
+    assert walker.stats['scanned'] == 1
+
+
+def test_dump_tree_and_cli(tmp_path):
+    make_tree(tmp_path / 'project')
+    output = tmp_path / 'docs' / 'PROJECT_STRUCTURE.md'
+    count, _ = dump_tree(str(tmp_path / 'project'), str(output), jobs=2, incremental=True)
+    assert count == len(EXPECTED)
+    text = output.read_text()
+    assert text.startswith('# Project Structure\n\n```\nproject/\n') and text.endswith('```\n')
+
+    # An output inside the tree is neither listed nor a reason to read its directory again.
+    root = tmp_path / 'project'
+    output = root / 'docs' / 'PROJECT_STRUCTURE.md'
+    age(root)
+    dump_tree(str(root), str(output), incremental=True)
+    age(root)
+    dump_tree(str(root), str(output), incremental=True)
+    _, stats = dump_tree(str(root), str(output), incremental=True)
+    assert stats['scanned'] == 0
+    text = output.read_text()
+    assert 'PROJECT_STRUCTURE' not in text and '.tmp' not in text and '        index.md\n' in text
+
+    result = CliRunner().invoke(cli, ['tree', str(tmp_path / 'project'), '--exclude', 'docs/', '--no-ignore'])
+    assert result.exit_code == 0, result.output
+    assert 'docs/' not in result.output
+    assert 'node_modules/' in result.output and 'debug.log' in result.output